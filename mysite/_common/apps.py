@@ -10,3 +10,5 @@ class CommonInfraConfig(AppConfig):
 
     def ready(self):
         import _common.schema
+        from _common.lookups import register_lookups
+        register_lookups()
@@ -0,0 +1,31 @@
+# _common/lookups.py
+"""
+Lookup-ы подстрочного поиска, которые может обслужить триграммный GIN-индекс (pg_trgm, gin_trgm_ops):
+icontains в PostgreSQL компилируется в UPPER(x::text) LIKE UPPER(...), и индекс по x к нему не подходит,
+field__ilike даёт x ILIKE '%...%' по самому столбцу.
+Регистрируются для CharField и TextField в CommonInfraConfig.ready().
+"""
+from django.db.models import CharField, TextField
+from django.db.models.lookups import PatternLookup
+
+
+class ILikeContains(PatternLookup):
+    """Подстрока без учёта регистра: x ILIKE '%значение%' (спецсимволы LIKE в значении экранируются)."""
+
+    lookup_name = 'ilike'
+    param_pattern = '%%%s%%'
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        if not self.rhs_is_direct_value():
+            # Выражение справа: спецсимволы LIKE экранируются, '%' добавляются вокруг
+            # (pattern_ops['contains'] не подходит — он уже начинается с LIKE)
+            rhs_sql = "'%%' || {} || '%%'".format(connection.pattern_esc.format(rhs_sql))
+        return f'{lhs_sql} ILIKE {rhs_sql}', (*lhs_params, *rhs_params)
+
+
+def register_lookups():
+    CharField.register_lookup(ILikeContains)
+    TextField.register_lookup(ILikeContains)
@@ -3,13 +3,18 @@
 Общие классы и методы всех приложений проекта
 """
 import hashlib
-from typing import List, Union
+import logging
+from typing import List, NamedTuple, Optional, Sequence, Union
+from django.core import signing
 from django.core.paginator import Paginator
-from django.db import models
+from django.db import OperationalError, connections, models, transaction
+from django.db.models.lookups import GreaterThan, LessThan
 from django.conf import settings
 
 from .middleware.users import get_current_user
 
+logger = logging.getLogger(__name__)
+
 
 def hash_calculate(fields_array: List[Union[str, int, float, None]]) -> str:
     """
@@ -123,3 +128,212 @@ class SafePaginator(Paginator):
     def is_limited(self):
         # Вызывается после page(), т.к. _is_limited устанавливается там
         return getattr(self, '_is_limited', False)
+
+
+class _RowValue(models.Func):
+    """Значение строки (a, b, ...) для сравнения ключей в SQL: (a, b) > (x, y)."""
+    template = '(%(expressions)s)'
+    output_field = models.Field()
+
+
+class KeysetPage:
+    """Страница KeysetPaginator; повторяет используемую шаблонами часть django.core.paginator.Page."""
+
+    def __init__(self, object_list, number, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<KeysetPage {self.number}>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+class KeysetPaginator:
+    """
+    Постраничный вывод по ключу (keyset / seek) вместо OFFSET:
+    1) страница выбирается условием (ключ сортировки, pk) > (ключ последней строки) и LIMIT per_page + 1 —
+       глубокая страница стоит столько же, сколько первая, ограничения на число строк нет
+    2) курсор страницы — подписанный непрозрачный токен (ключ граничной строки, направление, номер страницы)
+    3) поля ordering должны быть NOT NULL и сортироваться по возрастанию; последним добавляется pk
+    """
+    cursor_salt = '_common.KeysetPaginator'
+
+    def __init__(self, object_list: models.QuerySet, per_page: int, ordering: Sequence[str] = ()):
+        self.ordering = tuple(field for field in ordering if field != 'pk') + ('pk',)
+        self.object_list = object_list.order_by(*self.ordering)
+        self.per_page = int(per_page)
+
+    @property
+    def count(self) -> int:
+        """Точное число строк (COUNT(*) выполняется только при обращении)."""
+        if not hasattr(self, '_count'):
+            self._count = self.object_list.count()
+        return self._count
+
+    def _key(self, obj) -> list:
+        values = []
+        for field in self.ordering:
+            value = obj
+            for part in field.split('__'):
+                value = getattr(value, part)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, obj, backward: bool, number: int) -> str:
+        return signing.dumps(
+            {'k': self._key(obj), 'b': backward, 'n': number},
+            salt=self.cursor_salt,
+            serializer=signing.JSONSerializer,
+        )
+
+    def decode_cursor(self, cursor: Optional[str]) -> Optional[dict]:
+        """Содержимое курсора или None для первой страницы и для испорченного токена."""
+        if not cursor:
+            return None
+        try:
+            data = signing.loads(cursor, salt=self.cursor_salt)
+        except signing.BadSignature:
+            return None
+        if not isinstance(data, dict) or len(data.get('k') or ()) != len(self.ordering):
+            return None
+        return data
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """Страница после (или перед — для курсора «назад») граничной строки курсора."""
+        data = self.decode_cursor(cursor)
+        queryset = self.object_list
+        backward = bool(data and data.get('b'))
+        number = max(int(data.get('n', 1)), 1) if data else 1
+        if data:
+            row = _RowValue(*(models.F(field) for field in self.ordering))
+            key = _RowValue(*(models.Value(value) for value in data['k']))
+            if backward:
+                queryset = queryset.filter(LessThan(row, key)).reverse()
+            else:
+                queryset = queryset.filter(GreaterThan(row, key))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backward:
+            rows.reverse()
+            # Назад от второй страницы — это первая, курсор ей не нужен
+            has_previous, has_next = number > 1 and has_more, True
+        else:
+            has_previous, has_next = number > 1, has_more
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(rows[-1], backward=False, number=number + 1)
+        if rows and has_previous:
+            previous_cursor = '' if number == 2 else self.encode_cursor(rows[0], backward=True, number=number - 1)
+        return KeysetPage(rows, number, self, next_cursor, previous_cursor)
+
+
+# SQLSTATE query_canceled: истёк statement_timeout
+QUERY_CANCELED = '57014'
+
+
+class RowCount(NamedTuple):
+    """Число строк списка: value — точное (exact=True) или оценка планировщика / статистики."""
+    value: int
+    exact: bool
+
+
+def reltuples_count(model, using: str = 'default') -> Optional[int]:
+    """Оценка числа строк таблицы модели из pg_class.reltuples; None — таблица ещё не анализировалась."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    if not row or row[0] < 0:
+        return None
+    return row[0]
+
+
+def explain_count(queryset: models.QuerySet) -> int:
+    """Оценка числа строк QuerySet по плану EXPLAIN (FORMAT JSON) — запрос не выполняется."""
+    queryset = queryset.order_by()
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def exact_count(queryset: models.QuerySet, timeout_ms: int) -> Optional[int]:
+    """COUNT(*) с ограничением statement_timeout; None — не уложился в timeout_ms."""
+    connection = connections[queryset.db]
+    try:
+        # Точка сохранения: отменённый COUNT не ломает внешнюю транзакцию, а SET LOCAL откатывается вместе с ней
+        with transaction.atomic(using=queryset.db), connection.cursor() as cursor:
+            cursor.execute('SELECT current_setting(%s)', ['statement_timeout'])
+            previous = cursor.fetchone()[0]
+            cursor.execute('SELECT set_config(%s, %s, TRUE)', ['statement_timeout', f'{int(timeout_ms)}ms'])
+            value = queryset.count()
+            cursor.execute('SELECT set_config(%s, %s, TRUE)', ['statement_timeout', previous])
+            return value
+    except OperationalError as error:
+        if getattr(error.__cause__, 'pgcode', None) != QUERY_CANCELED:
+            raise
+        return None
+
+
+def count_rows(queryset: models.QuerySet, exact_limit: int = 10000, timeout_ms: int = 200) -> RowCount:
+    """
+    Число строк для списков, где точный COUNT(*) по многотабличному запросу слишком дорог:
+    1) без фильтров — pg_class.reltuples таблицы модели, с фильтрами — оценка планировщика (EXPLAIN)
+    2) если оценка не больше exact_limit (или её нет), считается точно с statement_timeout = timeout_ms
+    3) не уложившийся в timeout_ms подсчёт заменяется оценкой
+    Args:
+        queryset: QuerySet списка
+        exact_limit: до какой оценки считать точно
+        timeout_ms: предельное время точного подсчёта
+    Returns:
+        RowCount: (число, точное ли оно)
+    """
+    query = queryset.query
+    if not query.where and not query.distinct and not query.is_sliced:
+        estimate = reltuples_count(queryset.model, using=queryset.db)
+    else:
+        estimate = explain_count(queryset)
+
+    if estimate is None or estimate <= exact_limit:
+        value = exact_count(queryset, timeout_ms)
+        if value is not None:
+            return RowCount(value, True)
+        if estimate is None:
+            estimate = explain_count(queryset)
+        logger.info('Подсчёт %s не уложился в %s мс, используется оценка %s', queryset.model.__name__, timeout_ms, estimate)
+    return RowCount(estimate, False)
@@ -4,7 +4,8 @@ from django.utils.html import format_html
 from .models import (
     TotalData, DimStage, DimDB, LinkDB, LinkSchema, DimTableType,
     DimColumnName, DimTableNameType, LinkTable, LinkTableName,
-    LinkColumn, DimTypeLink, LinkColumnColumn, LinkColumnName
+    LinkColumn, DimTypeLink, LinkColumnColumn, LinkColumnName, IngestJob, SyncRun,
+    TotalDataObservation
 )
 
 
@@ -321,4 +322,45 @@ class TotalDataAdmin(BaseAdmin):
     ordering = ['-created_at']
 
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('stand')
\ No newline at end of file
+        return super().get_queryset(request).select_related('stand')
+
+
+@admin.register(IngestJob)
+class IngestJobAdmin(BaseAdmin):
+    """Админка для заданий пакетной загрузки"""
+    list_display = (
+        'id', 'status', 'rows_total', 'rows_processed', 'inserted', 'updated',
+        'unchanged', 'created_at', 'finished_at'
+    )
+    list_filter = ('status',)
+    exclude = ('payload',)
+    readonly_fields = (
+        'status', 'rows_total', 'rows_processed', 'inserted', 'updated', 'unchanged',
+        'errors', 'started_at', 'finished_at', 'created_at', 'updated_at'
+    )
+
+
+@admin.register(SyncRun)
+class SyncRunAdmin(BaseAdmin):
+    """Админка для истории синхронизаций"""
+    list_display = (
+        'id', 'stage', 'catalog', 'status', 'dry_run', 'rows_scanned',
+        'columns_added', 'columns_updated', 'columns_reactivated', 'columns_deactivated', 'columns_unchanged',
+        'started_at', 'finished_at'
+    )
+    list_filter = ('status', 'dry_run', 'stage')
+    search_fields = ('catalog',)
+    readonly_fields = [field.name for field in SyncRun._meta.fields]
+
+
+@admin.register(TotalDataObservation)
+class TotalDataObservationAdmin(admin.ModelAdmin):
+    """Админка для наблюдений срезов TotalData"""
+    list_display = ('id', 'stand', 'table_catalog', 'observed_at', 'source', 'complete', 'rows_seen')
+    list_filter = ('source', 'complete', 'stand')
+    search_fields = ('table_catalog',)
+    list_per_page = 100
+    show_full_result_count = False
+    ordering = ['-observed_at']
+    exclude = ('keys',)
+    readonly_fields = [field.name for field in TotalDataObservation._meta.fields if field.name != 'keys']
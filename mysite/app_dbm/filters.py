@@ -4,9 +4,12 @@ from django_filters import CharFilter, ModelChoiceFilter
 from django.db.models import Q
 
 from .models import (
-    LinkDB, DimStage, LinkTable, LinkColumn
+    LinkDB, DimStage, LinkTable, LinkTableName, CatalogFlat
 )
 
+# Подстрочный поиск идёт через lookup ilike (_common.lookups): x ILIKE '%...%' обслуживают
+# триграммные GIN-индексы столбцов, в отличие от UPPER(x) LIKE, в который компилируется icontains
+
 
 class LinkDBFilter(django_filters.FilterSet):
     """
@@ -14,10 +17,10 @@ class LinkDBFilter(django_filters.FilterSet):
     Позволяет фильтровать по базе данных, алиасу, хосту, порту, стенду и активности.
     """
 
-    db_name = CharFilter(field_name='base__name', lookup_expr='icontains', label='Имя базы данных')
-    alias = CharFilter(field_name='alias', lookup_expr='icontains', label='Алиас')
-    host = CharFilter(field_name='host', lookup_expr='icontains', label='Хост')
-    port = CharFilter(field_name='port', lookup_expr='icontains', label='Порт')
+    db_name = CharFilter(field_name='base__name', lookup_expr='ilike', label='Имя базы данных')
+    alias = CharFilter(field_name='alias', lookup_expr='ilike', label='Алиас')
+    host = CharFilter(field_name='host', lookup_expr='ilike', label='Хост')
+    port = CharFilter(field_name='port', lookup_expr='ilike', label='Порт')
     is_active = django_filters.BooleanFilter(widget=None)
     stage = ModelChoiceFilter(
         field_name='stage',
@@ -34,12 +37,12 @@ class LinkDBFilter(django_filters.FilterSet):
 class LinkTableFilter(django_filters.FilterSet):
     table_catalog = django_filters.CharFilter(
         field_name='schema__base__name',
-        lookup_expr='icontains',
+        lookup_expr='ilike',
         label='Каталог'
     )
     schema = django_filters.CharFilter(
         field_name='schema__schema',
-        lookup_expr='icontains',
+        lookup_expr='ilike',
         label='Схема'
     )
     table_name = django_filters.CharFilter(method='filter_table_name')
@@ -56,46 +59,58 @@ class LinkTableFilter(django_filters.FilterSet):
         """
         if value:
             # Фильтруем по основному имени таблицы ИЛИ по альтернативному имени
+            # Подзапрос вместо JOIN c distinct(): каждая ветка идёт по своему триграммному индексу
+            alt_names = LinkTableName.objects.filter(name__ilike=value).values('table_id')
             return queryset.filter(
-                Q(name__icontains=value) |
-                Q(linktablename__name__icontains=value)
-            ).distinct()
+                Q(name__ilike=value) |
+                Q(pk__in=alt_names)
+            )
         return queryset
 
 
-class LinkColumnFilter(django_filters.FilterSet):
+class CatalogFlatFilter(django_filters.FilterSet):
+    """
+    Фильтр списка столбцов по плоскому каталогу CatalogFlat — без соединений с таблицами, схемами и базами.
+    Имена параметров прежние (путь полей LinkColumn), чтобы не ломать сохранённые ссылки.
+    """
     table__schema__base__name = django_filters.CharFilter(
-        field_name='table__schema__base__name',
-        lookup_expr='icontains',
+        field_name='base_name',
+        lookup_expr='ilike',
         label='База данных'
     )
     table__schema__schema = django_filters.CharFilter(
-        field_name='table__schema__schema',
-        lookup_expr='icontains',
+        field_name='schema_name',
+        lookup_expr='ilike',
         label='Схема'
     )
     table__name = django_filters.CharFilter(
-        field_name='table__name',
-        lookup_expr='icontains',
+        field_name='table_name',
+        lookup_expr='ilike',
         label='Таблица'
     )
     columns = django_filters.CharFilter(
-        field_name='columns',
-        lookup_expr='icontains',
+        field_name='column_name',
+        lookup_expr='ilike',
         label='Колонка'
     )
+    type = django_filters.CharFilter(
+        field_name='column_type',
+        lookup_expr='ilike',
+        label='Тип данных'
+    )
     description = django_filters.CharFilter(
-        field_name='description',
-        lookup_expr='icontains',
+        field_name='description_text',
+        lookup_expr='ilike',
         label='Описание'
     )
 
     class Meta:
-        model = LinkColumn
+        model = CatalogFlat
         fields = [
             'table__schema__base__name',
             'table__schema__schema',
             'table__name',
             'columns',
+            'type',
             'description'
         ]
@@ -0,0 +1,203 @@
+# app_dbm/management/commands/benchmark_harvest_query.py
+import re
+import statistics
+import time
+import uuid
+from pathlib import Path
+
+import psycopg2
+from psycopg2 import sql
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app_dbm.utils.harvester import HARVEST_SQL_PATH, load_harvest_sql
+
+LEGACY_SQL_PATH = Path(HARVEST_SQL_PATH).with_name('select.sql')
+
+# Столбцы, которые зависят от момента выполнения и в сравнении не участвуют
+VOLATILE_COLUMNS = ('col_date_create',)
+
+# Создание порции таблиц: столбцы разных типов, PK, уникальные ограничения,
+# комментарии (в том числе с кавычками и JSON) и представление на каждую десятую таблицу
+GENERATE_SQL = '''
+DO $bench$
+DECLARE
+    i int;
+    cols text;
+BEGIN
+    FOR i IN {first}..{last} LOOP
+        SELECT string_agg(format('c%s %s', j, CASE j % 6
+            WHEN 0 THEN 'varchar(100)'
+            WHEN 1 THEN 'integer NOT NULL DEFAULT 0'
+            WHEN 2 THEN 'text[]'
+            WHEN 3 THEN 'numeric(12,2)'
+            WHEN 4 THEN 'timestamptz DEFAULT now()'
+            ELSE 'varchar'
+        END), ', ')
+        INTO cols
+        FROM generate_series(1, {columns}) AS j;
+
+        EXECUTE format('CREATE TABLE %I.%I (id bigserial PRIMARY KEY, %s)', {schema}, 't' || i, cols);
+        EXECUTE format('COMMENT ON TABLE %I.%I IS %L', {schema}, 't' || i, 'Таблица ' || i);
+        EXECUTE format('COMMENT ON COLUMN %I.%I.c1 IS %L', {schema}, 't' || i, 'Комментарий "в кавычках" \\ ' || i);
+        EXECUTE format('COMMENT ON COLUMN %I.%I.c2 IS %L', {schema}, 't' || i, '{{"name": "Столбец", "n": ' || i || '}}');
+        IF i % 3 = 0 THEN
+            EXECUTE format('ALTER TABLE %I.%I ADD UNIQUE (c1)', {schema}, 't' || i);
+        END IF;
+        IF i % 10 = 0 THEN
+            EXECUTE format('CREATE VIEW %I.%I AS SELECT * FROM %I.%I', {schema}, 'v' || i, {schema}, 't' || i);
+        END IF;
+    END LOOP;
+END
+$bench$;
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение запросов сбора метаданных: utils/select.sql (information_schema) '
+        'и utils/select_catalog.sql (pg_catalog). Создаёт в отдельной (тестовой) базе PostgreSQL '
+        'новую схему с большим числом столбцов, замеряет время обоих запросов, сверяет результаты '
+        'и удаляет созданную схему. Подключение задаётся явно; база приложения '
+        '(DATABASES["default"]) не используется.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tables', type=int, default=2000, help='Число создаваемых таблиц')
+        parser.add_argument('--columns', type=int, default=25, help='Столбцов в таблице (кроме id)')
+        parser.add_argument('--repeat', type=int, default=3, help='Сколько раз выполнять каждый запрос')
+        parser.add_argument(
+            '--schema', help='Имя создаваемой схемы (по умолчанию dbm_harvest_bench_<случайный суффикс>); '
+                             'если схема уже существует, команда завершается с ошибкой'
+        )
+        parser.add_argument('--keep', action='store_true', help='Не удалять созданную схему после замера')
+        parser.add_argument(
+            '--skip-generate', action='store_true',
+            help='Не создавать схему: замерить запросы на данных тестовой базы как есть (ничего не удаляется)'
+        )
+        parser.add_argument('--host', required=True, help='Хост тестовой базы PostgreSQL')
+        parser.add_argument('--port', default='5432', help='Порт тестовой базы PostgreSQL')
+        parser.add_argument('--dbname', required=True, help='Тестовая база данных (не база приложения)')
+        parser.add_argument('--user', required=True, help='Пользователь')
+        parser.add_argument('--password', help='Пароль (или переменная окружения PGPASSWORD)')
+
+    def handle(self, *args, **options):
+        schema = options['schema'] or f'dbm_harvest_bench_{uuid.uuid4().hex[:12]}'
+        if not re.fullmatch(r'[a-z_][a-z0-9_]*', schema):
+            raise CommandError('Имя схемы: только латиница в нижнем регистре, цифры и "_"')
+
+        connection = self._connect(options)
+        created = False
+        try:
+            if not options['skip_generate']:
+                self._create_schema(connection, schema)
+                created = True
+                self._generate(connection, schema, options['tables'], options['columns'])
+            queries = {
+                'information_schema': load_harvest_sql(LEGACY_SQL_PATH),
+                'pg_catalog': load_harvest_sql(HARVEST_SQL_PATH),
+            }
+            results = {
+                name: self._measure(connection, name, text, options['repeat'])
+                for name, text in queries.items()
+            }
+            self._compare(results['information_schema'][1], results['pg_catalog'][1])
+
+            legacy, catalog = results['information_schema'][0], results['pg_catalog'][0]
+            self.stdout.write(self.style.SUCCESS(
+                f'Ускорение (по медиане): {legacy / catalog:.1f}x' if catalog else 'Ускорение: нет данных'
+            ))
+        finally:
+            # Удаляется только схема, созданная этим запуском
+            if created and not options['keep']:
+                with connection.cursor() as cursor:
+                    cursor.execute(sql.SQL('DROP SCHEMA {} CASCADE').format(sql.Identifier(schema)))
+            elif created:
+                self.stdout.write(f'Схема {schema} оставлена')
+            connection.close()
+
+    def _connect(self, options):
+        """Подключение к тестовой базе. База приложения из DATABASES["default"] не допускается."""
+        default = settings.DATABASES['default']
+        target = (options['host'], str(options['port']), options['dbname'])
+        application = (default.get('HOST') or 'localhost', str(default.get('PORT') or '5432'), default.get('NAME'))
+        if target == application:
+            raise CommandError(
+                'Указана база приложения (DATABASES["default"]); замер выполняется только на отдельной тестовой базе'
+            )
+        try:
+            connection = psycopg2.connect(
+                host=options['host'],
+                port=options['port'],
+                dbname=options['dbname'],
+                user=options['user'],
+                password=options['password'],
+                application_name='app_dbm harvest benchmark',
+            )
+        except psycopg2.Error as exc:
+            raise CommandError(f'Не удалось подключиться к PostgreSQL: {exc}')
+        connection.autocommit = True
+        return connection
+
+    def _create_schema(self, connection, schema):
+        """Создаёт новую схему. Существующая схема не используется и не удаляется."""
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute(sql.SQL('CREATE SCHEMA {}').format(sql.Identifier(schema)))
+            except psycopg2.errors.DuplicateSchema:
+                raise CommandError(f'Схема {schema} уже существует; укажите другое имя в --schema')
+
+    def _generate(self, connection, schema, tables, columns):
+        """Заполняет схему порциями: одна транзакция на тысячи таблиц упирается в max_locks_per_transaction."""
+        started = time.monotonic()
+        with connection.cursor() as cursor:
+            batch = 100
+            for first in range(1, tables + 1, batch):
+                cursor.execute(GENERATE_SQL.format(
+                    first=first,
+                    last=min(first + batch - 1, tables),
+                    columns=columns,
+                    schema=sql.Literal(schema).as_string(connection),
+                ))
+        self.stdout.write(
+            f'Схема {schema}: таблиц {tables}, столбцов ~{tables * (columns + 1)}, '
+            f'создана за {time.monotonic() - started:.1f} с'
+        )
+
+    def _measure(self, connection, name, text, repeat):
+        """Выполняет запрос repeat раз. Возвращает (медиана времени, строки последнего запуска)."""
+        timings = []
+        rows = []
+        with connection.cursor() as cursor:
+            for _ in range(max(repeat, 1)):
+                started = time.monotonic()
+                cursor.execute(text)
+                rows = cursor.fetchall()
+                timings.append(time.monotonic() - started)
+            names = [column.name for column in cursor.description]
+        keep = [index for index, column in enumerate(names) if column not in VOLATILE_COLUMNS]
+        rows = [tuple(row[index] for index in keep) for row in rows]
+
+        median = statistics.median(timings)
+        self.stdout.write(
+            f'{name:<20} строк: {len(rows):>8}  мин: {min(timings):>8.3f} с  медиана: {median:>8.3f} с'
+        )
+        return median, rows
+
+    def _compare(self, legacy_rows, catalog_rows):
+        """Сверяет результаты без учёта порядка строк."""
+        legacy = sorted(legacy_rows, key=repr)
+        catalog = sorted(catalog_rows, key=repr)
+        if legacy == catalog:
+            self.stdout.write(self.style.SUCCESS('Результаты запросов совпадают'))
+            return
+        only_legacy = set(map(repr, legacy)) - set(map(repr, catalog))
+        only_catalog = set(map(repr, catalog)) - set(map(repr, legacy))
+        self.stdout.write(self.style.WARNING(
+            f'Результаты различаются: только в select.sql {len(only_legacy)}, '
+            f'только в select_catalog.sql {len(only_catalog)}'
+        ))
+        for line in sorted(only_legacy)[:5]:
+            self.stdout.write(f'  - {line}')
+        for line in sorted(only_catalog)[:5]:
+            self.stdout.write(f'  + {line}')
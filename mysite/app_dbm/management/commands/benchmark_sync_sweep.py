@@ -0,0 +1,40 @@
+# app_dbm/management/commands/benchmark_sync_sweep.py
+from django.core.management.base import BaseCommand, CommandError
+
+from app_dbm.utils.syncing_model import SyncError, explain_sync
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN ANALYZE всех шагов синхронизации одной базы одного стенда на текущих данных. '
+        'Показывает время шагов и полные просмотры таблиц моделей (Seq Scan). '
+        'Изменения всегда откатываются. На маленьких таблицах Seq Scan — нормальный выбор планировщика.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stage', required=True, help='Стенд (TotalData.stand)')
+        parser.add_argument('--catalog', required=True, help='Алиас базы (TotalData.table_catalog)')
+        parser.add_argument('--plans', action='store_true', help='Вывести планы целиком')
+
+    def handle(self, *args, **options):
+        try:
+            report = explain_sync(options['stage'], options['catalog'])
+        except SyncError as exc:
+            raise CommandError(str(exc))
+
+        for item in report:
+            milliseconds = f'{item["milliseconds"]:>10.1f} мс' if item['milliseconds'] is not None else ''
+            line = f'{item["step"]:<22} {milliseconds}'
+            if item['seq_scans']:
+                self.stdout.write(self.style.WARNING(f'{line}  Seq Scan: {", ".join(item["seq_scans"])}'))
+            else:
+                self.stdout.write(line)
+            if options['plans']:
+                self.stdout.write(item['plan'])
+                self.stdout.write('')
+
+        total = sum(item['milliseconds'] or 0 for item in report)
+        with_scans = sum(1 for item in report if item['seq_scans'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Шагов: {len(report)}, с полным просмотром таблиц моделей: {with_scans}, всего: {total:.1f} мс'
+        ))
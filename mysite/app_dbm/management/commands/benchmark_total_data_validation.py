@@ -0,0 +1,134 @@
+# app_dbm/management/commands/benchmark_total_data_validation.py
+import json
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_dbm.serializers import TotalDataSerializer
+from app_dbm.utils.total_data_keys import TOTAL_DATA_FIELDS
+from app_dbm.utils.total_data_validation import validate_total_data_rows
+
+# Ошибочные значения: (поле, значение) — по одному на испорченную строку
+BROKEN_VALUES = (
+    ('table_name', None),
+    ('column_name', ''),
+    ('data_type', None),
+    ('data_type', 'x' * 300),
+    ('column_number', -1),
+    ('column_number', 'abc'),
+    ('column_info', '{broken'),
+    ('column_info', 42),
+    ('table_schema', {'nested': True}),
+    ('stand', True),
+    ('column_comment', 'null\x00char'),
+)
+
+
+def _payload(rows: int, invalid_share: float, seed: int):
+    """Пачка строк как из JSON-тела: числа и строки вперемешку, column_info — объекты и JSON-строки."""
+    rng = random.Random(seed)
+    payload = []
+    for index in range(rows):
+        info = {'is_key': index % 7 == 0, 'default': None if index % 3 else 'now()', 'description': {'name': f'c{index}'}}
+        row = {
+            'stand': 'PROD',
+            'table_type': 'BASE TABLE',
+            'group_catalog': 'sales',
+            'table_catalog': 'sales_db',
+            'table_schema': f'schema_{index % 20}',
+            'table_name': f'table_{index // 25}',
+            'table_comment': f'  Таблица {index // 25}  ',
+            'column_number': index % 25 if index % 2 else str(index % 25),
+            'column_name': f'column_{index % 25}',
+            'column_comment': None if index % 5 else f'Комментарий {index}',
+            'data_type': 'varchar(100)' if index % 4 else 'int4',
+            'is_nullable': 'YES' if index % 2 else 'NO',
+            'is_auto': 'NO',
+            'column_info': json.dumps(info, ensure_ascii=False) if index % 2 else info,
+        }
+        if rng.random() < invalid_share:
+            field, value = rng.choice(BROKEN_VALUES)
+            row[field] = value
+        if index % 11 == 0:
+            row['unknown_field'] = 'ignored'
+        payload.append(row)
+    if rows and invalid_share:
+        payload[rng.randrange(rows)] = 'not a dict'
+    return payload
+
+
+def _normalize_errors(errors):
+    return {
+        index: {field: [str(message) for message in messages] for field, messages in row.items()}
+        for index, row in errors.items()
+    }
+
+
+def _timings(check, repeat: int):
+    """Время каждого из repeat прогонов check; результат прогона сразу отбрасывается."""
+    timings = []
+    for _ in range(repeat):
+        started = time.monotonic()
+        check()
+        timings.append(time.monotonic() - started)
+    return timings
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение проверки bulk-пачки TotalData: TotalDataSerializer(many=True) и '
+        'utils.total_data_validation.validate_total_data_rows. Замеряет время и сверяет '
+        'ошибки и проверенные значения. Базу данных не использует.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000, help='Строк в пачке')
+        parser.add_argument('--invalid', type=float, default=0.0, help='Доля испорченных строк (0 — чистая пачка)')
+        parser.add_argument('--repeat', type=int, default=3, help='Сколько раз выполнять каждую проверку')
+        parser.add_argument('--seed', type=int, default=1, help='Зерно генератора')
+
+    def handle(self, *args, **options):
+        payload = _payload(options['rows'], options['invalid'], options['seed'])
+        repeat = max(options['repeat'], 1)
+
+        # Результаты прогонов не копятся в памяти: иначе сборщик мусора обходит их во время следующей проверки
+        drf_timings = _timings(lambda: TotalDataSerializer(data=payload, many=True).is_valid(), repeat)
+        batch_timings = _timings(lambda: validate_total_data_rows(payload), repeat)
+        drf_serializer = TotalDataSerializer(data=payload, many=True)
+        drf_serializer.is_valid()
+        rows, errors = validate_total_data_rows(payload)
+
+        drf = statistics.median(drf_timings)
+        batch = statistics.median(batch_timings)
+        self.stdout.write(f'{"TotalDataSerializer":<28} медиана: {drf:>8.3f} с')
+        self.stdout.write(f'{"validate_total_data_rows":<28} медиана: {batch:>8.3f} с')
+
+        drf_errors = {
+            index: row for index, row in enumerate(drf_serializer.errors or []) if row
+        } if drf_serializer.errors else {}
+        mismatches = []
+        if _normalize_errors(drf_errors) != _normalize_errors(errors):
+            mismatches.append(
+                f'ошибки различаются: DRF {len(drf_errors)} строк, пакетная проверка {len(errors)} строк'
+            )
+        if not drf_errors:
+            expected = [{field: row.get(field) for field in TOTAL_DATA_FIELDS} for row in drf_serializer.validated_data]
+            if expected != rows:
+                mismatches.append('проверенные значения различаются')
+        else:
+            # С ошибками DRF не отдаёт validated_data — сверяем значения на пачке без испорченных строк
+            clean = [item for index, item in enumerate(payload) if index not in drf_errors]
+            serializer = TotalDataSerializer(data=clean, many=True)
+            serializer.is_valid()
+            expected = [{field: row.get(field) for field in TOTAL_DATA_FIELDS} for row in serializer.validated_data]
+            if expected != validate_total_data_rows(clean)[0]:
+                mismatches.append('проверенные значения различаются')
+
+        self.stdout.write(f'Строк: {len(payload)}, с ошибками: {len(errors)}')
+        if mismatches:
+            raise CommandError('; '.join(mismatches))
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты совпадают. Ускорение (по медиане): {drf / batch:.1f}x' if batch else 'Ускорение: нет данных'
+        ))
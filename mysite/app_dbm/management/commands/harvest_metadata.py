@@ -0,0 +1,58 @@
+# app_dbm/management/commands/harvest_metadata.py
+from django.core.management.base import BaseCommand, CommandError
+
+from app_dbm.models import LinkDB
+from app_dbm.utils.harvester import HarvestOptions, harvest_many
+
+
+class Command(BaseCommand):
+    help = (
+        'Параллельный сбор метаданных с баз данных из LinkDB с записью в TotalData. '
+        'Учётные данные: --user/--password или стандартные PGUSER/PGPASSWORD/.pgpass.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stage', help='Только базы стенда с этим именем')
+        parser.add_argument('--alias', action='append', default=[], help='Только базы с этим алиасом (можно несколько)')
+        parser.add_argument('--workers', type=int, default=8, help='Размер пула потоков')
+        parser.add_argument('--per-host', type=int, default=2, help='Одновременных подключений к одному хосту')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Строк в одной порции записи')
+        parser.add_argument('--user', help='Пользователь для подключения к базам')
+        parser.add_argument('--password', help='Пароль для подключения к базам')
+        parser.add_argument('--connect-timeout', type=int, default=10, help='Таймаут подключения, с')
+        parser.add_argument('--statement-timeout', type=int, default=600, help='Таймаут запроса сбора, с')
+
+    def handle(self, *args, **options):
+        link_dbs = LinkDB.objects.filter(is_active=True).select_related('stage', 'base').order_by('host', 'alias')
+        if options['stage']:
+            link_dbs = link_dbs.filter(stage__name=options['stage'])
+        if options['alias']:
+            link_dbs = link_dbs.filter(alias__in=options['alias'])
+        link_dbs = list(link_dbs)
+        if not link_dbs:
+            raise CommandError('Не найдено ни одной базы для сбора')
+
+        results = harvest_many(link_dbs, HarvestOptions(
+            user=options['user'],
+            password=options['password'],
+            connect_timeout=options['connect_timeout'],
+            statement_timeout_ms=options['statement_timeout'] * 1000,
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            per_host=options['per_host'],
+        ))
+
+        for item in sorted(results, key=lambda result: result.seconds, reverse=True):
+            line = (
+                f'{item.alias:<30} {item.host:<25} строк: {item.rows:>8} '
+                f'(+{item.inserted} ~{item.updated} ={item.unchanged}) {item.seconds:>9.3f} с'
+            )
+            if item.error:
+                self.stdout.write(self.style.ERROR(f'{line}  ОШИБКА: {item.error}'))
+            else:
+                self.stdout.write(line)
+
+        failed = sum(1 for item in results if item.error)
+        self.stdout.write(self.style.SUCCESS(
+            f'Баз: {len(results)}, ошибок: {failed}, строк: {sum(item.rows for item in results)}'
+        ))
@@ -0,0 +1,44 @@
+# app_dbm/management/commands/load_ddl_dump.py
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_dbm.utils.ddl_dump import DDL_CHUNK_SIZE, load_ddl_dump
+
+
+class Command(BaseCommand):
+    help = (
+        'Загрузка метаданных в TotalData из файла pg_dump --schema-only (можно .gz) '
+        'для стендов без сетевого доступа. Разбор операторов выполняется в пуле процессов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу дампа')
+        parser.add_argument('--stand', required=True, help='Стенд (поле stand)')
+        parser.add_argument('--catalog', required=True, help='Алиас базы (поле table_catalog)')
+        parser.add_argument('--group-catalog', help='Группа базы (поле group_catalog)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Процессов разбора')
+        parser.add_argument('--chunk-size', type=int, default=DDL_CHUNK_SIZE, help='Операторов в одной задаче пула')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Строк в одной порции записи')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f'Файл не найден: {path}')
+
+        stats = load_ddl_dump(
+            path,
+            stand=options['stand'],
+            table_catalog=options['catalog'],
+            group_catalog=options['group_catalog'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            batch_size=options['batch_size'],
+        )
+        if stats['errors']:
+            self.stdout.write(self.style.WARNING(f'Не разобрано операторов: {stats["errors"]} (см. журнал)'))
+        self.stdout.write(self.style.SUCCESS(
+            'Операторов: {statements}, разобрано: {parsed}, таблиц: {tables}, столбцов: {rows}, '
+            'добавлено: {inserted}, обновлено: {updated}, без изменений: {unchanged}, '
+            'разбор: {parse_seconds} с, всего: {seconds} с'.format(**stats)
+        ))
@@ -0,0 +1,69 @@
+# app_dbm/management/commands/load_total_data.py
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_dbm.utils.total_data_loader import LoaderError, load_total_data
+from app_dbm.utils.total_data_partitions import PartitionError
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоковая загрузка CSV/NDJSON выгрузки (поля TotalData или результат utils/select.sql) '
+        'в TotalData через COPY и временную таблицу.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу выгрузки')
+        parser.add_argument(
+            '--format', dest='file_format', choices=['csv', 'ndjson'],
+            help='Формат файла (по умолчанию — по расширению)'
+        )
+        parser.add_argument('--stand', help='Принудительное значение стенда')
+        parser.add_argument('--delimiter', default=',', help='Разделитель CSV')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Строк NDJSON в одном блоке COPY')
+        parser.add_argument(
+            '--replace', action='store_true',
+            help='Файл — полный снимок: заменить срезы (стенд, база) из файла, отсутствующие строки деактивировать'
+        )
+        parser.add_argument(
+            '--replace-stand', action='store_true',
+            help='Файл — полный снимок стенда --stand: атомарно заменить его секцию, отсутствующие строки удалить'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f'Файл не найден: {path}')
+
+        file_format = options['file_format']
+        if not file_format:
+            extension = os.path.splitext(path)[1].lower()
+            file_format = 'ndjson' if extension in ('.ndjson', '.jsonl') else 'csv'
+
+        try:
+            stats = load_total_data(
+                path,
+                file_format=file_format,
+                stand=options['stand'],
+                delimiter=options['delimiter'],
+                batch_size=options['batch_size'],
+                replace=options['replace'],
+                replace_stand=options['replace_stand'],
+            )
+        except (LoaderError, PartitionError) as exc:
+            raise CommandError(str(exc))
+
+        if options['replace_stand']:
+            self.stdout.write(self.style.SUCCESS(
+                'Загружено: {received}, уникальных: {distinct}, дублей: {duplicates}, '
+                'строк в прежней секции: {replaced}, время: {seconds} с'.format(**stats)
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            'Загружено: {received}, уникальных: {distinct}, добавлено: {inserted}, '
+            'обновлено: {updated}, без изменений: {unchanged}, дублей: {duplicates}, '
+            'время: {seconds} с'.format(**stats)
+        ))
+        if options['replace']:
+            self.stdout.write(f'Заменено срезов: {stats["slices"]}, деактивировано: {stats["deactivated"]}')
@@ -0,0 +1,44 @@
+# app_dbm/management/commands/partition_total_data.py
+from django.core.management.base import BaseCommand, CommandError
+
+from app_dbm.utils.total_data_partitions import (
+    PartitionError, create_partition, drop_partition, ensure_partitions, list_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Управление секциями set_total_data_rows (PARTITION BY LIST (stand_id)). '
+        'Без параметров выводит список секций. '
+        '--ensure создаёт секции для всех DimStage и стендов из секции DEFAULT, '
+        '--create и --drop создают и удаляют секцию указанного стенда.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ensure', action='store_true', help='Создать недостающие секции')
+        parser.add_argument('--create', action='append', default=[], metavar='STAND',
+                            help='Создать секцию стенда (можно несколько раз)')
+        parser.add_argument('--drop', action='append', default=[], metavar='STAND',
+                            help='Удалить секцию стенда вместе с данными (можно несколько раз)')
+
+    def handle(self, *args, **options):
+        try:
+            if options['ensure']:
+                for stand, name, moved in ensure_partitions():
+                    self.stdout.write(f'{stand}: создана секция {name}, перенесено строк {moved}')
+            for stand in options['create']:
+                name, moved = create_partition(stand)
+                if moved is None:
+                    self.stdout.write(f'{stand}: секция {name} уже существует')
+                else:
+                    self.stdout.write(f'{stand}: создана секция {name}, перенесено строк {moved}')
+            for stand in options['drop']:
+                name = drop_partition(stand)
+                self.stdout.write(f'{stand}: секция {name} удалена' if name else f'{stand}: секции нет')
+        except PartitionError as exc:
+            raise CommandError(str(exc))
+
+        for item in list_partitions():
+            self.stdout.write(
+                f'{item["name"]:<50} {item["bound"]:<40} строк ~{item["rows"]:>10}  {item["size"] / 2 ** 20:>9.1f} МБ'
+            )
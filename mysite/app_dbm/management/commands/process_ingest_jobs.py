@@ -0,0 +1,28 @@
+# app_dbm/management/commands/process_ingest_jobs.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_dbm.utils.ingest_jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        'Фоновый обработчик очереди заданий пакетной загрузки TotalData. '
+        'Несколько обработчиков можно запускать параллельно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Работать постоянно, опрашивая очередь')
+        parser.add_argument('--sleep', type=float, default=5.0, help='Пауза между опросами пустой очереди, с')
+        parser.add_argument('--limit', type=int, help='Обработать не больше N заданий и выйти')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending_jobs(limit=options['limit'])
+            if processed:
+                self.stdout.write(f'Обработано заданий: {processed}')
+            if not options['loop']:
+                break
+            if not processed:
+                time.sleep(options['sleep'])
@@ -0,0 +1,66 @@
+# app_dbm/management/commands/purge_catalog.py
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_dbm.utils.catalog_purge import (
+    PURGE_BATCH_SIZE, PURGE_LOCK_TIMEOUT, PURGE_PAUSE, PURGE_STEPS, PurgeError, parse_window, purge_catalog,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Фоновая очистка неактивных и устаревших объектов каталога (столбцы, таблицы, схемы, LinkDB) '
+        'и строк TotalData порциями снизу вверх, каждая порция — отдельная короткая транзакция. '
+        'Запускается по расписанию; с --window останавливается вне окна обслуживания.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Срок хранения неактивных объектов, дней')
+        parser.add_argument('--step', action='append', choices=PURGE_STEPS, default=[],
+                            help='Выполнить только этот шаг (можно несколько)')
+        parser.add_argument('--batch-size', type=int, default=PURGE_BATCH_SIZE, help='Строк в одной транзакции')
+        parser.add_argument('--pause', type=float, default=PURGE_PAUSE, help='Пауза между порциями, с')
+        parser.add_argument('--lock-timeout', default=PURGE_LOCK_TIMEOUT, help='Предельное ожидание блокировки')
+        parser.add_argument('--window', help='Окно обслуживания ЧЧ:ММ-ЧЧ:ММ, например 20:00-07:00')
+        parser.add_argument('--max-batches', type=int, help='Остановиться после N порций')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError('Срок хранения не может быть отрицательным')
+        verbosity = options['verbosity']
+
+        def progress(step, batch, totals):
+            if verbosity >= 1:
+                done = ', '.join(f'{label}: {count}' for label, count in sorted(totals.items()))
+                self.stdout.write(f'{step:<12} порция: {batch:>8}  всего — {done}')
+
+        try:
+            window = parse_window(options['window']) if options['window'] else None
+            result = purge_catalog(
+                older_than=datetime.timedelta(days=options['days']),
+                steps=options['step'] or None,
+                batch_size=options['batch_size'],
+                pause=options['pause'],
+                lock_timeout=options['lock_timeout'],
+                window=window,
+                max_batches=options['max_batches'],
+                progress=progress,
+            )
+        except PurgeError as error:
+            raise CommandError(str(error)) from error
+
+        for label, count in sorted(result.deleted.items()):
+            self.stdout.write(f'{label:<20} удалено: {count:>10}')
+        if result.skipped_steps:
+            self.stdout.write(self.style.WARNING(
+                f'Шаги прерваны из-за блокировок: {", ".join(result.skipped_steps)}'
+            ))
+        message = (
+            f'Удалено строк: {result.total}, порций: {result.batches}, '
+            f'ожиданий блокировок: {result.lock_timeouts}, время: {result.seconds} с'
+        )
+        if result.stopped:
+            self.stdout.write(self.style.WARNING(f'{message}. Остановлено: {result.stopped}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,23 @@
+# app_dbm/management/commands/refresh_catalog_flat.py
+from django.core.management.base import BaseCommand
+
+from app_dbm.utils.catalog_flat import refresh_catalog_flat
+
+
+class Command(BaseCommand):
+    help = (
+        'Обновление материализованного представления catalog_flat (плоский каталог столбцов). '
+        'Синхронизация обновляет его сама; команда нужна после правок каталога в обход синхронизации '
+        '(админка, очистка) и для запуска по расписанию.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--blocking', action='store_true',
+                            help='Обычный REFRESH вместо CONCURRENTLY: быстрее, но блокирует чтение на время обновления')
+
+    def handle(self, *args, **options):
+        seconds = refresh_catalog_flat(concurrently=not options['blocking'])
+        if seconds:
+            self.stdout.write(self.style.SUCCESS(f'catalog_flat обновлено за {seconds} с'))
+        else:
+            self.stdout.write(self.style.WARNING('Обновление уже ожидает очереди в другом процессе — пропущено'))
@@ -0,0 +1,80 @@
+# app_dbm/management/commands/rekey_total_data.py
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from app_dbm.models import TotalData, TotalDataRow
+from app_dbm.utils.total_data_keys import HASH_FIELDS, hash_sql
+
+
+class Command(BaseCommand):
+    help = (
+        'Разовый перерасчёт hash_address всех записей TotalData по единым правилам '
+        'utils.total_data_keys. Дубли одного столбца схлопываются: остаётся запись '
+        'с последним updated_at.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Только посчитать, ничего не менять')
+
+    def handle(self, *args, **options):
+        # Ключ считается по текстовым полям представления set_total_data, строки переносятся в set_total_data_rows
+        view = connection.ops.quote_name(TotalData._meta.db_table)
+        table = connection.ops.quote_name(TotalDataRow._meta.db_table)
+        columns = [field.column for field in TotalDataRow._meta.concrete_fields if not field.generated]
+        other_columns = ', '.join(column for column in columns if column != 'hash_address')
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'''
+                CREATE TEMP TABLE tmp_rekey ON COMMIT DROP AS
+                SELECT
+                     t.hash_address AS old_hash
+                    ,{hash_sql('t')} AS new_hash
+                    ,ROW_NUMBER() OVER (
+                        PARTITION BY {hash_sql('t')}
+                        ORDER BY t.updated_at DESC, t.hash_address
+                    ) AS rn
+                FROM {view} AS t
+            ''')
+            cursor.execute('CREATE INDEX ON tmp_rekey (old_hash)')
+            cursor.execute('ANALYZE tmp_rekey')
+            cursor.execute('''
+                SELECT
+                     COUNT(*)
+                    ,COUNT(*) FILTER (WHERE rn > 1)
+                    ,COUNT(*) FILTER (WHERE rn = 1 AND old_hash <> new_hash)
+                FROM tmp_rekey
+            ''')
+            total, duplicates, moved = cursor.fetchone()
+
+            self.stdout.write(
+                f'Ключ: {", ".join(HASH_FIELDS)}. Записей: {total}, '
+                f'дублей к удалению: {duplicates}, ключей к замене: {moved}'
+            )
+            if options['dry_run']:
+                transaction.set_rollback(True)
+                return
+
+            # Перенос через временную таблицу: новый ключ одной записи может совпадать
+            # со старым ключом другой, поэтому UPDATE первичного ключа «на месте» не подходит
+            cursor.execute(f'''
+                CREATE TEMP TABLE tmp_rekey_rows ON COMMIT DROP AS
+                SELECT r.new_hash, {', '.join(f't.{column}' for column in columns if column != 'hash_address')}
+                FROM {table} AS t
+                    JOIN tmp_rekey AS r ON r.old_hash = t.hash_address
+                WHERE r.rn = 1 AND r.old_hash <> r.new_hash
+            ''')
+            cursor.execute(f'''
+                DELETE FROM {table} AS t
+                USING tmp_rekey AS r
+                WHERE r.old_hash = t.hash_address
+                  AND (r.rn > 1 OR r.old_hash <> r.new_hash)
+            ''')
+            cursor.execute(f'''
+                INSERT INTO {table} (hash_address, {other_columns})
+                SELECT new_hash, {other_columns}
+                FROM tmp_rekey_rows
+            ''')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: удалено дублей {duplicates}, перенесено ключей {moved}'
+        ))
@@ -0,0 +1,32 @@
+# app_dbm/management/commands/sync_database.py
+from django.core.management.base import BaseCommand, CommandError
+
+from app_dbm.utils.syncing_model import SyncError, sync_stage_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        'Синхронизация схем, таблиц и столбцов одной базы одного стенда со срезом TotalData. '
+        'Все шаги выполняются в одной транзакции.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stage', required=True, help='Стенд (TotalData.stand)')
+        parser.add_argument('--catalog', required=True, help='Алиас базы (TotalData.table_catalog)')
+        parser.add_argument('--dry-run', action='store_true', help='Выполнить шаги и откатить изменения')
+
+    def handle(self, *args, **options):
+        try:
+            result = sync_stage_catalog(options['stage'], options['catalog'], dry_run=options['dry_run'])
+        except SyncError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(f'{"slice":<22} строк: {result.rows:>8} {result.timings["slice"]:>9.3f} с')
+        for name, count in result.counts.items():
+            self.stdout.write(f'{name:<22} строк: {count:>8} {result.timings[name]:>9.3f} с')
+        for counter, count in sorted(result.changes.items()):
+            self.stdout.write(f'{counter:<22} {count:>8}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.stage}/{result.catalog}: запуск #{result.run_id}, готово за {result.seconds} с'
+            + (' (dry-run, изменения откачены)' if result.dry_run else '')
+        ))
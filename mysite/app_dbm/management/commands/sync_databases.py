@@ -0,0 +1,45 @@
+# app_dbm/management/commands/sync_databases.py
+from django.core.management.base import BaseCommand, CommandError
+
+from app_dbm.utils.sync_orchestrator import pairs_for_stages, sync_many
+
+
+class Command(BaseCommand):
+    help = (
+        'Параллельная синхронизация многих баз: все базы стендов --stage и/или пары --pair СТЕНД:БАЗА. '
+        'Одна и та же пара не синхронизируется двумя процессами одновременно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stage', action='append', default=[], help='Все активные базы стенда (можно несколько)')
+        parser.add_argument('--pair', action='append', default=[], help='Пара СТЕНД:БАЗА (можно несколько)')
+        parser.add_argument('--workers', type=int, default=4, help='Одновременных синхронизаций')
+        parser.add_argument('--dry-run', action='store_true', help='Выполнить шаги и откатить изменения')
+
+    def handle(self, *args, **options):
+        pairs = pairs_for_stages(options['stage']) if options['stage'] else []
+        for value in options['pair']:
+            stage, separator, catalog = value.partition(':')
+            if not separator or not stage or not catalog:
+                raise CommandError(f'Пара должна быть в виде СТЕНД:БАЗА: {value}')
+            pairs.append((stage, catalog))
+        if not pairs:
+            raise CommandError('Не задано ни одной пары для синхронизации')
+
+        result = sync_many(pairs, workers=options['workers'], dry_run=options['dry_run'])
+
+        for item in sorted(result.results, key=lambda item: item.seconds, reverse=True):
+            line = (
+                f'{item.stage + "/" + item.catalog:<40} срез: {item.rows:>8} '
+                f'изменено: {item.rows_touched:>8} {item.seconds:>9.3f} с'
+            )
+            if item.error:
+                self.stdout.write(self.style.ERROR(f'{line}  ОШИБКА: {item.error}'))
+            else:
+                self.stdout.write(line)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Пар: {len(result.results)}, ошибок: {len(result.failed)}, '
+            f'изменено строк: {result.rows_touched}, общее время: {result.seconds} с'
+            + (' (dry-run)' if options['dry_run'] else '')
+        ))
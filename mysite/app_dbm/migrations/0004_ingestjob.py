@@ -0,0 +1,42 @@
+# Generated by Django 5.1.4 on 2026-10-18 16:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_dbm', '0003_remove_dimcolumnname_updated_by_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='дата изменения')),
+                ('is_active', models.BooleanField(default=True, verbose_name='запись активна')),
+                ('status', models.CharField(choices=[('pending', 'в очереди'), ('running', 'выполняется'), ('done', 'выполнено'), ('failed', 'ошибка')], db_index=True, default='pending', max_length=16, verbose_name='статус')),
+                ('payload', models.JSONField(blank=True, null=True, verbose_name='строки к загрузке')),
+                ('rows_total', models.IntegerField(default=0, verbose_name='всего строк')),
+                ('rows_processed', models.IntegerField(default=0, verbose_name='обработано строк')),
+                ('inserted', models.IntegerField(default=0, verbose_name='добавлено')),
+                ('updated', models.IntegerField(default=0, verbose_name='обновлено')),
+                ('unchanged', models.IntegerField(default=0, verbose_name='без изменений')),
+                ('errors', models.JSONField(blank=True, null=True, verbose_name='ошибки')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='начало обработки')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='окончание обработки')),
+                ('author', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='автор')),
+            ],
+            options={
+                'verbose_name': '15 Задание пакетной загрузки.',
+                'verbose_name_plural': '15 Задания пакетной загрузки.',
+                'db_table': 'app_dbm"."ingest_job',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
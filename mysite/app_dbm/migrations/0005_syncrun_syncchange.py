@@ -0,0 +1,81 @@
+# Generated by Django 5.1.4 on 2026-10-18 16:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_dbm', '0004_ingestjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='дата изменения')),
+                ('is_active', models.BooleanField(default=True, verbose_name='запись активна')),
+                ('stage', models.CharField(db_index=True, max_length=255, verbose_name='стенд')),
+                ('catalog', models.CharField(max_length=255, verbose_name='база данных')),
+                ('status', models.CharField(choices=[('running', 'выполняется'), ('done', 'выполнено'), ('failed', 'ошибка')], db_index=True, default='running', max_length=16, verbose_name='статус')),
+                ('dry_run', models.BooleanField(default=False, verbose_name='без сохранения')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='начало')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='окончание')),
+                ('rows_scanned', models.IntegerField(default=0, verbose_name='строк среза')),
+                ('schemas_added', models.IntegerField(default=0, verbose_name='схем добавлено')),
+                ('schemas_updated', models.IntegerField(default=0, verbose_name='схем обновлено')),
+                ('schemas_reactivated', models.IntegerField(default=0, verbose_name='схем восстановлено')),
+                ('schemas_deactivated', models.IntegerField(default=0, verbose_name='схем деактивировано')),
+                ('tables_added', models.IntegerField(default=0, verbose_name='таблиц добавлено')),
+                ('tables_updated', models.IntegerField(default=0, verbose_name='таблиц обновлено')),
+                ('tables_reactivated', models.IntegerField(default=0, verbose_name='таблиц восстановлено')),
+                ('tables_deactivated', models.IntegerField(default=0, verbose_name='таблиц деактивировано')),
+                ('columns_added', models.IntegerField(default=0, verbose_name='столбцов добавлено')),
+                ('columns_updated', models.IntegerField(default=0, verbose_name='столбцов обновлено')),
+                ('columns_reactivated', models.IntegerField(default=0, verbose_name='столбцов восстановлено')),
+                ('columns_deactivated', models.IntegerField(default=0, verbose_name='столбцов деактивировано')),
+                ('timings', models.JSONField(blank=True, null=True, verbose_name='время шагов')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='ошибка')),
+                ('author', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='автор')),
+                ('link_db', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='app_dbm.linkdb', verbose_name='база')),
+            ],
+            options={
+                'verbose_name': '16 Запуск синхронизации.',
+                'verbose_name_plural': '16 Запуски синхронизации.',
+                'db_table': 'app_dbm"."sync_run',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SyncChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('object_type', models.SmallIntegerField(choices=[(1, 'схема'), (2, 'таблица'), (3, 'столбец')], verbose_name='тип объекта')),
+                ('object_id', models.BigIntegerField(verbose_name='id объекта')),
+                ('action', models.SmallIntegerField(choices=[(1, 'добавлен'), (2, 'обновлён'), (3, 'восстановлен'), (4, 'деактивирован')], verbose_name='изменение')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='app_dbm.syncrun', verbose_name='запуск')),
+            ],
+            options={
+                'verbose_name': '17 Изменение синхронизации.',
+                'verbose_name_plural': '17 Изменения синхронизации.',
+                'db_table': 'app_dbm"."sync_change',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='syncrun',
+            index=models.Index(fields=['stage', 'catalog', '-created_at'], name='sync_run_stage_e4d5ea_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='syncchange',
+            index=models.Index(fields=['run', 'object_type'], name='sync_change_run_id_76ec62_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='syncchange',
+            index=models.Index(fields=['object_type', 'object_id'], name='sync_change_object__b47fac_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_dbm', '0005_syncrun_syncchange'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='linkcolumn',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['table'], name='link_columns_active_table_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linktable',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['schema'], name='link_tables_active_schema_idx'),
+        ),
+    ]
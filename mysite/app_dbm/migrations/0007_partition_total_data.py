@@ -0,0 +1,108 @@
+# Секционирование set_total_data по стенду (PARTITION BY LIST (stand))
+
+import hashlib
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+SCHEMA = 'app_dbm'
+
+# Имена секций зафиксированы здесь: с миграции 0010 секционирована set_total_data_rows,
+# и utils.total_data_partitions именует уже её секции
+DEFAULT_PARTITION = 'set_total_data_default'
+
+
+def partition_name(stand: str) -> str:
+    slug = re.sub(r'[^a-z0-9]+', '_', stand.lower()).strip('_')[:30]
+    return f'set_total_data_{slug}_{hashlib.md5(stand.encode("utf-8")).hexdigest()[:8]}'
+
+
+def _names(schema_editor):
+    quote = schema_editor.quote_name
+    return {
+        'parent': f'{quote(SCHEMA)}.{quote("set_total_data")}',
+        'heap': f'{quote(SCHEMA)}.{quote("set_total_data_heap")}',
+        'default': f'{quote(SCHEMA)}.{quote(DEFAULT_PARTITION)}',
+    }
+
+
+def _user_table(apps, schema_editor):
+    user = apps.get_model(settings.AUTH_USER_MODEL)
+    return schema_editor.quote_name(user._meta.db_table)
+
+
+def partition_forward(apps, schema_editor):
+    """Обычная таблица -> секционированная: секция на каждый имеющийся стенд + DEFAULT."""
+    names = _names(schema_editor)
+    quote = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {names["parent"]} RENAME TO "set_total_data_heap"')
+        cursor.execute(f'ALTER TABLE {names["heap"]} RENAME CONSTRAINT "set_total_data_pkey" TO "set_total_data_heap_pkey"')
+        # Ключ секционированной таблицы включает stand, поэтому NULL недопустим; hash_address от этого не меняется
+        cursor.execute(f"UPDATE {names['heap']} SET stand = '' WHERE stand IS NULL")
+        cursor.execute(
+            f'CREATE TABLE {names["parent"]} '
+            f'(LIKE {names["heap"]} INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS) '
+            f'PARTITION BY LIST (stand)'
+        )
+        cursor.execute(f"ALTER TABLE {names['parent']} ALTER COLUMN stand SET DEFAULT '', ALTER COLUMN stand SET NOT NULL")
+        cursor.execute(f'ALTER TABLE {names["parent"]} ADD CONSTRAINT "set_total_data_pkey" PRIMARY KEY (hash_address, stand)')
+        cursor.execute(
+            f'ALTER TABLE {names["parent"]} ADD CONSTRAINT "set_total_data_author_id_fk" '
+            f'FOREIGN KEY (author_id) REFERENCES {_user_table(apps, schema_editor)} (id) DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute(f'CREATE INDEX "set_total_data_author_id_idx" ON {names["parent"]} (author_id)')
+        cursor.execute(f'CREATE TABLE {names["default"]} PARTITION OF {names["parent"]} DEFAULT')
+
+        cursor.execute(f'SELECT DISTINCT stand FROM {names["heap"]}')
+        for (stand,) in cursor.fetchall():
+            table = f'{quote(SCHEMA)}.{quote(partition_name(stand))}'
+            cursor.execute(f'CREATE TABLE {table} PARTITION OF {names["parent"]} FOR VALUES IN (%s)', [stand])
+
+        cursor.execute(f'INSERT INTO {names["parent"]} SELECT * FROM {names["heap"]}')
+        cursor.execute(f'DROP TABLE {names["heap"]}')
+        cursor.execute(f'ANALYZE {names["parent"]}')
+
+
+def partition_backward(apps, schema_editor):
+    """Секционированная таблица -> обычная с ключом hash_address."""
+    names = _names(schema_editor)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE {names["heap"]} '
+            f'(LIKE {names["parent"]} INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS)'
+        )
+        cursor.execute(f'INSERT INTO {names["heap"]} SELECT * FROM {names["parent"]}')
+        cursor.execute(f'DROP TABLE {names["parent"]} CASCADE')
+        cursor.execute(f'ALTER TABLE {names["heap"]} RENAME TO "set_total_data"')
+        cursor.execute(f'ALTER TABLE {names["parent"]} ALTER COLUMN stand DROP DEFAULT, ALTER COLUMN stand DROP NOT NULL')
+        cursor.execute(f'ALTER TABLE {names["parent"]} ADD CONSTRAINT "set_total_data_pkey" PRIMARY KEY (hash_address)')
+        cursor.execute(
+            f'ALTER TABLE {names["parent"]} ADD CONSTRAINT "set_total_data_author_id_fk" '
+            f'FOREIGN KEY (author_id) REFERENCES {_user_table(apps, schema_editor)} (id) DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute(f'CREATE INDEX "set_total_data_author_id_idx" ON {names["parent"]} (author_id)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_dbm', '0006_sync_sweep_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='totaldata',
+                    name='stand',
+                    field=models.CharField(blank=True, default='', max_length=255, verbose_name='стенд'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(partition_forward, partition_backward),
+            ],
+        ),
+    ]
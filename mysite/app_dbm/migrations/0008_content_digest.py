@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-18 16:54
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_dbm', '0007_partition_total_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linkcolumn',
+            name='content_digest',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.RawSQL('md5(COALESCE(("type")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("is_null")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("is_key")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("unique_together")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("default")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("description")::text, E\'\\x1e\'))', ()), output_field=models.CharField(max_length=32), verbose_name='дайджест содержимого'),
+        ),
+        migrations.AddField(
+            model_name='syncrun',
+            name='columns_unchanged',
+            field=models.IntegerField(default=0, verbose_name='столбцов без изменений'),
+        ),
+        migrations.AddField(
+            model_name='totaldata',
+            name='content_digest',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.RawSQL('md5(COALESCE(("stand")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("table_type")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("group_catalog")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("table_catalog")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("table_schema")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("table_name")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("table_comment")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("column_number")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("column_name")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("column_comment")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("data_type")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("is_nullable")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("is_auto")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("column_info")::text, E\'\\x1e\'))', ()), output_field=models.CharField(max_length=32), verbose_name='дайджест содержимого'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-18 16:57
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_dbm', '0008_content_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TotalDataObservation',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('stand', models.CharField(max_length=255, verbose_name='стенд')),
+                ('table_catalog', models.CharField(blank=True, max_length=255, null=True, verbose_name='имя базы данных')),
+                ('observed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='время наблюдения')),
+                ('source', models.CharField(choices=[('bulk', 'пакетная загрузка'), ('load', 'загрузка файла'), ('snapshot', 'замена снимком'), ('manifest', 'манифест'), ('ddl_dump', 'DDL-дамп')], max_length=16, verbose_name='источник')),
+                ('complete', models.BooleanField(default=False, verbose_name='полный снимок среза')),
+                ('rows_seen', models.IntegerField(default=0, verbose_name='строк')),
+                ('keys', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, null=True, size=None, verbose_name='ключи строк')),
+            ],
+            options={
+                'verbose_name': '18 Наблюдение среза.',
+                'verbose_name_plural': '18 Наблюдения срезов.',
+                'db_table': 'app_dbm"."set_total_data_observation',
+                'indexes': [models.Index(fields=['stand', 'table_catalog', '-observed_at'], name='set_total_d_stand_3870c3_idx'), django.contrib.postgres.indexes.GinIndex(fields=['keys'], name='total_data_obs_keys_gin')],
+            },
+        ),
+    ]
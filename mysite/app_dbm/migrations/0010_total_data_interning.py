@@ -0,0 +1,454 @@
+# Интернирование повторяющихся полей TotalData: словари стендов, баз, схем и таблиц,
+# строки в set_total_data_rows (секционирована по stand_id), set_total_data — представление с триггером записи
+
+import importlib
+
+import django.db.models.deletion
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+SCHEMA = 'app_dbm'
+
+# Имена секций зафиксированы здесь, как и в 0007: utils.total_data_partitions может их поменять
+DEFAULT_PARTITION = 'set_total_data_rows_default'
+TEXT_TABLE = 'set_total_data_text'
+
+# Секции прежней set_total_data именует миграция 0007
+partitioning_0007 = importlib.import_module('app_dbm.migrations.0007_partition_total_data')
+
+# SQL и состав полей зафиксированы здесь, как в 0007: utils.total_data_interning и utils.total_data_keys
+# строятся по текущим моделям, и их изменение не должно менять эту миграцию
+
+# Поля дайджеста содержимого set_total_data_rows и прежней set_total_data
+ROW_DIGEST_COLUMNS = (
+    'stand_id', 'table_id', 'table_comment', 'column_number', 'column_name',
+    'column_comment', 'data_type', 'is_nullable', 'is_auto', 'column_info',
+)
+TOTAL_DATA_FIELDS = (
+    'stand', 'table_type', 'group_catalog', 'table_catalog',
+    'table_schema', 'table_name', 'table_comment', 'column_number',
+    'column_name', 'column_comment', 'data_type', 'is_nullable',
+    'is_auto', 'column_info',
+)
+
+# Пополнение словарей значениями прежней таблицы set_total_data_text
+INTERN_SQL = [
+    '''
+    INSERT INTO "app_dbm"."set_total_data_stand" (name)
+    SELECT DISTINCT COALESCE(src.stand, '')
+    FROM (SELECT DISTINCT stand, group_catalog, table_catalog, table_schema, table_type, table_name FROM "app_dbm"."set_total_data_text") AS src
+    WHERE NOT EXISTS (SELECT 1 FROM "app_dbm"."set_total_data_stand" AS d WHERE d.name = COALESCE(src.stand, ''))
+    ON CONFLICT DO NOTHING
+    ''',
+    '''
+    INSERT INTO "app_dbm"."set_total_data_catalog" (stand_id, group_catalog, name)
+    SELECT DISTINCT ds.id, src.group_catalog, src.table_catalog
+    FROM (SELECT DISTINCT stand, group_catalog, table_catalog, table_schema, table_type, table_name FROM "app_dbm"."set_total_data_text") AS src
+        JOIN "app_dbm"."set_total_data_stand" AS ds ON ds.name = COALESCE(src.stand, '')
+    WHERE NOT EXISTS (
+        SELECT 1 FROM "app_dbm"."set_total_data_catalog" AS d
+        WHERE d.stand_id = ds.id
+          AND COALESCE(d.name, '') = COALESCE(src.table_catalog, '') AND (d.name IS NULL) = (src.table_catalog IS NULL)
+          AND COALESCE(d.group_catalog, '') = COALESCE(src.group_catalog, '') AND (d.group_catalog IS NULL) = (src.group_catalog IS NULL)
+    )
+    ON CONFLICT DO NOTHING
+    ''',
+    '''
+    INSERT INTO "app_dbm"."set_total_data_schema" (catalog_id, name)
+    SELECT DISTINCT dc.id, src.table_schema
+    FROM (SELECT DISTINCT stand, group_catalog, table_catalog, table_schema, table_type, table_name FROM "app_dbm"."set_total_data_text") AS src
+        JOIN "app_dbm"."set_total_data_stand" AS ds ON ds.name = COALESCE(src.stand, '')
+        JOIN "app_dbm"."set_total_data_catalog" AS dc ON dc.stand_id = ds.id AND COALESCE(dc.name, '') = COALESCE(src.table_catalog, '') AND (dc.name IS NULL) = (src.table_catalog IS NULL) AND COALESCE(dc.group_catalog, '') = COALESCE(src.group_catalog, '') AND (dc.group_catalog IS NULL) = (src.group_catalog IS NULL)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM "app_dbm"."set_total_data_schema" AS d
+        WHERE d.catalog_id = dc.id AND COALESCE(d.name, '') = COALESCE(src.table_schema, '') AND (d.name IS NULL) = (src.table_schema IS NULL)
+    )
+    ON CONFLICT DO NOTHING
+    ''',
+    '''
+    INSERT INTO "app_dbm"."set_total_data_table" (schema_id, table_type, name)
+    SELECT DISTINCT dsc.id, src.table_type, src.table_name
+    FROM (SELECT DISTINCT stand, group_catalog, table_catalog, table_schema, table_type, table_name FROM "app_dbm"."set_total_data_text") AS src
+        JOIN "app_dbm"."set_total_data_stand" AS ds ON ds.name = COALESCE(src.stand, '')
+        JOIN "app_dbm"."set_total_data_catalog" AS dc ON dc.stand_id = ds.id AND COALESCE(dc.name, '') = COALESCE(src.table_catalog, '') AND (dc.name IS NULL) = (src.table_catalog IS NULL) AND COALESCE(dc.group_catalog, '') = COALESCE(src.group_catalog, '') AND (dc.group_catalog IS NULL) = (src.group_catalog IS NULL)
+        JOIN "app_dbm"."set_total_data_schema" AS dsc ON dsc.catalog_id = dc.id AND COALESCE(dsc.name, '') = COALESCE(src.table_schema, '') AND (dsc.name IS NULL) = (src.table_schema IS NULL)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM "app_dbm"."set_total_data_table" AS d
+        WHERE d.schema_id = dsc.id
+          AND COALESCE(d.name, '') = COALESCE(src.table_name, '') AND (d.name IS NULL) = (src.table_name IS NULL)
+          AND COALESCE(d.table_type, '') = COALESCE(src.table_type, '') AND (d.table_type IS NULL) = (src.table_type IS NULL)
+    )
+    ON CONFLICT DO NOTHING
+    ''',
+]
+
+# Соединение строки src со словарями: ds — стенд, dt — таблица
+RESOLVE_SRC_SQL = '''
+    JOIN "app_dbm"."set_total_data_stand" AS ds ON ds.name = COALESCE(src.stand, '')
+    JOIN "app_dbm"."set_total_data_catalog" AS dc ON dc.stand_id = ds.id AND COALESCE(dc.name, '') = COALESCE(src.table_catalog, '') AND (dc.name IS NULL) = (src.table_catalog IS NULL) AND COALESCE(dc.group_catalog, '') = COALESCE(src.group_catalog, '') AND (dc.group_catalog IS NULL) = (src.group_catalog IS NULL)
+    JOIN "app_dbm"."set_total_data_schema" AS dsc ON dsc.catalog_id = dc.id AND COALESCE(dsc.name, '') = COALESCE(src.table_schema, '') AND (dsc.name IS NULL) = (src.table_schema IS NULL)
+    JOIN "app_dbm"."set_total_data_table" AS dt ON dt.schema_id = dsc.id AND COALESCE(dt.name, '') = COALESCE(src.table_name, '') AND (dt.name IS NULL) = (src.table_name IS NULL) AND COALESCE(dt.table_type, '') = COALESCE(src.table_type, '') AND (dt.table_type IS NULL) = (src.table_type IS NULL)
+'''
+
+# Представление set_total_data на месте прежней таблицы: функция интернирования и INSTEAD OF-триггер записи
+COMPAT_VIEW_SQL = [
+    '''
+    CREATE VIEW "app_dbm"."set_total_data" AS
+    SELECT r.hash_address, r.created_at, r.updated_at, r.is_active, r.author_id,
+           ds.name AS stand, dt.table_type AS table_type, dc.group_catalog AS group_catalog, dc.name AS table_catalog, dsc.name AS table_schema, dt.name AS table_name, r.table_comment, r.column_number, r.column_name, r.column_comment, r.data_type, r.is_nullable, r.is_auto, r.column_info, r.content_digest
+    FROM "app_dbm"."set_total_data_rows" AS r
+        JOIN "app_dbm"."set_total_data_table" AS dt ON dt.id = r.table_id
+        JOIN "app_dbm"."set_total_data_schema" AS dsc ON dsc.id = dt.schema_id
+        JOIN "app_dbm"."set_total_data_catalog" AS dc ON dc.id = dsc.catalog_id
+        JOIN "app_dbm"."set_total_data_stand" AS ds ON ds.id = r.stand_id
+    ''',
+    '''
+    CREATE FUNCTION "app_dbm"."set_total_data_intern"(
+        p_stand text, p_group_catalog text, p_table_catalog text,
+        p_table_schema text, p_table_type text, p_table_name text,
+        OUT o_stand_id smallint, OUT o_table_id bigint
+    ) LANGUAGE plpgsql AS $body$
+    DECLARE
+        v_catalog_id bigint;
+        v_schema_id bigint;
+    BEGIN
+        p_stand := COALESCE(p_stand, '');
+        SELECT d.id INTO o_stand_id FROM "app_dbm"."set_total_data_stand" AS d WHERE d.name = p_stand;
+        IF NOT FOUND THEN
+            INSERT INTO "app_dbm"."set_total_data_stand" (name) VALUES (p_stand) ON CONFLICT DO NOTHING;
+            SELECT d.id INTO o_stand_id FROM "app_dbm"."set_total_data_stand" AS d WHERE d.name = p_stand;
+        END IF;
+
+        SELECT d.id INTO v_catalog_id FROM "app_dbm"."set_total_data_catalog" AS d
+        WHERE d.stand_id = o_stand_id
+          AND d.name IS NOT DISTINCT FROM p_table_catalog
+          AND d.group_catalog IS NOT DISTINCT FROM p_group_catalog;
+        IF NOT FOUND THEN
+            INSERT INTO "app_dbm"."set_total_data_catalog" (stand_id, group_catalog, name)
+            VALUES (o_stand_id, p_group_catalog, p_table_catalog) ON CONFLICT DO NOTHING;
+            SELECT d.id INTO v_catalog_id FROM "app_dbm"."set_total_data_catalog" AS d
+            WHERE d.stand_id = o_stand_id
+              AND d.name IS NOT DISTINCT FROM p_table_catalog
+              AND d.group_catalog IS NOT DISTINCT FROM p_group_catalog;
+        END IF;
+
+        SELECT d.id INTO v_schema_id FROM "app_dbm"."set_total_data_schema" AS d
+        WHERE d.catalog_id = v_catalog_id AND d.name IS NOT DISTINCT FROM p_table_schema;
+        IF NOT FOUND THEN
+            INSERT INTO "app_dbm"."set_total_data_schema" (catalog_id, name) VALUES (v_catalog_id, p_table_schema) ON CONFLICT DO NOTHING;
+            SELECT d.id INTO v_schema_id FROM "app_dbm"."set_total_data_schema" AS d
+            WHERE d.catalog_id = v_catalog_id AND d.name IS NOT DISTINCT FROM p_table_schema;
+        END IF;
+
+        SELECT d.id INTO o_table_id FROM "app_dbm"."set_total_data_table" AS d
+        WHERE d.schema_id = v_schema_id
+          AND d.name IS NOT DISTINCT FROM p_table_name
+          AND d.table_type IS NOT DISTINCT FROM p_table_type;
+        IF NOT FOUND THEN
+            INSERT INTO "app_dbm"."set_total_data_table" (schema_id, table_type, name)
+            VALUES (v_schema_id, p_table_type, p_table_name) ON CONFLICT DO NOTHING;
+            SELECT d.id INTO o_table_id FROM "app_dbm"."set_total_data_table" AS d
+            WHERE d.schema_id = v_schema_id
+              AND d.name IS NOT DISTINCT FROM p_table_name
+              AND d.table_type IS NOT DISTINCT FROM p_table_type;
+        END IF;
+    END
+    $body$
+    ''',
+    '''
+    CREATE FUNCTION "app_dbm"."set_total_data_write"() RETURNS trigger LANGUAGE plpgsql AS $body$
+    DECLARE
+        v_ids record;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM "app_dbm"."set_total_data_rows" WHERE hash_address = OLD.hash_address AND stand_id = (SELECT d.id FROM "app_dbm"."set_total_data_stand" AS d WHERE d.name = OLD.stand);
+            IF NOT FOUND THEN
+                RETURN NULL;
+            END IF;
+            RETURN OLD;
+        END IF;
+
+        SELECT * INTO v_ids FROM "app_dbm"."set_total_data_intern"(
+            NEW.stand, NEW.group_catalog, NEW.table_catalog, NEW.table_schema, NEW.table_type, NEW.table_name
+        );
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO "app_dbm"."set_total_data_rows" (hash_address, created_at, updated_at, is_active, author_id, stand_id, table_id, table_comment, column_number, column_name, column_comment, data_type, is_nullable, is_auto, column_info) VALUES (NEW.hash_address, COALESCE(NEW.created_at, NOW()), COALESCE(NEW.updated_at, NOW()), COALESCE(NEW.is_active, TRUE), NEW.author_id, v_ids.o_stand_id, v_ids.o_table_id, NEW.table_comment, NEW.column_number, NEW.column_name, NEW.column_comment, NEW.data_type, NEW.is_nullable, NEW.is_auto, NEW.column_info)
+            RETURNING created_at, updated_at, is_active, content_digest
+            INTO NEW.created_at, NEW.updated_at, NEW.is_active, NEW.content_digest;
+        ELSE
+            UPDATE "app_dbm"."set_total_data_rows" SET hash_address = NEW.hash_address, created_at = COALESCE(NEW.created_at, NOW()), updated_at = COALESCE(NEW.updated_at, NOW()), is_active = COALESCE(NEW.is_active, TRUE), author_id = NEW.author_id, stand_id = v_ids.o_stand_id, table_id = v_ids.o_table_id, table_comment = NEW.table_comment, column_number = NEW.column_number, column_name = NEW.column_name, column_comment = NEW.column_comment, data_type = NEW.data_type, is_nullable = NEW.is_nullable, is_auto = NEW.is_auto, column_info = NEW.column_info WHERE hash_address = OLD.hash_address AND stand_id = (SELECT d.id FROM "app_dbm"."set_total_data_stand" AS d WHERE d.name = OLD.stand)
+            RETURNING created_at, updated_at, is_active, content_digest
+            INTO NEW.created_at, NEW.updated_at, NEW.is_active, NEW.content_digest;
+            IF NOT FOUND THEN
+                RETURN NULL;
+            END IF;
+        END IF;
+        NEW.stand := COALESCE(NEW.stand, '');
+        RETURN NEW;
+    END
+    $body$
+    ''',
+    '''
+    CREATE TRIGGER "set_total_data_write"
+    INSTEAD OF INSERT OR UPDATE OR DELETE ON "app_dbm"."set_total_data"
+    FOR EACH ROW EXECUTE FUNCTION "app_dbm"."set_total_data_write"()
+    ''',
+]
+
+DROP_COMPAT_VIEW_SQL = [
+    'DROP VIEW IF EXISTS "app_dbm"."set_total_data"',
+    'DROP FUNCTION IF EXISTS "app_dbm"."set_total_data_write"()',
+    'DROP FUNCTION IF EXISTS "app_dbm"."set_total_data_intern"(text, text, text, text, text, text)',
+]
+
+
+def _digest_sql(expressions) -> str:
+    parts = " || E'\\x1f' || ".join(f"COALESCE(({expression})::text, E'\\x1e')" for expression in expressions)
+    return f'md5({parts})'
+
+
+def _partition_name(stand: str) -> str:
+    return partitioning_0007.partition_name(stand).replace('set_total_data_', 'set_total_data_rows_', 1)
+
+
+def _qualified(schema_editor, name: str) -> str:
+    return f'{schema_editor.quote_name(SCHEMA)}.{schema_editor.quote_name(name)}'
+
+
+def _columns_sql(model, schema_editor, digest_columns) -> str:
+    """Столбцы таблицы по полям модели из состояния миграции; дайджест — генерируемый столбец."""
+    connection = schema_editor.connection
+    columns = []
+    for field in model._meta.concrete_fields:
+        if field.generated:
+            expression = _digest_sql([schema_editor.quote_name(column) for column in digest_columns])
+            columns.append(f'{schema_editor.quote_name(field.column)} varchar(32) GENERATED ALWAYS AS ({expression}) STORED')
+            continue
+        # У ForeignKey db_type — тип ключа целевой модели (smallint для стенда)
+        null = 'NULL' if field.null else 'NOT NULL'
+        columns.append(f'{schema_editor.quote_name(field.column)} {field.db_type(connection)} {null}')
+    return ',\n'.join(columns)
+
+
+def _data_columns(model) -> str:
+    return ', '.join(field.column for field in model._meta.concrete_fields if not field.generated)
+
+
+def _foreign_key_sql(schema_editor, table: str, name: str, column: str, target) -> str:
+    return (
+        f'ALTER TABLE {table} ADD CONSTRAINT {schema_editor.quote_name(name)} '
+        f'FOREIGN KEY ({column}) REFERENCES {schema_editor.quote_name(target._meta.db_table)} (id) '
+        f'DEFERRABLE INITIALLY DEFERRED'
+    )
+
+
+def intern_forward(apps, schema_editor):
+    """
+    Текстовая set_total_data -> словари + set_total_data_rows:
+    1) прежняя таблица переименовывается, словари пополняются её значениями
+    2) создаётся секционированная set_total_data_rows: секция на каждый стенд + DEFAULT
+    3) строки переносятся с заменой полей-измерений на stand_id и table_id, прежняя таблица удаляется
+    4) на её месте создаётся представление set_total_data с INSTEAD OF-триггером
+    """
+    row_model = apps.get_model('app_dbm', 'TotalDataRow')
+    stand_model = apps.get_model('app_dbm', 'TotalDataStand')
+    table_model = apps.get_model('app_dbm', 'TotalDataTable')
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    quote = schema_editor.quote_name
+    text = _qualified(schema_editor, TEXT_TABLE)
+    rows = quote(row_model._meta.db_table)
+    columns = _data_columns(row_model)
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {_qualified(schema_editor, "set_total_data")} RENAME TO {quote(TEXT_TABLE)}')
+        for sql in INTERN_SQL:
+            cursor.execute(sql)
+
+        cursor.execute(
+            f'CREATE TABLE {rows} (\n{_columns_sql(row_model, schema_editor, ROW_DIGEST_COLUMNS)}\n) '
+            f'PARTITION BY LIST (stand_id)'
+        )
+        cursor.execute(f'ALTER TABLE {rows} ADD CONSTRAINT "set_total_data_rows_pkey" PRIMARY KEY (hash_address, stand_id)')
+        cursor.execute(_foreign_key_sql(schema_editor, rows, 'set_total_data_rows_author_id_fk', 'author_id', user_model))
+        cursor.execute(_foreign_key_sql(schema_editor, rows, 'set_total_data_rows_stand_id_fk', 'stand_id', stand_model))
+        cursor.execute(_foreign_key_sql(schema_editor, rows, 'set_total_data_rows_table_id_fk', 'table_id', table_model))
+        cursor.execute(f'CREATE INDEX "set_total_data_rows_author_id_idx" ON {rows} (author_id)')
+        cursor.execute(f'CREATE INDEX "total_data_rows_slice_idx" ON {rows} (stand_id, table_id)')
+        cursor.execute(f'CREATE TABLE {_qualified(schema_editor, DEFAULT_PARTITION)} PARTITION OF {rows} DEFAULT')
+
+        cursor.execute(f'SELECT id, name FROM {quote(stand_model._meta.db_table)}')
+        for stand_id, stand in cursor.fetchall():
+            partition = _qualified(schema_editor, _partition_name(stand))
+            cursor.execute(f'CREATE TABLE {partition} PARTITION OF {rows} FOR VALUES IN (%s)', [stand_id])
+
+        source_columns = ', '.join(
+            {'stand_id': 'ds.id', 'table_id': 'dt.id'}.get(column, f'src.{column}') for column in columns.split(', ')
+        )
+        cursor.execute(
+            f'''
+            INSERT INTO {rows} ({columns})
+            SELECT {source_columns}
+            FROM {text} AS src
+            {RESOLVE_SRC_SQL}
+            '''
+        )
+        cursor.execute(f'DROP TABLE {text} CASCADE')
+        for sql in COMPAT_VIEW_SQL:
+            cursor.execute(sql)
+        cursor.execute(f'ANALYZE {rows}')
+
+
+def intern_backward(apps, schema_editor):
+    """Представление и словари -> секционированная текстовая set_total_data (как после миграции 0009)."""
+    text_model = apps.get_model('app_dbm', 'TotalData')
+    row_model = apps.get_model('app_dbm', 'TotalDataRow')
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    quote = schema_editor.quote_name
+    view = _qualified(schema_editor, 'set_total_data')
+    text = _qualified(schema_editor, TEXT_TABLE)
+    rows = quote(row_model._meta.db_table)
+    columns = _data_columns(text_model)
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE {text} (\n{_columns_sql(text_model, schema_editor, TOTAL_DATA_FIELDS)}\n) '
+            f'PARTITION BY LIST (stand)'
+        )
+        cursor.execute(f"ALTER TABLE {text} ALTER COLUMN stand SET DEFAULT ''")
+        cursor.execute(f'CREATE TABLE {_qualified(schema_editor, partitioning_0007.DEFAULT_PARTITION)} PARTITION OF {text} DEFAULT')
+        cursor.execute(f'SELECT DISTINCT stand FROM {view}')
+        for (stand,) in cursor.fetchall():
+            partition = _qualified(schema_editor, partitioning_0007.partition_name(stand))
+            cursor.execute(f'CREATE TABLE {partition} PARTITION OF {text} FOR VALUES IN (%s)', [stand])
+        cursor.execute(f'INSERT INTO {text} ({columns}) SELECT {columns} FROM {view}')
+
+        for sql in DROP_COMPAT_VIEW_SQL:
+            cursor.execute(sql)
+        cursor.execute(f'DROP TABLE {rows} CASCADE')
+        cursor.execute(f'ALTER TABLE {text} RENAME TO "set_total_data"')
+        cursor.execute(f'ALTER TABLE {view} ADD CONSTRAINT "set_total_data_pkey" PRIMARY KEY (hash_address, stand)')
+        cursor.execute(_foreign_key_sql(schema_editor, view, 'set_total_data_author_id_fk', 'author_id', user_model))
+        cursor.execute(f'CREATE INDEX "set_total_data_author_id_idx" ON {view} (author_id)')
+        cursor.execute(f'ANALYZE {view}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_dbm', '0009_totaldataobservation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TotalDataCatalog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group_catalog', models.CharField(blank=True, max_length=255, null=True, verbose_name='группа базы данных')),
+                ('name', models.CharField(blank=True, max_length=255, null=True, verbose_name='имя базы данных')),
+            ],
+            options={
+                'verbose_name': '20 База TotalData.',
+                'verbose_name_plural': '20 Базы TotalData.',
+                'db_table': 'app_dbm"."set_total_data_catalog',
+            },
+        ),
+        migrations.CreateModel(
+            name='TotalDataStand',
+            fields=[
+                ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='стенд')),
+            ],
+            options={
+                'verbose_name': '19 Стенд TotalData.',
+                'verbose_name_plural': '19 Стенды TotalData.',
+                'db_table': 'app_dbm"."set_total_data_stand',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='totaldata',
+            options={'managed': False, 'verbose_name': '00 Полная информация о данных.', 'verbose_name_plural': '00 Полная информация о данных.'},
+        ),
+        migrations.CreateModel(
+            name='TotalDataSchema',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=255, null=True, verbose_name='схема таблицы')),
+                ('catalog', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='schemas', to='app_dbm.totaldatacatalog', verbose_name='база')),
+            ],
+            options={
+                'verbose_name': '21 Схема TotalData.',
+                'verbose_name_plural': '21 Схемы TotalData.',
+                'db_table': 'app_dbm"."set_total_data_schema',
+            },
+        ),
+        migrations.AddField(
+            model_name='totaldatacatalog',
+            name='stand',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='catalogs', to='app_dbm.totaldatastand', verbose_name='стенд'),
+        ),
+        migrations.CreateModel(
+            name='TotalDataTable',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table_type', models.CharField(blank=True, max_length=255, null=True, verbose_name='тип таблицы')),
+                ('name', models.CharField(blank=True, max_length=255, null=True, verbose_name='имя таблицы')),
+                ('schema', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='tables', to='app_dbm.totaldataschema', verbose_name='схема')),
+            ],
+            options={
+                'verbose_name': '22 Таблица TotalData.',
+                'verbose_name_plural': '22 Таблицы TotalData.',
+                'db_table': 'app_dbm"."set_total_data_table',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='totaldataschema',
+            constraint=models.UniqueConstraint(fields=('catalog', 'name'), name='total_data_schema_uniq', nulls_distinct=False),
+        ),
+        migrations.AddConstraint(
+            model_name='totaldatacatalog',
+            constraint=models.UniqueConstraint(fields=('stand', 'name', 'group_catalog'), name='total_data_catalog_uniq', nulls_distinct=False),
+        ),
+        migrations.AddConstraint(
+            model_name='totaldatatable',
+            constraint=models.UniqueConstraint(fields=('schema', 'name', 'table_type'), name='total_data_table_uniq', nulls_distinct=False),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='TotalDataRow',
+                    fields=[
+                        ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='дата создания')),
+                        ('updated_at', models.DateTimeField(auto_now=True, verbose_name='дата изменения')),
+                        ('is_active', models.BooleanField(default=True, verbose_name='запись активна')),
+                        ('hash_address', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='Хеш сумма')),
+                        ('table_comment', models.CharField(blank=True, max_length=255, null=True, verbose_name='комментарий таблицы')),
+                        ('column_number', models.CharField(blank=True, max_length=255, null=True, verbose_name='номер столбца')),
+                        ('column_name', models.CharField(blank=True, max_length=255, null=True, verbose_name='имя столбца')),
+                        ('column_comment', models.CharField(blank=True, max_length=255, null=True, verbose_name='комментарий столбца')),
+                        ('data_type', models.CharField(blank=True, max_length=255, null=True, verbose_name='тип данных')),
+                        ('is_nullable', models.CharField(blank=True, max_length=255, null=True, verbose_name='поле пустое')),
+                        ('is_auto', models.CharField(blank=True, max_length=255, null=True, verbose_name='автоматическое')),
+                        ('column_info', models.JSONField(blank=True, null=True, verbose_name='дополнительная информация о данных')),
+                        ('content_digest', models.GeneratedField(db_persist=True, expression=django.db.models.expressions.RawSQL('md5(COALESCE(("stand_id")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("table_id")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("table_comment")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("column_number")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("column_name")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("column_comment")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("data_type")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("is_nullable")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("is_auto")::text, E\'\\x1e\') || E\'\\x1f\' || COALESCE(("column_info")::text, E\'\\x1e\'))', ()), output_field=models.CharField(max_length=32), verbose_name='дайджест содержимого')),
+                        ('author', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='автор')),
+                        ('stand', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='rows', to='app_dbm.totaldatastand', verbose_name='стенд')),
+                        ('table', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='rows', to='app_dbm.totaldatatable', verbose_name='таблица')),
+                    ],
+                    options={
+                        'verbose_name': '23 Строка TotalData.',
+                        'verbose_name_plural': '23 Строки TotalData.',
+                        'db_table': 'app_dbm"."set_total_data_rows',
+                    },
+                ),
+                migrations.AddIndex(
+                    model_name='totaldatarow',
+                    index=models.Index(fields=['stand', 'table'], name='total_data_rows_slice_idx'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(intern_forward, intern_backward),
+            ],
+        ),
+    ]
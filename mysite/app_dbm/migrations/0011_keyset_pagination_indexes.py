@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_dbm', '0010_total_data_interning'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='linkdb',
+            index=models.Index(fields=['alias', 'id'], name='link_db_alias_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linktable',
+            index=models.Index(fields=['name', 'id'], name='link_tables_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:20
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Индексы строятся CONCURRENTLY: link_columns не блокируется на запись на время построения
+    atomic = False
+
+    dependencies = [
+        ('app_dbm', '0011_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='dimdb',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='dim_db_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='linkcolumn',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['columns'], name='link_columns_columns_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='linkschema',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['schema'], name='link_schemas_schema_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='linktable',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='link_tables_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='linktablename',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='link_tables_name_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:28
+
+from django.db import migrations, models
+
+# Представление зависит от столбцов link_columns, link_tables, link_schemas, dim_db, dim_table_type
+# и link_tables_name: миграции, меняющие их тип или удаляющие их, сначала удаляют catalog_flat
+# и создают заново после изменения — DROP_CATALOG_FLAT / CREATE_CATALOG_FLAT этой миграции
+# (importlib.import_module('app_dbm.migrations.0013_catalog_flat'), как 0010 берёт имена из 0007)
+# или новой копией SQL, если изменение затрагивает само представление.
+# Это единственная копия DDL catalog_flat: SQL не строится по моделям и не меняется вместе с ними
+CREATE_CATALOG_FLAT = [
+    '''
+    CREATE MATERIALIZED VIEW "app_dbm"."catalog_flat" AS
+    SELECT
+        c.id,
+        c.table_id,
+        t.schema_id,
+        s.base_id,
+        b.name AS base_name,
+        s.schema AS schema_name,
+        t.name AS table_name,
+        tt.name AS table_type,
+        n.name AS table_alt_name,
+        c.columns AS column_name,
+        c.type AS column_type,
+        c.is_null,
+        c.is_key,
+        c."default",
+        c.description,
+        CASE jsonb_typeof(c.description)
+            WHEN 'object' THEN (
+                SELECT string_agg(d.key || ': ' || d.value, '; ' ORDER BY d.key)
+                FROM jsonb_each_text(c.description) AS d
+            )
+            ELSE c.description #>> '{}'
+        END AS description_text,
+        concat_ws('.', b.name, s.schema, t.name, c.columns) AS full_path,
+        GREATEST(c.updated_at, t.updated_at, s.updated_at, b.updated_at) AS updated_at
+    FROM "app_dbm"."link_columns" AS c
+        JOIN "app_dbm"."link_tables" AS t ON t.id = c.table_id
+        JOIN "app_dbm"."link_schemas" AS s ON s.id = t.schema_id
+        JOIN "app_dbm"."dim_db" AS b ON b.id = s.base_id
+        JOIN "app_dbm"."dim_table_type" AS tt ON tt.id = t.type_id
+        LEFT JOIN LATERAL (
+            SELECT n.name
+            FROM "app_dbm"."link_tables_name" AS n
+            WHERE n.table_id = t.id AND n.is_publish AND n.is_active
+            ORDER BY n.id
+            LIMIT 1
+        ) AS n ON TRUE
+    WHERE c.is_active
+    WITH DATA
+    ''',
+    'CREATE UNIQUE INDEX "catalog_flat_id_uniq" ON "app_dbm"."catalog_flat" USING btree (id)',
+    'CREATE INDEX "catalog_flat_keyset_idx" ON "app_dbm"."catalog_flat" USING btree (table_name, table_id, column_name, id)',
+    'CREATE INDEX "catalog_flat_table_idx" ON "app_dbm"."catalog_flat" USING btree (table_id)',
+    'CREATE INDEX "catalog_flat_base_trgm_idx" ON "app_dbm"."catalog_flat" USING gin (base_name gin_trgm_ops)',
+    'CREATE INDEX "catalog_flat_schema_trgm_idx" ON "app_dbm"."catalog_flat" USING gin (schema_name gin_trgm_ops)',
+    'CREATE INDEX "catalog_flat_table_trgm_idx" ON "app_dbm"."catalog_flat" USING gin (table_name gin_trgm_ops)',
+    'CREATE INDEX "catalog_flat_column_trgm_idx" ON "app_dbm"."catalog_flat" USING gin (column_name gin_trgm_ops)',
+    'CREATE INDEX "catalog_flat_description_trgm_idx" ON "app_dbm"."catalog_flat" USING gin (description_text gin_trgm_ops)',
+    'CREATE INDEX "catalog_flat_path_trgm_idx" ON "app_dbm"."catalog_flat" USING gin (full_path gin_trgm_ops)',
+    'ANALYZE "app_dbm"."catalog_flat"',
+]
+
+DROP_CATALOG_FLAT = ['DROP MATERIALIZED VIEW IF EXISTS "app_dbm"."catalog_flat"']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_dbm', '0012_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogFlat',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='id столбца')),
+                ('base_name', models.CharField(max_length=255, verbose_name='имя базы данных')),
+                ('schema_name', models.CharField(max_length=255, verbose_name='схема')),
+                ('table_name', models.CharField(max_length=255, verbose_name='таблица')),
+                ('table_type', models.CharField(max_length=255, verbose_name='тип таблицы')),
+                ('table_alt_name', models.CharField(blank=True, max_length=255, null=True, verbose_name='основное имя таблицы')),
+                ('column_name', models.CharField(max_length=255, verbose_name='столбец')),
+                ('column_type', models.CharField(blank=True, max_length=255, null=True, verbose_name='тип данных')),
+                ('is_null', models.BooleanField(blank=True, null=True, verbose_name='допускает NULL')),
+                ('is_key', models.BooleanField(verbose_name='ключ')),
+                ('default', models.TextField(blank=True, null=True, verbose_name='значение по умолчанию')),
+                ('description', models.JSONField(blank=True, null=True, verbose_name='описание')),
+                ('description_text', models.TextField(blank=True, null=True, verbose_name='описание текстом')),
+                ('full_path', models.TextField(verbose_name='полный путь')),
+                ('updated_at', models.DateTimeField(verbose_name='дата изменения')),
+            ],
+            options={
+                'verbose_name': '24 Плоский каталог столбцов.',
+                'verbose_name_plural': '24 Плоский каталог столбцов.',
+                'db_table': 'app_dbm"."catalog_flat',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(CREATE_CATALOG_FLAT, DROP_CATALOG_FLAT),
+    ]
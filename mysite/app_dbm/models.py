@@ -1,10 +1,14 @@
 # app_dbm/models.py
 import datetime
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models, transaction
 from django.db.models import Q
+from django.db.models.expressions import RawSQL
 from django.utils import timezone
-from _common.models import BaseClass, hash_calculate
+from _common.models import BaseClass
 from .apps import db_schema
+from .utils.total_data_keys import HASH_FIELDS, ROW_DIGEST_COLUMNS, TOTAL_DATA_FIELDS, build_hash, digest_sql
 
 
 class TotalData(BaseClass):
@@ -12,7 +16,8 @@ class TotalData(BaseClass):
 
     hash_address = models.CharField(max_length=64, primary_key=True, verbose_name='Хеш сумма')
     # -----
-    stand = models.CharField(max_length=255, blank=True, null=True, verbose_name='стенд')
+    # Ключ секционирования set_total_data (utils.total_data_partitions), поэтому без NULL
+    stand = models.CharField(max_length=255, blank=True, default='', verbose_name='стенд')
     table_type = models.CharField(max_length=255, blank=True, null=True, verbose_name='тип таблицы')
     group_catalog = models.CharField(max_length=255, blank=True, null=True, verbose_name='группа базы данных')
     table_catalog = models.CharField(max_length=255, blank=True, null=True, verbose_name='имя базы данных')
@@ -26,8 +31,20 @@ class TotalData(BaseClass):
     is_nullable = models.CharField(max_length=255, blank=True, null=True, verbose_name='поле пустое')
     is_auto = models.CharField(max_length=255, blank=True, null=True, verbose_name='автоматическое')
     column_info = models.JSONField(blank=True, null=True, verbose_name='дополнительная информация о данных')
+    # Дайджест полей данных: upsert пропускает строки, у которых он не изменился.
+    # С миграции 0010 представление отдаёт здесь TotalDataRow.content_digest (над ссылками на словари)
+    content_digest = models.GeneratedField(
+        expression=RawSQL(digest_sql([f'"{field}"' for field in TOTAL_DATA_FIELDS]), ()),
+        output_field=models.CharField(max_length=32),
+        db_persist=True,
+        verbose_name='дайджест содержимого',
+    )
 
     class Meta:
+        # С миграции 0010 set_total_data — представление совместимости над set_total_data_rows (TotalDataRow)
+        # и словарями стендов, баз, схем и таблиц; запись через него выполняет INSTEAD OF-триггер.
+        # hash_address включает stand, поэтому для Django он по-прежнему уникален
+        managed = False
         db_table = f'{db_schema}"."set_total_data'  # Убедитесь, что db_schema определен
         verbose_name = '00 Полная информация о данных.'
         verbose_name_plural = '00 Полная информация о данных.'
@@ -54,18 +71,13 @@ class TotalData(BaseClass):
         # Вызываем родительский метод save
         super().save(*args, **kwargs)
 
+    def calculate_hash(self):
+        """Ключ записи по единым правилам utils.total_data_keys."""
+        return build_hash({field: getattr(self, field) for field in HASH_FIELDS})
+
     @classmethod
     def get_or_create_with_hash(cls, **kwargs):
-        # Формируем ключи хеширования по тем же полям
-        hash_fields = [
-            kwargs.get('stand'),
-            kwargs.get('table_catalog'),
-            kwargs.get('table_schema'),
-            kwargs.get('table_type'),
-            kwargs.get('table_name'),
-            kwargs.get('column_name'),
-        ]
-        hash_address = hash_calculate(hash_fields)
+        hash_address = build_hash(kwargs)
 
         # Используем update_or_create — он ищет по hash_address, обновляет по defaults
         obj, created = cls.objects.update_or_create(
@@ -114,6 +126,10 @@ class DimDB(BaseClass):
         verbose_name = '02 Словарь баз данных.'
         verbose_name_plural = '02 Словарь баз данных.'
         ordering = ['name']
+        indexes = [
+            # Подстрочный поиск name__ilike (pg_trgm)
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='dim_db_name_trgm_idx'),
+        ]
 
 
 # 03 Базы данных.
@@ -136,6 +152,10 @@ class LinkDB(BaseClass):
         unique_together = [['name', 'host', 'port', ]]
         verbose_name = '03 Базы данных.'
         verbose_name_plural = '03 Базы данных.'
+        indexes = [
+            # Постраничный вывод по ключу (alias, id) в списке баз
+            models.Index(fields=['alias', 'id'], name='link_db_alias_id_idx'),
+        ]
 
 
 # 04 Схема
@@ -154,6 +174,10 @@ class LinkSchema(BaseClass):
         unique_together = [['base', 'schema', ]]
         verbose_name = '04 Схема.'
         verbose_name_plural = '04 Схемы.'
+        indexes = [
+            # Подстрочный поиск schema__ilike (pg_trgm)
+            GinIndex(fields=['schema'], opclasses=['gin_trgm_ops'], name='link_schemas_schema_trgm_idx'),
+        ]
 
 
 # 05 Словарь тип таблицы.
@@ -226,6 +250,14 @@ class LinkTable(BaseClass):
         verbose_name = '09 Таблица.'
         verbose_name_plural = '09 Таблицы'
         ordering = ['schema']
+        indexes = [
+            # Проверка «в схеме не осталось активных таблиц» при синхронизации
+            models.Index(fields=['schema'], condition=Q(is_active=True), name='link_tables_active_schema_idx'),
+            # Постраничный вывод по ключу (name, id) в списках таблиц и столбцов
+            models.Index(fields=['name', 'id'], name='link_tables_name_id_idx'),
+            # Подстрочный поиск name__ilike (pg_trgm)
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='link_tables_name_trgm_idx'),
+        ]
 
 
 # 10 Альтернативное название таблицы.
@@ -270,9 +302,17 @@ class LinkTableName(BaseClass):
             )
         ]
         ordering = ['name']
+        indexes = [
+            # Поиск таблицы по альтернативному имени name__ilike (pg_trgm)
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='link_tables_name_name_trgm_idx'),
+        ]
 
 
 # 11 Столбец.
+# Поля LinkColumn, которые синхронизация переносит из TotalData (порядок важен для дайджеста)
+LINK_COLUMN_DIGEST_FIELDS = ('type', 'is_null', 'is_key', 'unique_together', 'default', 'description')
+
+
 class LinkColumn(BaseClass):
     """Связи таблиц типов данных и столбцов."""
 
@@ -290,6 +330,13 @@ class LinkColumn(BaseClass):
         verbose_name="Доп. информация о слое",
         help_text='{"1": "Sand","2": "DEV", "3": "TEST","4": "PreProd", "5": "Prod",}'
     )
+    # Дайджест полей LINK_COLUMN_DIGEST_FIELDS: синхронизация обновляет столбец, только если он изменился
+    content_digest = models.GeneratedField(
+        expression=RawSQL(digest_sql([f'"{field}"' for field in LINK_COLUMN_DIGEST_FIELDS]), ()),
+        output_field=models.CharField(max_length=32),
+        db_persist=True,
+        verbose_name='дайджест содержимого',
+    )
 
     def __str__(self):
         try:
@@ -303,6 +350,12 @@ class LinkColumn(BaseClass):
         verbose_name = '11 Столбец.'
         verbose_name_plural = '11 Столбцы.'
         ordering = ['columns']
+        indexes = [
+            # Проверка «в таблице не осталось активных столбцов» при синхронизации
+            models.Index(fields=['table'], condition=Q(is_active=True), name='link_columns_active_table_idx'),
+            # Подстрочный поиск columns__ilike (pg_trgm)
+            GinIndex(fields=['columns'], opclasses=['gin_trgm_ops'], name='link_columns_columns_trgm_idx'),
+        ]
 
 
 # 12 Справочник типов связей.
@@ -370,3 +423,373 @@ class LinkColumnName(BaseClass):
         verbose_name = '14 Связь столбцов и имен столбцов.'
         verbose_name_plural = '14 Связь столбцов и имен столбцов.'
         ordering = ['name']
+
+
+# 15 Задание пакетной загрузки.
+class IngestJob(BaseClass):
+    """Отложенная пакетная загрузка TotalData: очередь в БД, обработка фоновым обработчиком."""
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'в очереди'),
+        (STATUS_RUNNING, 'выполняется'),
+        (STATUS_DONE, 'выполнено'),
+        (STATUS_FAILED, 'ошибка'),
+    ]
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True,
+                              verbose_name='статус')
+    payload = models.JSONField(blank=True, null=True, verbose_name='строки к загрузке')
+    rows_total = models.IntegerField(default=0, verbose_name='всего строк')
+    rows_processed = models.IntegerField(default=0, verbose_name='обработано строк')
+    inserted = models.IntegerField(default=0, verbose_name='добавлено')
+    updated = models.IntegerField(default=0, verbose_name='обновлено')
+    unchanged = models.IntegerField(default=0, verbose_name='без изменений')
+    errors = models.JSONField(blank=True, null=True, verbose_name='ошибки')
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name='начало обработки')
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name='окончание обработки')
+
+    def __str__(self):
+        return f'Загрузка #{self.pk} ({self.get_status_display()})'
+
+    @property
+    def seconds(self):
+        """Длительность обработки в секундах."""
+        if not self.started_at:
+            return None
+        finished_at = self.finished_at or timezone.now()
+        return round((finished_at - self.started_at).total_seconds(), 3)
+
+    @property
+    def rows_per_second(self):
+        """Скорость обработки, строк в секунду."""
+        seconds = self.seconds
+        if not seconds:
+            return None
+        return round(self.rows_processed / seconds, 1)
+
+    class Meta:
+        db_table = f'{db_schema}"."ingest_job'
+        verbose_name = '15 Задание пакетной загрузки.'
+        verbose_name_plural = '15 Задания пакетной загрузки.'
+        ordering = ['-created_at']
+
+
+# 16 Запуск синхронизации.
+class SyncRun(BaseClass):
+    """История синхронизаций моделей со срезом TotalData одной базы одного стенда."""
+
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, 'выполняется'),
+        (STATUS_DONE, 'выполнено'),
+        (STATUS_FAILED, 'ошибка'),
+    ]
+
+    stage = models.CharField(max_length=255, db_index=True, verbose_name='стенд')
+    catalog = models.CharField(max_length=255, verbose_name='база данных')
+    link_db = models.ForeignKey(LinkDB, on_delete=models.SET_NULL, blank=True, null=True, verbose_name='база')
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_RUNNING, db_index=True,
+                              verbose_name='статус')
+    dry_run = models.BooleanField(default=False, verbose_name='без сохранения')
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name='начало')
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name='окончание')
+    rows_scanned = models.IntegerField(default=0, verbose_name='строк среза')
+    schemas_added = models.IntegerField(default=0, verbose_name='схем добавлено')
+    schemas_updated = models.IntegerField(default=0, verbose_name='схем обновлено')
+    schemas_reactivated = models.IntegerField(default=0, verbose_name='схем восстановлено')
+    schemas_deactivated = models.IntegerField(default=0, verbose_name='схем деактивировано')
+    tables_added = models.IntegerField(default=0, verbose_name='таблиц добавлено')
+    tables_updated = models.IntegerField(default=0, verbose_name='таблиц обновлено')
+    tables_reactivated = models.IntegerField(default=0, verbose_name='таблиц восстановлено')
+    tables_deactivated = models.IntegerField(default=0, verbose_name='таблиц деактивировано')
+    columns_added = models.IntegerField(default=0, verbose_name='столбцов добавлено')
+    columns_updated = models.IntegerField(default=0, verbose_name='столбцов обновлено')
+    columns_reactivated = models.IntegerField(default=0, verbose_name='столбцов восстановлено')
+    columns_deactivated = models.IntegerField(default=0, verbose_name='столбцов деактивировано')
+    columns_unchanged = models.IntegerField(default=0, verbose_name='столбцов без изменений')
+    timings = models.JSONField(blank=True, null=True, verbose_name='время шагов')
+    error = models.TextField(blank=True, null=True, verbose_name='ошибка')
+
+    def __str__(self):
+        return f'Синхронизация #{self.pk} {self.stage}/{self.catalog} ({self.get_status_display()})'
+
+    @property
+    def seconds(self):
+        """Длительность синхронизации в секундах."""
+        if not self.started_at:
+            return None
+        finished_at = self.finished_at or timezone.now()
+        return round((finished_at - self.started_at).total_seconds(), 3)
+
+    def changed_ids(self, object_type, actions=None):
+        """id изменённых в запуске объектов типа object_type (SyncChange.OBJECT_*), опционально по действиям."""
+        changes = self.changes.filter(object_type=object_type)
+        if actions:
+            changes = changes.filter(action__in=actions)
+        return changes.values_list('object_id', flat=True).distinct()
+
+    class Meta:
+        db_table = f'{db_schema}"."sync_run'
+        verbose_name = '16 Запуск синхронизации.'
+        verbose_name_plural = '16 Запуски синхронизации.'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['stage', 'catalog', '-created_at']),
+        ]
+
+
+# 17 Изменение синхронизации.
+class SyncChange(models.Model):
+    """
+    Набор изменений запуска: какие схемы, таблицы и столбцы изменились и как.
+    Строк много, поэтому без служебных полей BaseClass.
+    """
+
+    OBJECT_SCHEMA = 1
+    OBJECT_TABLE = 2
+    OBJECT_COLUMN = 3
+    OBJECT_CHOICES = [
+        (OBJECT_SCHEMA, 'схема'),
+        (OBJECT_TABLE, 'таблица'),
+        (OBJECT_COLUMN, 'столбец'),
+    ]
+
+    ACTION_ADDED = 1
+    ACTION_UPDATED = 2
+    ACTION_REACTIVATED = 3
+    ACTION_DEACTIVATED = 4
+    ACTION_CHOICES = [
+        (ACTION_ADDED, 'добавлен'),
+        (ACTION_UPDATED, 'обновлён'),
+        (ACTION_REACTIVATED, 'восстановлен'),
+        (ACTION_DEACTIVATED, 'деактивирован'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    run = models.ForeignKey(SyncRun, on_delete=models.CASCADE, related_name='changes', verbose_name='запуск')
+    object_type = models.SmallIntegerField(choices=OBJECT_CHOICES, verbose_name='тип объекта')
+    object_id = models.BigIntegerField(verbose_name='id объекта')
+    action = models.SmallIntegerField(choices=ACTION_CHOICES, verbose_name='изменение')
+
+    def __str__(self):
+        return f'{self.get_object_type_display()} #{self.object_id} {self.get_action_display()}'
+
+    class Meta:
+        db_table = f'{db_schema}"."sync_change'
+        verbose_name = '17 Изменение синхронизации.'
+        verbose_name_plural = '17 Изменения синхронизации.'
+        indexes = [
+            models.Index(fields=['run', 'object_type']),
+            models.Index(fields=['object_type', 'object_id']),
+        ]
+
+
+# 18 Наблюдение среза сборщиком.
+class TotalDataObservation(models.Model):
+    """
+    Факт того, что сборщик видел строки среза TotalData (стенд, база) в момент observed_at.
+    Полный снимок (complete) подтверждает все активные строки среза без списка ключей,
+    частичная загрузка хранит ключи строк — первые 8 байт hash_address (bigint).
+    Время последнего наблюдения строки выводится из этих записей (utils.total_data_observations),
+    поэтому неизменившиеся строки TotalData при повторной загрузке не перезаписываются.
+    """
+
+    SOURCE_BULK = 'bulk'
+    SOURCE_LOAD = 'load'
+    SOURCE_SNAPSHOT = 'snapshot'
+    SOURCE_MANIFEST = 'manifest'
+    SOURCE_DDL_DUMP = 'ddl_dump'
+    SOURCE_CHOICES = [
+        (SOURCE_BULK, 'пакетная загрузка'),
+        (SOURCE_LOAD, 'загрузка файла'),
+        (SOURCE_SNAPSHOT, 'замена снимком'),
+        (SOURCE_MANIFEST, 'манифест'),
+        (SOURCE_DDL_DUMP, 'DDL-дамп'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    stand = models.CharField(max_length=255, verbose_name='стенд')
+    table_catalog = models.CharField(max_length=255, blank=True, null=True, verbose_name='имя базы данных')
+    observed_at = models.DateTimeField(default=timezone.now, verbose_name='время наблюдения')
+    source = models.CharField(max_length=16, choices=SOURCE_CHOICES, verbose_name='источник')
+    complete = models.BooleanField(default=False, verbose_name='полный снимок среза')
+    rows_seen = models.IntegerField(default=0, verbose_name='строк')
+    keys = ArrayField(models.BigIntegerField(), blank=True, null=True, verbose_name='ключи строк')
+
+    def __str__(self):
+        return f'{self.stand}/{self.table_catalog} {self.observed_at:%Y-%m-%d %H:%M} ({self.get_source_display()})'
+
+    class Meta:
+        db_table = f'{db_schema}"."set_total_data_observation'
+        verbose_name = '18 Наблюдение среза.'
+        verbose_name_plural = '18 Наблюдения срезов.'
+        indexes = [
+            models.Index(fields=['stand', 'table_catalog', '-observed_at']),
+            GinIndex(fields=['keys'], name='total_data_obs_keys_gin'),
+        ]
+
+
+# 19 Стенд строк TotalData.
+class TotalDataStand(models.Model):
+    """Словарь стендов set_total_data_rows: строка хранит smallint вместо повторяющегося имени."""
+
+    id = models.SmallAutoField(primary_key=True)
+    name = models.CharField(max_length=255, unique=True, verbose_name='стенд')
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        db_table = f'{db_schema}"."set_total_data_stand'
+        verbose_name = '19 Стенд TotalData.'
+        verbose_name_plural = '19 Стенды TotalData.'
+
+
+# 20 База строк TotalData.
+class TotalDataCatalog(models.Model):
+    """Словарь баз (table_catalog вместе с group_catalog) в пределах стенда."""
+
+    stand = models.ForeignKey(TotalDataStand, on_delete=models.PROTECT, related_name='catalogs', verbose_name='стенд')
+    group_catalog = models.CharField(max_length=255, blank=True, null=True, verbose_name='группа базы данных')
+    name = models.CharField(max_length=255, blank=True, null=True, verbose_name='имя базы данных')
+
+    def __str__(self):
+        return f'{self.stand_id}/{self.name}'
+
+    class Meta:
+        db_table = f'{db_schema}"."set_total_data_catalog'
+        verbose_name = '20 База TotalData.'
+        verbose_name_plural = '20 Базы TotalData.'
+        constraints = [
+            # NULL и '' — разные значения, но одно значение — одна запись словаря
+            models.UniqueConstraint(
+                fields=['stand', 'name', 'group_catalog'],
+                name='total_data_catalog_uniq',
+                nulls_distinct=False,
+            ),
+        ]
+
+
+# 21 Схема строк TotalData.
+class TotalDataSchema(models.Model):
+    """Словарь схем (table_schema) в пределах базы."""
+
+    catalog = models.ForeignKey(TotalDataCatalog, on_delete=models.PROTECT, related_name='schemas', verbose_name='база')
+    name = models.CharField(max_length=255, blank=True, null=True, verbose_name='схема таблицы')
+
+    def __str__(self):
+        return f'{self.catalog_id}/{self.name}'
+
+    class Meta:
+        db_table = f'{db_schema}"."set_total_data_schema'
+        verbose_name = '21 Схема TotalData.'
+        verbose_name_plural = '21 Схемы TotalData.'
+        constraints = [
+            models.UniqueConstraint(fields=['catalog', 'name'], name='total_data_schema_uniq', nulls_distinct=False),
+        ]
+
+
+# 22 Таблица строк TotalData.
+class TotalDataTable(models.Model):
+    """Словарь таблиц (table_type + table_name) в пределах схемы."""
+
+    schema = models.ForeignKey(TotalDataSchema, on_delete=models.PROTECT, related_name='tables', verbose_name='схема')
+    table_type = models.CharField(max_length=255, blank=True, null=True, verbose_name='тип таблицы')
+    name = models.CharField(max_length=255, blank=True, null=True, verbose_name='имя таблицы')
+
+    def __str__(self):
+        return f'{self.schema_id}/{self.name}'
+
+    class Meta:
+        db_table = f'{db_schema}"."set_total_data_table'
+        verbose_name = '22 Таблица TotalData.'
+        verbose_name_plural = '22 Таблицы TotalData.'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['schema', 'name', 'table_type'],
+                name='total_data_table_uniq',
+                nulls_distinct=False,
+            ),
+        ]
+
+
+# 23 Строка TotalData.
+class TotalDataRow(BaseClass):
+    """
+    Хранение TotalData: поля-измерения заменены ссылками на словари TotalDataStand и TotalDataTable
+    (таблица -> схема -> база -> стенд). Читается и пишется через представление set_total_data (TotalData),
+    пакетные загрузчики пишут сюда напрямую (utils.total_data_bulk).
+    """
+
+    hash_address = models.CharField(max_length=64, primary_key=True, verbose_name='Хеш сумма')
+    # Ключ секционирования set_total_data_rows (utils.total_data_partitions)
+    stand = models.ForeignKey(TotalDataStand, on_delete=models.PROTECT, related_name='rows', verbose_name='стенд')
+    table = models.ForeignKey(TotalDataTable, on_delete=models.PROTECT, related_name='rows', verbose_name='таблица')
+    table_comment = models.CharField(max_length=255, blank=True, null=True, verbose_name='комментарий таблицы')
+    column_number = models.CharField(max_length=255, blank=True, null=True, verbose_name='номер столбца')
+    column_name = models.CharField(max_length=255, blank=True, null=True, verbose_name='имя столбца')
+    column_comment = models.CharField(max_length=255, blank=True, null=True, verbose_name='комментарий столбца')
+    data_type = models.CharField(max_length=255, blank=True, null=True, verbose_name='тип данных')
+    is_nullable = models.CharField(max_length=255, blank=True, null=True, verbose_name='поле пустое')
+    is_auto = models.CharField(max_length=255, blank=True, null=True, verbose_name='автоматическое')
+    column_info = models.JSONField(blank=True, null=True, verbose_name='дополнительная информация о данных')
+    # Дайджест ссылок на словари и полей строки: upsert пропускает строки, у которых он не изменился
+    content_digest = models.GeneratedField(
+        expression=RawSQL(digest_sql([f'"{column}"' for column in ROW_DIGEST_COLUMNS]), ()),
+        output_field=models.CharField(max_length=32),
+        db_persist=True,
+        verbose_name='дайджест содержимого',
+    )
+
+    class Meta:
+        # Таблица секционирована по stand_id (миграция 0010), первичный ключ в БД — (hash_address, stand_id)
+        db_table = f'{db_schema}"."set_total_data_rows'
+        verbose_name = '23 Строка TotalData.'
+        verbose_name_plural = '23 Строки TotalData.'
+        indexes = [
+            # Срез (стенд, база) для синхронизации и замены снимком
+            models.Index(fields=['stand', 'table'], name='total_data_rows_slice_idx'),
+        ]
+
+
+# 24 Плоский каталог столбцов.
+class CatalogFlat(models.Model):
+    """
+    Модель чтения: одна строка на активный столбец с путём, типом таблицы и опубликованным именем таблицы.
+    Материализованное представление catalog_flat (utils.catalog_flat), обновляется после синхронизации,
+    поэтому правки столбцов вне синхронизации видны в нём после следующего обновления.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name='id столбца')
+    table = models.ForeignKey(LinkTable, on_delete=models.DO_NOTHING, related_name='+', verbose_name='таблица')
+    schema = models.ForeignKey(LinkSchema, on_delete=models.DO_NOTHING, related_name='+', verbose_name='схема')
+    base = models.ForeignKey(DimDB, on_delete=models.DO_NOTHING, related_name='+', verbose_name='база данных')
+    base_name = models.CharField(max_length=255, verbose_name='имя базы данных')
+    schema_name = models.CharField(max_length=255, verbose_name='схема')
+    table_name = models.CharField(max_length=255, verbose_name='таблица')
+    table_type = models.CharField(max_length=255, verbose_name='тип таблицы')
+    table_alt_name = models.CharField(max_length=255, blank=True, null=True, verbose_name='основное имя таблицы')
+    column_name = models.CharField(max_length=255, verbose_name='столбец')
+    column_type = models.CharField(max_length=255, blank=True, null=True, verbose_name='тип данных')
+    is_null = models.BooleanField(blank=True, null=True, verbose_name='допускает NULL')
+    is_key = models.BooleanField(verbose_name='ключ')
+    default = models.TextField(blank=True, null=True, verbose_name='значение по умолчанию')
+    description = models.JSONField(blank=True, null=True, verbose_name='описание')
+    description_text = models.TextField(blank=True, null=True, verbose_name='описание текстом')
+    full_path = models.TextField(verbose_name='полный путь')
+    updated_at = models.DateTimeField(verbose_name='дата изменения')
+
+    def __str__(self):
+        return self.full_path
+
+    class Meta:
+        managed = False
+        db_table = f'{db_schema}"."catalog_flat'
+        verbose_name = '24 Плоский каталог столбцов.'
+        verbose_name_plural = '24 Плоский каталог столбцов.'
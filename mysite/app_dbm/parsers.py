@@ -0,0 +1,177 @@
+# app_dbm/parsers.py
+import codecs
+import io
+import json
+import zlib
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+try:
+    import zstandard
+except ImportError:  # zstd — необязательная зависимость
+    zstandard = None
+
+# Размер блока чтения сжатого тела запроса
+DECOMPRESS_CHUNK_SIZE = 64 * 1024
+
+
+class RequestBodyTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Распакованное тело запроса превышает допустимый размер.'
+    default_code = 'request_body_too_large'
+
+
+class UnsupportedContentEncoding(APIException):
+    status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    default_detail = 'Content-Encoding не поддерживается.'
+    default_code = 'unsupported_content_encoding'
+
+
+class _ZlibReader(io.RawIOBase):
+    """Потоковая распаковка gzip/deflate: за один вызов распаковывается не больше size байт."""
+
+    def __init__(self, stream, wbits):
+        self._stream = stream
+        self._decoder = zlib.decompressobj(wbits)
+        self._tail = b''
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def _read_block(self, max_length):
+        while True:
+            if self._tail:
+                data = self._decoder.decompress(self._tail, max_length)
+            elif self._eof:
+                return b''
+            else:
+                raw = self._stream.read(DECOMPRESS_CHUNK_SIZE)
+                if not raw:
+                    self._eof = True
+                    return self._decoder.flush()
+                data = self._decoder.decompress(raw, max_length)
+            self._tail = self._decoder.unconsumed_tail
+            if data:
+                return data
+
+    def read(self, size=-1):
+        chunks = []
+        received = 0
+        while size is None or size < 0 or received < size:
+            want = DECOMPRESS_CHUNK_SIZE if size is None or size < 0 else size - received
+            try:
+                data = self._read_block(want)
+            except zlib.error as exc:
+                raise ParseError(f'Повреждённое сжатое тело запроса: {exc}')
+            if not data:
+                break
+            chunks.append(data)
+            received += len(data)
+        return b''.join(chunks)
+
+
+class _LimitedReader(io.RawIOBase):
+    """
+    Обрывает чтение, если распакованных данных больше limit байт.
+    Вложенный поток читается блоками не длиннее остатка до лимита (+1 байт для обнаружения превышения),
+    поэтому read(-1) от json.load не распаковывает всё тело до проверки: в памяти не больше limit байт.
+    """
+
+    def __init__(self, stream, limit):
+        self._stream = stream
+        self._limit = limit
+        self._received = 0
+
+    def readable(self):
+        return True
+
+    def _read_block(self, size):
+        data = self._stream.read(min(size, self._limit - self._received + 1))
+        self._received += len(data)
+        if self._received > self._limit:
+            raise RequestBodyTooLarge()
+        return data
+
+    def read(self, size=-1):
+        if size is not None and size >= 0:
+            return self._read_block(size)
+        chunks = []
+        while True:
+            data = self._read_block(DECOMPRESS_CHUNK_SIZE)
+            if not data:
+                return b''.join(chunks)
+            chunks.append(data)
+
+
+def _open_decoder(stream, encoding):
+    if encoding in ('gzip', 'x-gzip'):
+        return _ZlibReader(stream, 16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        return _ZlibReader(stream, zlib.MAX_WBITS)
+    if encoding == 'zstd' and zstandard is not None:
+        return zstandard.ZstdDecompressor().stream_reader(stream, read_size=DECOMPRESS_CHUNK_SIZE)
+    raise UnsupportedContentEncoding(f'Content-Encoding не поддерживается: {encoding}')
+
+
+def decompress_stream(stream, content_encoding):
+    """
+    Оборачивает поток тела запроса распаковкой по заголовку Content-Encoding.
+    Кодировки применяются в обратном порядке, как того требует HTTP.
+    Объём распакованных данных ограничен настройкой DBM_MAX_DECOMPRESSED_BODY_SIZE.
+    """
+    encodings = [
+        encoding.strip().lower()
+        for encoding in (content_encoding or '').split(',')
+        if encoding.strip() and encoding.strip().lower() != 'identity'
+    ]
+    if not encodings:
+        return stream
+    for encoding in reversed(encodings):
+        stream = _open_decoder(stream, encoding)
+    return _LimitedReader(stream, settings.DBM_MAX_DECOMPRESSED_BODY_SIZE)
+
+
+class DecompressingParserMixin:
+    """Примесь к парсерам DRF: поддержка Content-Encoding gzip/deflate/zstd."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = (parser_context or {}).get('request')
+        if request is not None and stream is not None:
+            stream = decompress_stream(stream, request.META.get('HTTP_CONTENT_ENCODING'))
+        return super().parse(stream, media_type, parser_context)
+
+
+class NDJSONParser(BaseParser):
+    """
+    Парсер NDJSON (одна JSON-строка на объект).
+    Возвращает список объектов; пустые строки пропускаются.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        reader = codecs.getreader(encoding)(stream)
+
+        rows = []
+        for line_number, line in enumerate(reader, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as exc:
+                raise ParseError(f'NDJSON: ошибка в строке {line_number}: {exc}')
+        return rows
+
+
+class DecompressingJSONParser(DecompressingParserMixin, JSONParser):
+    """JSONParser с поддержкой сжатого тела запроса."""
+
+
+class DecompressingNDJSONParser(DecompressingParserMixin, NDJSONParser):
+    """NDJSONParser с поддержкой сжатого тела запроса."""
@@ -1,11 +1,12 @@
 import json
 
 from rest_framework import serializers
-from _common.models import hash_calculate
 from .models import (
     DimStage, DimDB, LinkDB, LinkSchema, DimTableType, DimColumnName,
-    LinkTable, LinkColumn, DimTypeLink, LinkColumnColumn, LinkColumnName, TotalData
+    LinkTable, LinkColumn, DimTypeLink, LinkColumnColumn, LinkColumnName, TotalData, IngestJob,
+    TotalDataObservation
 )
+from .utils.total_data_keys import HASH_FIELDS, build_hash
 
 
 class DimStageSerializer(serializers.ModelSerializer):
@@ -111,18 +112,17 @@ class TotalDataSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """
-        Проверяет наличие обязательных полей для расчёта хэша.
+        Проверяет наличие обязательных полей для расчёта хэша и типа данных.
+        data_type в хэш не входит, но без него запись столбца неполна.
         """
-        required_fields = [
-            'stand', 'table_catalog', 'table_schema',
-            'table_type', 'table_name', 'column_name', 'data_type'
-        ]
-
-        missing = [field for field in required_fields if not data.get(field)]
+        errors = {}
+        missing = [field for field in HASH_FIELDS if not data.get(field)]
         if missing:
-            raise serializers.ValidationError({
-                'error': f'Обязательны поля для хэша: {", ".join(missing)}'
-            })
+            errors['error'] = f'Обязательны поля для хэша: {", ".join(missing)}'
+        if not data.get('data_type'):
+            errors['data_type'] = 'Обязательно поле data_type'
+        if errors:
+            raise serializers.ValidationError(errors)
         return data
 
     def validate_column_number(self, value):
@@ -154,16 +154,7 @@ class TotalDataSerializer(serializers.ModelSerializer):
 
     def calculate_hash(self, validated_data):
         """Рассчитывает хэш на основе ключевых полей."""
-        fields = [
-            validated_data.get('stand', ''),
-            validated_data.get('table_catalog', ''),
-            validated_data.get('table_schema', ''),
-            validated_data.get('table_type', ''),
-            validated_data.get('table_name', ''),
-            validated_data.get('column_name', ''),
-            validated_data.get('data_type', '')
-        ]
-        return hash_calculate(fields)
+        return build_hash(validated_data)
 
     def create(self, validated_data):
         """Создаёт запись с уникальным hash_address."""
@@ -178,12 +169,7 @@ class TotalDataSerializer(serializers.ModelSerializer):
         """
         Обновляет запись, запрещая изменение ключевых полей (влияющих на хэш).
         """
-        key_fields = [
-            'stand', 'table_catalog', 'table_schema',
-            'table_type', 'table_name', 'column_name', 'data_type'
-        ]
-
-        for field in key_fields:
+        for field in HASH_FIELDS:
             if field in validated_data:
                 current_val = getattr(instance, field, '')
                 new_val = validated_data[field]
@@ -204,3 +190,48 @@ class TotalDataSerializer(serializers.ModelSerializer):
         Возвращает только hash_address в ответе API.
         """
         return {'hash_address': instance.hash_address}
+
+
+class TotalDataManifestSerializer(serializers.Serializer):
+    """
+    Манифест дельта-синхронизации: пары [hash_address, row_digest] среза стенд/каталог.
+    Пары проверяются одним проходом без полей DRF на каждый элемент.
+    """
+
+    stand = serializers.CharField()
+    table_catalog = serializers.CharField()
+    items = serializers.ListField()
+    deactivate_missing = serializers.BooleanField(required=False, default=False)
+
+    def validate_items(self, value):
+        for index, item in enumerate(value):
+            if (
+                    not isinstance(item, (list, tuple)) or len(item) != 2
+                    or not all(isinstance(part, str) and len(part) == 64 for part in item)
+            ):
+                raise serializers.ValidationError(
+                    f'Элемент {index}: ожидается пара [hash_address, row_digest] из 64-символьных строк'
+                )
+        return value
+
+
+class IngestJobSerializer(serializers.ModelSerializer):
+    """Состояние задания пакетной загрузки (без самих строк)."""
+
+    seconds = serializers.FloatField(read_only=True)
+    rows_per_second = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = IngestJob
+        fields = [
+            'id', 'status', 'rows_total', 'rows_processed', 'inserted', 'updated', 'unchanged',
+            'errors', 'created_at', 'started_at', 'finished_at', 'seconds', 'rows_per_second',
+        ]
+
+
+class TotalDataObservationSerializer(serializers.ModelSerializer):
+    """Наблюдение среза TotalData (без массива ключей)."""
+
+    class Meta:
+        model = TotalDataObservation
+        fields = ['id', 'observed_at', 'source', 'complete', 'rows_seen']
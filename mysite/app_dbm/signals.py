@@ -0,0 +1,9 @@
+# app_dbm/signals.py
+"""
+Сигналы изменений каталога, выполненных SQL-запросами в обход моделей (post_delete при этом не отправляется).
+"""
+from django.dispatch import Signal
+
+# Очистка каталога (utils.catalog_purge) удалила объекты: sender — модель, ids — первичные ключи.
+# Отправляется после фиксации транзакции порции
+catalog_purged = Signal()
@@ -1,3 +1,154 @@
-from django.test import TestCase
+# app_dbm/tests.py
+import threading
+import time
+from collections import defaultdict
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+
+from .models import DimDB, DimStage, LinkDB, TotalData
+from .utils.harvester import HarvestOptions, HarvestResult, harvest_many
+
+HARVEST_SCHEMA = 'harvest_test'
+
+
+class HarvesterTests(TransactionTestCase):
+    """
+    Сбор метаданных с локального PostgreSQL: целевой базой служит сама тестовая база.
+    TransactionTestCase — рабочие потоки сборщика пишут в TotalData через свои соединения.
+    """
+
+    def setUp(self):
+        settings_dict = connection.settings_dict
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {HARVEST_SCHEMA} CASCADE')
+            cursor.execute(f'CREATE SCHEMA {HARVEST_SCHEMA}')
+            cursor.execute(f'''
+                CREATE TABLE {HARVEST_SCHEMA}.item (
+                    id serial PRIMARY KEY,
+                    name varchar(100) NOT NULL,
+                    note text
+                )
+            ''')
+            cursor.execute(f"COMMENT ON TABLE {HARVEST_SCHEMA}.item IS 'Позиции'")
+            cursor.execute(f"COMMENT ON COLUMN {HARVEST_SCHEMA}.item.name IS 'Наименование'")
+        self.stage = DimStage.objects.create(name='TST_HARVEST')
+        self.base = DimDB.objects.create(name='harvest_base', version='1')
+        self.link_db = LinkDB.objects.create(
+            base=self.base,
+            stage=self.stage,
+            version='1',
+            name=settings_dict['NAME'],
+            alias='harvest_alias',
+            host=settings_dict['HOST'] or 'localhost',
+            port=settings_dict['PORT'] or '5432',
+        )
+        self.options = HarvestOptions(
+            user=settings_dict['USER'],
+            password=settings_dict['PASSWORD'],
+            batch_size=500,
+            workers=2,
+            per_host=1,
+        )
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {HARVEST_SCHEMA} CASCADE')
+
+    def _harvested(self):
+        return {
+            row.column_name: row
+            for row in TotalData.objects.filter(stand='TST_HARVEST', table_schema=HARVEST_SCHEMA)
+        }
+
+    def test_harvest_writes_total_data(self):
+        [result] = harvest_many([self.link_db], self.options)
+
+        self.assertIsNone(result.error)
+        self.assertGreater(result.rows, 0)
+        self.assertEqual(result.rows, result.inserted + result.updated + result.unchanged)
+        rows = self._harvested()
+        self.assertEqual(set(rows), {'id', 'name', 'note'})
+        self.assertEqual(rows['id'].table_catalog, 'harvest_alias')
+        self.assertEqual(rows['id'].group_catalog, 'harvest_base')
+        self.assertEqual(rows['id'].table_type, 'BASE TABLE')
+        self.assertEqual(rows['id'].table_comment, 'Позиции')
+        self.assertEqual(rows['id'].is_auto, 'YES')
+        self.assertTrue(rows['id'].column_info['is_key'])
+        self.assertEqual(rows['name'].data_type, 'varchar(100)')
+        self.assertEqual(rows['name'].is_nullable, 'NO')
+        self.assertEqual(rows['name'].column_comment, 'Наименование')
+        self.assertEqual(rows['note'].is_nullable, 'YES')
+        self.assertEqual(rows['note'].is_auto, 'NO')
+
+    def test_repeat_harvest_is_noop(self):
+        """Повторный сбор неизменной базы не меняет ни ключи, ни дайджесты, ни updated_at."""
+        harvest_many([self.link_db], self.options)
+        before = {
+            row.hash_address: (row.content_digest, row.updated_at)
+            for row in self._harvested().values()
+        }
+
+        [result] = harvest_many([self.link_db], self.options)
+
+        self.assertIsNone(result.error)
+        after = {
+            row.hash_address: (row.content_digest, row.updated_at)
+            for row in self._harvested().values()
+        }
+        self.assertEqual(before, after)
+        self.assertTrue(all('date_create' not in row.column_info for row in self._harvested().values()))
+
+    def test_failed_target_is_reported(self):
+        """Ошибка подключения к одной базе попадает в её отчёт и не мешает остальным."""
+        broken = LinkDB.objects.create(
+            base=self.base,
+            stage=self.stage,
+            version='1',
+            name='harvest_missing_database',
+            alias='harvest_missing',
+            host=self.link_db.host,
+            port=self.link_db.port,
+        )
+
+        results = {item.alias: item for item in harvest_many([broken, self.link_db], self.options)}
+
+        self.assertEqual(results['harvest_missing'].rows, 0)
+        self.assertIn('harvest_missing_database', results['harvest_missing'].error)
+        self.assertIsNone(results['harvest_alias'].error)
+        self.assertGreater(results['harvest_alias'].rows, 0)
+        self.assertEqual(set(self._harvested()), {'id', 'name', 'note'})
+
+
+class HarvestHostLimitTests(SimpleTestCase):
+    """Ограничение одновременных подключений к одному хосту."""
+
+    def test_per_host_limit(self):
+        link_dbs = [
+            LinkDB(pk=index, alias=f'db{index}', host=host, port='5432', name=f'db{index}')
+            for index, host in enumerate(['host_a'] * 4 + ['host_b'] * 4)
+        ]
+        lock = threading.Lock()
+        running = defaultdict(int)
+        peak = defaultdict(int)
+        peak_total = 0
+
+        def fake_target(link_db, sql, options):
+            nonlocal peak_total
+            with lock:
+                running[link_db.host] += 1
+                peak[link_db.host] = max(peak[link_db.host], running[link_db.host])
+                peak_total = max(peak_total, sum(running.values()))
+            time.sleep(0.05)
+            with lock:
+                running[link_db.host] -= 1
+            return HarvestResult(link_db_id=link_db.pk, alias=link_db.alias, host=link_db.host, rows=1)
+
+        with mock.patch('app_dbm.utils.harvester.harvest_target', side_effect=fake_target):
+            results = harvest_many(link_dbs, HarvestOptions(workers=6, per_host=2))
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual(dict(peak), {'host_a': 2, 'host_b': 2})
+        # Пул не простаивает в очереди к одному хосту: оба хоста обслуживаются одновременно
+        self.assertGreater(peak_total, 2)
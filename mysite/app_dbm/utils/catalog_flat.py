@@ -0,0 +1,61 @@
+# utils/catalog_flat.py
+"""
+Плоская модель чтения каталога — материализованное представление catalog_flat (модель CatalogFlat):
+1) одна строка на активный столбец с полным путём база.схема.таблица.столбец, типом, флагами,
+   JSON-описанием и его текстом, типом таблицы и опубликованным альтернативным именем таблицы
+2) списки и автокомплиты столбцов читают его без соединения LinkColumn → LinkTable → LinkSchema → DimDB
+3) после синхронизации представление обновляется REFRESH ... CONCURRENTLY: читатели не блокируются,
+   в индексы пишутся только изменившиеся строки
+4) одновременные обновления схлопываются: выполняется одно, ждёт не больше одного —
+   ожидающее начнётся после завершения текущего и увидит все зафиксированные к этому моменту изменения
+5) представление обновляется и после очистки каталога, удалившей столбцы (utils.catalog_purge)
+DDL представления и его индексов — единственная копия в миграции 0013_catalog_flat.
+"""
+import logging
+import time
+
+from django.db import connection
+
+from ..models import CatalogFlat
+
+logger = logging.getLogger(__name__)
+
+# Первый ключ advisory-блокировок обновления: (CATALOG_FLAT_LOCK_CLASS, 0) — обновление, (…, 1) — очередь
+CATALOG_FLAT_LOCK_CLASS = 7330
+_LOCK_RUNNING = 0
+_LOCK_WAITING = 1
+
+
+def _table(model) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def refresh_catalog_flat(concurrently: bool = True) -> float:
+    """
+    Обновляет catalog_flat. Вызывается вне транзакции (после фиксации изменений каталога).
+    Если другое обновление уже ждёт своей очереди, возвращается сразу — ожидающее учтёт и эти изменения.
+    Args:
+        concurrently: REFRESH ... CONCURRENTLY (без блокировки читателей)
+    Returns:
+        float: длительность обновления в секундах; 0.0 — обновление поручено ожидающему процессу
+    """
+    started = time.monotonic()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(%s, %s)', [CATALOG_FLAT_LOCK_CLASS, _LOCK_WAITING])
+        if not cursor.fetchone()[0]:
+            logger.info('catalog_flat: обновление уже ожидает очереди, пропуск')
+            return 0.0
+        try:
+            cursor.execute('SELECT pg_advisory_lock(%s, %s)', [CATALOG_FLAT_LOCK_CLASS, _LOCK_RUNNING])
+        finally:
+            cursor.execute('SELECT pg_advisory_unlock(%s, %s)', [CATALOG_FLAT_LOCK_CLASS, _LOCK_WAITING])
+        try:
+            cursor.execute(
+                f'REFRESH MATERIALIZED VIEW {"CONCURRENTLY " if concurrently else ""}{_table(CatalogFlat)}'
+            )
+        finally:
+            cursor.execute('SELECT pg_advisory_unlock(%s, %s)', [CATALOG_FLAT_LOCK_CLASS, _LOCK_RUNNING])
+
+    seconds = round(time.monotonic() - started, 3)
+    logger.info('catalog_flat обновлено за %s с', seconds)
+    return seconds
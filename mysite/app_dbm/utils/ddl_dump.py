@@ -0,0 +1,612 @@
+# utils/ddl_dump.py
+"""
+Загрузка метаданных из файла pg_dump --schema-only (для стендов без сетевого доступа):
+1) файл читается потоково и делится на операторы с учётом строк, комментариев и $-кавычек
+2) CREATE TABLE, COMMENT ON и ALTER TABLE (PRIMARY KEY, DEFAULT, IDENTITY) разбираются
+   лексером sqlparse в пуле процессов, порциями операторов
+3) результаты сводятся в строки TotalData и пишутся пакетной загрузкой upsert_total_data
+Значения data_type приводятся к виду, который отдаёт запрос сбора (int4, varchar(100), ARRAY, ...).
+"""
+import gzip
+import json
+import logging
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import connections
+from sqlparse import lexer, tokens as T
+
+from ..models import TotalDataObservation
+from .total_data_bulk import upsert_total_data
+from .total_data_keys import build_hashes
+
+logger = logging.getLogger(__name__)
+
+# Операторов в одной порции, передаваемой процессу пула
+DDL_CHUNK_SIZE = 2000
+
+# Лексемы, меняющие состояние разбора: комментарии, кавычки, $-кавычки и конец оператора
+_SPLIT_RE = re.compile(r"--[^\n]*|/\*|'|\"|\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$|;")
+
+# Операторы, из которых берутся метаданные; остальное (функции, индексы, права) пропускается сразу
+_RELEVANT_RE = re.compile(
+    r'^(CREATE\s+(UNLOGGED\s+|FOREIGN\s+)?TABLE|COMMENT\s+ON\s+(TABLE|FOREIGN\s+TABLE|COLUMN|SCHEMA)'
+    r'|ALTER\s+(FOREIGN\s+)?TABLE)\b',
+    re.IGNORECASE,
+)
+# Строки, имена в кавычках, скобки и запятые — для деления тела CREATE TABLE на элементы
+_BODY_RE = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|[(),]")
+_ALTER_MARKERS_RE = re.compile(r'PRIMARY\s+KEY|SET\s+DEFAULT|AS\s+IDENTITY', re.IGNORECASE)
+
+# Ключевые слова, с которых начинаются ограничения столбца (конец типа данных)
+_COLUMN_CONSTRAINTS = {
+    'NOT', 'NULL', 'DEFAULT', 'CONSTRAINT', 'PRIMARY', 'UNIQUE', 'CHECK',
+    'REFERENCES', 'GENERATED', 'COLLATE', 'OPTIONS',
+}
+# Элементы CREATE TABLE, которые не являются столбцами
+_TABLE_CONSTRAINTS = {'CONSTRAINT', 'PRIMARY', 'UNIQUE', 'CHECK', 'FOREIGN', 'EXCLUDE', 'LIKE'}
+
+# Имена типов pg_dump -> pg_type.typname
+_TYPE_NAMES = {
+    'character varying': 'varchar',
+    'character': 'bpchar',
+    'char': 'bpchar',
+    'integer': 'int4',
+    'int': 'int4',
+    'smallint': 'int2',
+    'bigint': 'int8',
+    'boolean': 'bool',
+    'real': 'float4',
+    'double precision': 'float8',
+    'decimal': 'numeric',
+    'timestamp without time zone': 'timestamp',
+    'timestamp with time zone': 'timestamptz',
+    'time without time zone': 'time',
+    'time with time zone': 'timetz',
+    'bit varying': 'varbit',
+}
+
+# Без пробела перед / после этих лексем при восстановлении текста типа и выражения
+_NO_SPACE_BEFORE = {'(', ')', ',', '.', '[', ']', '::'}
+_NO_SPACE_AFTER = {'(', '.', '[', '::'}
+
+
+def iter_statements(lines: Iterable[str]) -> Iterator[str]:
+    """Делит текст дампа на операторы. Комментарии '--' отбрасываются."""
+    buffer = []
+    state = None  # None | "'" | '"' | '*/' | '$tag$'
+    for line in lines:
+        position = start = 0
+        length = len(line)
+        while position < length:
+            if state is None:
+                match = _SPLIT_RE.search(line, position)
+                if match is None:
+                    break
+                token = match.group()
+                position = match.end()
+                if token == ';':
+                    buffer.append(line[start:position])
+                    statement = ''.join(buffer).strip()
+                    if statement:
+                        yield statement
+                    buffer = []
+                    start = position
+                elif token.startswith('--'):
+                    buffer.append(line[start:match.start()])
+                    start = position
+                elif token == '/*':
+                    state = '*/'
+                else:
+                    state = token
+            else:
+                # Удвоенная кавычка '' закрывает и сразу открывает строку — результат тот же
+                index = line.find(state, position)
+                if index < 0:
+                    break
+                position = index + len(state)
+                state = None
+        buffer.append(line[start:])
+    statement = ''.join(buffer).strip()
+    if statement:
+        yield statement
+
+
+def is_relevant(statement: str) -> bool:
+    """Быстрый отбор операторов до разбора."""
+    if not _RELEVANT_RE.match(statement):
+        return False
+    if statement[:5].upper() == 'ALTER':
+        return bool(_ALTER_MARKERS_RE.search(statement))
+    return True
+
+
+def _lex(statement: str) -> List[Tuple]:
+    return [
+        (ttype, value)
+        for ttype, value in lexer.tokenize(statement)
+        if ttype not in T.Whitespace and ttype not in T.Newline and ttype not in T.Comment
+    ]
+
+
+def _word(token) -> str:
+    """Первое слово ключевого слова в верхнем регистре ('NOT NULL' -> 'NOT'), иначе ''."""
+    ttype, value = token
+    if ttype in T.Keyword:
+        return value.split()[0].upper()
+    return ''
+
+
+def _is_punct(token, value) -> bool:
+    return token[0] in T.Punctuation and token[1] == value
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('""', '"')
+    return value
+
+
+def _literal(value: str) -> Optional[str]:
+    """Строковая константа SQL -> str. NULL -> None."""
+    if value.upper() == 'NULL':
+        return None
+    if value[:1] in 'eE' and value[1:2] == "'":
+        return value[2:-1].replace("''", "'").encode('utf-8').decode('unicode_escape', 'ignore')
+    return value[1:-1].replace("''", "'")
+
+
+def _read_name(tokens, index) -> Tuple[List[str], int]:
+    """Читает (возможно, составное) имя a.b.c начиная с позиции index."""
+    parts = []
+    while index < len(tokens):
+        parts.append(_unquote(tokens[index][1]))
+        index += 1
+        if index < len(tokens) and _is_punct(tokens[index], '.'):
+            index += 1
+            continue
+        break
+    return parts, index
+
+
+def _relation(parts: List[str]) -> Tuple[str, str]:
+    return (parts[-2] if len(parts) > 1 else 'public'), parts[-1]
+
+
+def _join(tokens) -> str:
+    """Восстанавливает текст из лексем с нормализованными пробелами."""
+    text = []
+    previous = None
+    for _, value in tokens:
+        if text and value not in _NO_SPACE_BEFORE and previous not in _NO_SPACE_AFTER:
+            text.append(' ')
+        text.append(value)
+        previous = value
+    return ''.join(text)
+
+
+def _split_elements(tokens, index) -> Tuple[List[List[Tuple]], int]:
+    """Делит содержимое скобок, начинающихся на позиции index, по запятым верхнего уровня."""
+    elements = [[]]
+    depth = 0
+    while index < len(tokens):
+        token = tokens[index]
+        index += 1
+        if _is_punct(token, '('):
+            depth += 1
+            if depth == 1:
+                continue
+        elif _is_punct(token, ')'):
+            depth -= 1
+            if depth == 0:
+                break
+        elif depth == 1 and _is_punct(token, ','):
+            elements.append([])
+            continue
+        elements[-1].append(token)
+    return [element for element in elements if element], index
+
+
+def _column_names(tokens) -> List[str]:
+    """Имена столбцов из первых скобок в списке лексем, например PRIMARY KEY (a, b)."""
+    for index, token in enumerate(tokens):
+        if _is_punct(token, '('):
+            elements, _ = _split_elements(tokens, index)
+            return [_unquote(element[0][1]) for element in elements]
+    return []
+
+
+def normalize_type(text: str) -> str:
+    """Тип из DDL -> значение data_type запроса сбора."""
+    text = text.strip()
+    if text.endswith(']') or re.search(r'\bARRAY\b', text, re.IGNORECASE):
+        return 'ARRAY'
+    typmod = re.search(r'\(([^)]*)\)', text)
+    base = re.sub(r'\s*\([^)]*\)', '', text).strip()
+    # Имя типа может быть с указанием схемы: public.my_enum -> my_enum
+    base = _unquote(re.split(r'\.(?=(?:[^"]*"[^"]*")*[^"]*$)', base)[-1])
+    base = ' '.join(base.split())
+    lowered = base.lower()
+    if lowered.startswith('interval'):
+        return 'interval'
+    name = _TYPE_NAMES.get(lowered, base if base != lowered else lowered)
+    if name == 'varchar' and typmod:
+        return f'varchar({typmod.group(1).strip()})'
+    return name
+
+
+def _parse_column(element) -> Dict:
+    name = _unquote(element[0][1])
+    index = 1
+    while index < len(element) and _word(element[index]) not in _COLUMN_CONSTRAINTS:
+        index += 1
+    column = {
+        'name': name,
+        'type': normalize_type(_join(element[1:index])),
+        'not_null': False,
+        'default': None,
+        'identity': False,
+        'primary_key': False,
+    }
+    rest = element[index:]
+    position = 0
+    while position < len(rest):
+        word = _word(rest[position])
+        value = rest[position][1].upper()
+        if value == 'NOT NULL' or (word == 'NOT' and position + 1 < len(rest) and _word(rest[position + 1]) == 'NULL'):
+            column['not_null'] = True
+        elif word == 'PRIMARY':
+            column['primary_key'] = True
+            column['not_null'] = True
+        elif word == 'DEFAULT':
+            end = position + 1
+            depth = 0
+            while end < len(rest):
+                if _is_punct(rest[end], '('):
+                    depth += 1
+                elif _is_punct(rest[end], ')'):
+                    depth -= 1
+                elif depth == 0 and _word(rest[end]) in _COLUMN_CONSTRAINTS:
+                    break
+                end += 1
+            column['default'] = _join(rest[position + 1:end]) or None
+            position = end
+            continue
+        elif word == 'GENERATED':
+            column['identity'] = any(_word(token) == 'IDENTITY' for token in rest[position:])
+        position += 1
+    return column
+
+
+def _split_table_body(statement: str) -> Tuple[str, List[str]]:
+    """CREATE TABLE: заголовок до первой скобки и тексты элементов списка столбцов."""
+    header = None
+    start = 0
+    depth = 0
+    elements = []
+    for match in _BODY_RE.finditer(statement):
+        token = match.group()
+        if token == '(':
+            depth += 1
+            if depth == 1 and header is None:
+                header = statement[:match.start()]
+                start = match.end()
+        elif token == ')':
+            depth -= 1
+            if depth == 0 and header is not None:
+                elements.append(statement[start:match.start()])
+                break
+        elif token == ',' and depth == 1 and header is not None:
+            elements.append(statement[start:match.start()])
+            start = match.end()
+    if header is None:
+        return statement, []
+    return header, [element.strip() for element in elements if element.strip()]
+
+
+@lru_cache(maxsize=100000)
+def _parse_element(text: str) -> Tuple[Optional[Dict], List[str]]:
+    """
+    Элемент CREATE TABLE -> (столбец или None, столбцы первичного ключа).
+    Одинаковые определения столбцов в дампе повторяются часто, поэтому результат кэшируется.
+    """
+    element = _lex(text)
+    word = _word(element[0])
+    # EXCLUDE — не зарезервированное слово и может быть именем столбца
+    if word in _TABLE_CONSTRAINTS and (word != 'EXCLUDE' or _word(element[1]) == 'USING'):
+        if any(_word(token) == 'PRIMARY' for token in element):
+            return None, _column_names(element)
+        return None, []
+    return _parse_column(element), []
+
+
+def _parse_create_table(statement: str) -> Optional[Tuple]:
+    # Лексером разбираются заголовок и каждый элемент по отдельности, а не весь оператор целиком
+    header, bodies = _split_table_body(statement)
+    tokens = _lex(header)
+    table_type = 'FOREIGN' if any(_word(token) == 'FOREIGN' for token in tokens[:3]) else 'BASE TABLE'
+    index = next(i for i, token in enumerate(tokens) if _word(token) == 'TABLE') + 1
+    if _word(tokens[index]) == 'IF':  # IF NOT EXISTS
+        index += 3 if _word(tokens[index + 1]) == 'NOT' else 2
+    parts, index = _read_name(tokens, index)
+    schema, table = _relation(parts)
+
+    if index < len(tokens) and _word(tokens[index]) == 'PARTITION':
+        # CREATE TABLE child PARTITION OF parent ... — столбцы берутся у родителя
+        parent, _ = _read_name(tokens, index + 2)
+        return ('table', schema, table, table_type, None, _relation(parent))
+    if not bodies:
+        return None
+
+    columns = []
+    primary_key = []
+    for body in bodies:
+        column, key = _parse_element(body)
+        if column is not None:
+            columns.append(dict(column))
+        elif key:
+            primary_key = key
+    for column in columns:
+        if column['name'] in primary_key:
+            column['primary_key'] = True
+            column['not_null'] = True
+    return ('table', schema, table, table_type, columns, None)
+
+
+def _parse_comment(tokens) -> Optional[Tuple]:
+    index = 2
+    kind = _word(tokens[index])
+    if kind == 'FOREIGN':
+        index += 1
+        kind = 'TABLE'
+    elif kind not in ('TABLE', 'COLUMN', 'SCHEMA'):
+        # sqlparse может не считать SCHEMA ключевым словом
+        kind = tokens[index][1].upper()
+    parts, index = _read_name(tokens, index + 1)
+    while index < len(tokens) and _word(tokens[index]) != 'IS':
+        index += 1
+    if index + 1 >= len(tokens):
+        return None
+    text = _literal(tokens[index + 1][1])
+    if kind == 'SCHEMA':
+        return ('schema_comment', parts[-1], text)
+    if kind == 'COLUMN':
+        return ('column_comment', *_relation(parts[:-1]), parts[-1], text)
+    if kind == 'TABLE':
+        return ('table_comment', *_relation(parts), text)
+    return None
+
+
+def _parse_alter_table(tokens) -> List[Tuple]:
+    index = next(i for i, token in enumerate(tokens) if _word(token) == 'TABLE') + 1
+    while _word(tokens[index]) in ('ONLY', 'IF', 'EXISTS'):
+        index += 1
+    parts, index = _read_name(tokens, index)
+    schema, table = _relation(parts)
+    rest = tokens[index:]
+    words = [_word(token) for token in rest]
+    facts = []
+    if 'PRIMARY' in words:
+        facts.append(('primary_key', schema, table, _column_names(rest[words.index('PRIMARY'):])))
+    elif 'ALTER' in words:
+        position = words.index('ALTER') + 1
+        if words[position] == 'COLUMN':
+            position += 1
+        column = _unquote(rest[position][1])
+        if 'IDENTITY' in words:
+            facts.append(('identity', schema, table, column))
+        elif 'SET' in words and words[words.index('SET') + 1] == 'DEFAULT':
+            start = words.index('SET') + 2
+            facts.append(('default', schema, table, column, _join(rest[start:])))
+    return facts
+
+
+def parse_statement(statement: str) -> List[Tuple]:
+    """Разбирает один оператор в список фактов (кортежи вида ('table', ...), ('default', ...))."""
+    statement = statement.rstrip().rstrip(';')
+    if statement[:6].upper() == 'CREATE':
+        fact = _parse_create_table(statement)
+        return [fact] if fact else []
+    tokens = _lex(statement)
+    if not tokens:
+        return []
+    head = _word(tokens[0])
+    if head == 'COMMENT':
+        fact = _parse_comment(tokens)
+        return [fact] if fact else []
+    if head == 'ALTER':
+        return _parse_alter_table(tokens)
+    return []
+
+
+def _parse_chunk(statements: List[str]) -> List[Tuple]:
+    """Задача процесса пула: разбор порции операторов. Ошибки не прерывают разбор остальных."""
+    facts = []
+    for statement in statements:
+        try:
+            facts.extend(parse_statement(statement))
+        except Exception as exc:
+            facts.append(('error', statement[:200], f'{type(exc).__name__}: {exc}'))
+    return facts
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _open_dump(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def _description(text: Optional[str]) -> Optional[Dict]:
+    """Комментарий столбца -> col_description запроса сбора: JSON-объект как есть, иначе {'name': текст}."""
+    if not text:
+        return None
+    if text.startswith('{') and text.endswith('}'):
+        try:
+            value = json.loads(text)
+            if isinstance(value, dict):
+                return value
+        except ValueError:
+            pass
+    return {'name': text}
+
+
+def _truncate(value, limit: int = 255) -> Optional[str]:
+    """table_comment и column_comment в TotalData — varchar(255); полный текст остаётся в column_info."""
+    if value is None:
+        return None
+    return str(value)[:limit]
+
+
+def build_rows(facts: Iterable[Tuple], stand: str, table_catalog: str, group_catalog: Optional[str] = None) -> List[Dict]:
+    """Сводит факты разбора в строки TotalData (без hash_address)."""
+    tables = {}
+    table_comments = {}
+    column_comments = {}
+    schema_comments = {}
+    primary_keys = {}
+    defaults = {}
+    identities = set()
+    for fact in facts:
+        kind = fact[0]
+        if kind == 'table':
+            tables[fact[1:3]] = fact[3:]
+        elif kind == 'table_comment':
+            table_comments[fact[1:3]] = fact[3]
+        elif kind == 'column_comment':
+            column_comments[fact[1:4]] = fact[4]
+        elif kind == 'schema_comment':
+            schema_comments[fact[1]] = fact[2]
+        elif kind == 'primary_key':
+            primary_keys[fact[1:3]] = set(fact[3])
+        elif kind == 'default':
+            defaults[fact[1:4]] = fact[4]
+        elif kind == 'identity':
+            identities.add(fact[1:4])
+
+    def columns_of(key, seen=()):
+        table_type, columns, parent = tables[key]
+        if columns is None and parent in tables and parent not in seen:
+            return columns_of(parent, seen + (key,))
+        return columns or []
+
+    rows = []
+    for (schema, table), (table_type, _, _) in tables.items():
+        primary_key = primary_keys.get((schema, table), set())
+        for column in columns_of((schema, table)):
+            name = column['name']
+            default = defaults.get((schema, table, name), column['default'])
+            is_key = column['primary_key'] or name in primary_key
+            description = _description(column_comments.get((schema, table, name)))
+            column_info = {
+                'schema_description': schema_comments.get(schema),
+                'is_key': is_key,
+                'default': default,
+                'description': description,
+                'source': 'ddl_dump',
+            }
+            rows.append({
+                'stand': stand,
+                'table_type': table_type,
+                'group_catalog': group_catalog,
+                'table_catalog': table_catalog,
+                'table_schema': schema,
+                'table_name': table,
+                'table_comment': _truncate(table_comments.get((schema, table))),
+                'column_number': None,
+                'column_name': name,
+                'column_comment': _truncate(description.get('name')) if description else None,
+                'data_type': column['type'],
+                'is_nullable': 'NO' if column['not_null'] or is_key else 'YES',
+                'is_auto': 'YES' if (
+                    column['identity']
+                    or (schema, table, name) in identities
+                    or (default and default.startswith('nextval('))
+                ) else 'NO',
+                'column_info': {key: value for key, value in column_info.items() if value is not None},
+            })
+    return rows
+
+
+def load_ddl_dump(
+        path: str,
+        stand: str,
+        table_catalog: str,
+        group_catalog: Optional[str] = None,
+        workers: int = 4,
+        chunk_size: int = DDL_CHUNK_SIZE,
+        batch_size: int = 10000,
+        author_id: Optional[int] = None,
+) -> Dict:
+    """
+    Загружает метаданные из pg_dump --schema-only (в том числе .gz) в TotalData.
+    Args:
+        path: путь к файлу дампа
+        stand: значение поля stand
+        table_catalog: значение поля table_catalog (алиас базы)
+        group_catalog: значение поля group_catalog
+        workers: процессов разбора; 1 — разбор в текущем процессе
+        chunk_size: операторов в одной задаче пула
+        batch_size: строк в одном вызове upsert_total_data
+        author_id: id автора записей
+    Returns:
+        dict: statements / parsed / errors / tables / rows / inserted / updated / unchanged / duplicates / seconds
+    """
+    started = time.monotonic()
+    stats = {'statements': 0, 'parsed': 0, 'errors': 0}
+
+    def relevant():
+        with _open_dump(path) as source:
+            for statement in iter_statements(source):
+                stats['statements'] += 1
+                if is_relevant(statement):
+                    stats['parsed'] += 1
+                    yield statement
+
+    chunks = _chunks(relevant(), chunk_size)
+    if workers > 1:
+        # Дочерние процессы не должны унаследовать открытые соединения с БД
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_chunk, chunks))
+    else:
+        results = [_parse_chunk(chunk) for chunk in chunks]
+
+    facts = []
+    for chunk_facts in results:
+        for fact in chunk_facts:
+            if fact[0] == 'error':
+                stats['errors'] += 1
+                logger.warning('DDL: не удалось разобрать оператор %r: %s', fact[1], fact[2])
+            else:
+                facts.append(fact)
+    parsed_at = time.monotonic()
+
+    rows = build_rows(facts, stand, table_catalog, group_catalog)
+    stats['tables'] = sum(1 for fact in facts if fact[0] == 'table')
+    stats['rows'] = len(rows)
+    for key in ('inserted', 'updated', 'unchanged', 'duplicates'):
+        stats[key] = 0
+    for batch in _chunks(rows, batch_size):
+        for row, hash_address in zip(batch, build_hashes(batch)):
+            row['hash_address'] = hash_address
+        result = upsert_total_data(batch, author_id=author_id, observe=TotalDataObservation.SOURCE_DDL_DUMP)
+        for key in ('inserted', 'updated', 'unchanged', 'duplicates'):
+            stats[key] += result[key]
+
+    stats['parse_seconds'] = round(parsed_at - started, 3)
+    stats['seconds'] = round(time.monotonic() - started, 3)
+    logger.info('DDL dump load %s: %s', path, stats)
+    return stats
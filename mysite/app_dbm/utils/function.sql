@@ -104,15 +104,15 @@ BEGIN
              updated_at = NOW()
             ,is_active  = TRUE;
 
--- 5. Деактивация лишних колонок (только если is_active = true)
+-- 5. Деактивация лишних колонок (только если is_active = true) — анти-соединение вместо NOT IN
     UPDATE my_dbmatch.link_columns_stage as lct
     SET is_active = FALSE,
         updated_at = NOW()
 	WHERE 1=1
-		AND lct.is_active = False
+		AND lct.is_active = TRUE
     	AND lct.stage_id = (SELECT id FROM my_dbmatch.dim_stage WHERE name = stage_db )
-		AND lct.column_id NOT IN (
-          SELECT lcs.id
+		AND NOT EXISTS (
+          SELECT 1
           FROM my_dbmatch.link_total_data ltd
               JOIN my_dbmatch.link_db ldb ON ldb.alias = ltd.db_name
               JOIN my_dbmatch.link_base_schemas lbs ON lbs.base_id = ldb.base_id AND lbs.schema = ltd.schem_name
@@ -121,6 +121,7 @@ BEGIN
           where 1=1
           	AND ltd.stage   = stage_db 
           	AND ltd.db_name = name_db
+          	AND lcs.id = lct.column_id
       );
 
     -- 6. Активация связанных
@@ -130,39 +131,40 @@ BEGIN
     		,updated_at = NOW()
     WHERE 1=1
     	and is_active=FALSE
-    	and column_id IN (
-        SELECT lcs.id
+    	and EXISTS (
+        SELECT 1
         FROM my_dbmatch.link_columns lcs
             JOIN my_dbmatch.link_tables lts ON lts.id = lcs.table_id
             JOIN my_dbmatch.link_base_schemas lbs ON lbs.id = lts.schema_id
             JOIN my_dbmatch.link_db ldb ON ldb.base_id = lbs.base_id
             JOIN my_dbmatch.dim_stage dst ON dst.id = ldb.stage_id
         WHERE dst.name = stage_db AND ldb.alias = name_db
+          AND lcs.id = link_columns_stage.column_id
     );
 
-    UPDATE my_dbmatch.link_columns
+    UPDATE my_dbmatch.link_columns lc
     	set
 	    	 is_active = true
 			,updated_at = NOW()
     WHERE 1=1
-    	and is_active = fALSE
-    	and id IN (SELECT column_id FROM my_dbmatch.link_columns_stage WHERE is_active = TRUE);
+    	and lc.is_active = fALSE
+    	and EXISTS (SELECT 1 FROM my_dbmatch.link_columns_stage s WHERE s.column_id = lc.id AND s.is_active = TRUE);
 
-    UPDATE my_dbmatch.link_tables
+    UPDATE my_dbmatch.link_tables lt
     	SET 
     		 is_active = true
     		,updated_at = NOW() 
 	WHERE 1=1
-		and is_active = fALSE
-    	and id IN (SELECT DISTINCT table_id FROM my_dbmatch.link_columns WHERE is_active = TRUE);
+		and lt.is_active = fALSE
+    	and EXISTS (SELECT 1 FROM my_dbmatch.link_columns c WHERE c.table_id = lt.id AND c.is_active = TRUE);
 
-    UPDATE my_dbmatch.link_base_schemas
+    UPDATE my_dbmatch.link_base_schemas lb
     	SET 
     		 is_active = true
     		,updated_at = NOW()
     WHERE 1=1
-		and is_active = false
-    	and id IN (SELECT DISTINCT schema_id FROM my_dbmatch.link_tables WHERE is_active = TRUE);
+		and lb.is_active = false
+    	and EXISTS (SELECT 1 FROM my_dbmatch.link_tables t WHERE t.schema_id = lb.id AND t.is_active = TRUE);
 
 END;
 $function$
@@ -0,0 +1,173 @@
+# utils/harvester.py
+"""
+Сбор метаданных с баз данных из LinkDB:
+1) запрос сбора выполняется на нескольких базах параллельно (пул потоков, лимит на хост)
+2) результат читается серверным курсором порциями и сразу пишется в TotalData пакетной загрузкой
+3) по каждой базе сохраняется время, число строк и ошибка
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import zip_longest
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import psycopg2
+import psycopg2.extras
+from django.db import connections
+
+from ..models import LinkDB
+from .total_data_bulk import upsert_total_data
+from .total_data_keys import build_hashes
+
+logger = logging.getLogger(__name__)
+
+HARVEST_SQL_PATH = Path(__file__).with_name('select_catalog.sql')
+
+
+@dataclass
+class HarvestResult:
+    """Итог сбора с одной базы."""
+
+    link_db_id: int
+    alias: str
+    host: str
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class HarvestOptions:
+    """Параметры подключения и сбора. Пустые user/password берутся из PGUSER/PGPASSWORD/.pgpass."""
+
+    user: Optional[str] = None
+    password: Optional[str] = None
+    connect_timeout: int = 10
+    statement_timeout_ms: int = 600000
+    batch_size: int = 5000
+    workers: int = 8
+    per_host: int = 2
+    sql_path: Path = field(default=HARVEST_SQL_PATH)
+
+
+def load_harvest_sql(path: Path = HARVEST_SQL_PATH) -> str:
+    """Текст запроса сбора без завершающей ';' (нужно для серверного курсора)."""
+    return path.read_text(encoding='utf-8').strip().rstrip(';')
+
+
+def _to_total_data(row: Dict, link_db: LinkDB) -> Dict:
+    """Строка выгрузки запроса сбора -> поля TotalData."""
+    description = row.get('col_description') or {}
+    default = row.get('col_default')
+    # col_date_create — now() на момент выгрузки: в column_info не кладём, иначе каждый
+    # сбор меняет content_digest и hash_address всех строк
+    column_info = {
+        'db_version': row.get('db_version'),
+        'db_description': row.get('db_description'),
+        'schema_description': row.get('schem_description'),
+        'is_metadata': row.get('tab_is_metadata'),
+        'is_key': row.get('col_is_key'),
+        'unique_together': row.get('col_unique_together'),
+        'default': default,
+        'description': description or None,
+    }
+    return {
+        'stand': link_db.stage.name,
+        'table_type': row.get('tab_type'),
+        'group_catalog': link_db.base.name,
+        'table_catalog': link_db.alias,
+        'table_schema': row.get('schem_name'),
+        'table_name': row.get('tab_name'),
+        'table_comment': row.get('tab_description'),
+        'column_number': None,
+        'column_name': row.get('col_columns'),
+        'column_comment': description.get('name') if isinstance(description, dict) else None,
+        'data_type': row.get('col_type'),
+        'is_nullable': 'YES' if row.get('col_is_null') else 'NO',
+        'is_auto': 'YES' if default and str(default).startswith('nextval(') else 'NO',
+        'column_info': {key: value for key, value in column_info.items() if value is not None},
+    }
+
+
+def harvest_target(link_db: LinkDB, sql: str, options: HarvestOptions) -> HarvestResult:
+    """Выполняет запрос сбора на одной базе и пишет результат в TotalData порциями."""
+    result = HarvestResult(link_db_id=link_db.pk, alias=link_db.alias, host=link_db.host)
+    started = time.monotonic()
+    target = None
+    try:
+        target = psycopg2.connect(
+            host=link_db.host,
+            port=link_db.port,
+            dbname=link_db.name,
+            user=options.user,
+            password=options.password,
+            connect_timeout=options.connect_timeout,
+            application_name='app_dbm harvester',
+            options=f'-c statement_timeout={options.statement_timeout_ms} '
+                    f'-c default_transaction_read_only=on',
+        )
+        with target.cursor(name='harvest', cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.itersize = options.batch_size
+            cursor.execute(sql)
+            while True:
+                batch = cursor.fetchmany(options.batch_size)
+                if not batch:
+                    break
+                rows = [_to_total_data(row, link_db) for row in batch]
+                for row, hash_address in zip(rows, build_hashes(rows)):
+                    row['hash_address'] = hash_address
+                stats = upsert_total_data(rows)
+                result.rows += len(rows)
+                result.inserted += stats['inserted']
+                result.updated += stats['updated']
+                result.unchanged += stats['unchanged'] + stats['duplicates']
+    except Exception as exc:
+        logger.exception('Ошибка сбора метаданных %s (%s)', link_db.alias, link_db.host)
+        result.error = str(exc).strip()
+    finally:
+        if target is not None:
+            target.close()
+        # Соединение Django в рабочем потоке открывается отдельно — закрываем его сами
+        connections.close_all()
+        result.seconds = round(time.monotonic() - started, 3)
+    return result
+
+
+def harvest_many(link_dbs: Iterable[LinkDB], options: Optional[HarvestOptions] = None) -> List[HarvestResult]:
+    """
+    Собирает метаданные с нескольких баз параллельно.
+    Общий размер пула — options.workers, на один хост одновременно не больше options.per_host подключений.
+    """
+    options = options or HarvestOptions()
+    sql = load_harvest_sql(options.sql_path)
+    by_host = defaultdict(list)
+    for link_db in link_dbs:
+        by_host[link_db.host].append(link_db)
+    host_limits = {host: threading.BoundedSemaphore(options.per_host) for host in by_host}
+    # Базы чередуются по хостам, чтобы потоки пула не простаивали в очереди к одному хосту
+    link_dbs = [
+        link_db
+        for group in zip_longest(*by_host.values())
+        for link_db in group
+        if link_db is not None
+    ]
+
+    def run(link_db):
+        with host_limits[link_db.host]:
+            return harvest_target(link_db, sql, options)
+
+    with ThreadPoolExecutor(max_workers=options.workers) as pool:
+        results = list(pool.map(run, link_dbs))
+
+    logger.info(
+        'Сбор метаданных: баз %s, ошибок %s, строк %s',
+        len(results), sum(1 for item in results if item.error), sum(item.rows for item in results)
+    )
+    return results
@@ -0,0 +1,128 @@
+# utils/ingest_jobs.py
+"""
+Очередь заданий пакетной загрузки TotalData в БД:
+1) запрос сохраняет проверенные строки в IngestJob и сразу возвращает id задания
+2) обработчик забирает задания через SELECT ... FOR UPDATE SKIP LOCKED
+3) строки пишутся чанками, прогресс сохраняется после каждого чанка
+4) сохранение прогресса продлевает аренду задания (updated_at): задание в статусе running без прогресса
+   дольше INGEST_JOB_LEASE считается брошенным (обработчик упал) и забирается снова, загрузка
+   продолжается с rows_processed; started_at — метка владельца, прежний обработчик после этого
+   не может записать прогресс или статус и останавливается
+"""
+import logging
+import traceback
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import IngestJob
+from .total_data_bulk import BULK_CHUNK_SIZE, upsert_total_data
+
+logger = logging.getLogger(__name__)
+
+# Срок аренды задания: с запасом больше времени записи одного чанка
+INGEST_JOB_LEASE = timedelta(minutes=15)
+
+
+class JobLeaseLost(Exception):
+    """Задание забрал другой обработчик после истечения аренды."""
+
+
+def enqueue_ingest_job(rows: List[Dict], author_id: Optional[int] = None) -> IngestJob:
+    """Ставит строки (с рассчитанным hash_address) в очередь на загрузку."""
+    return IngestJob.objects.create(
+        payload=rows,
+        rows_total=len(rows),
+        author_id=author_id,
+    )
+
+
+def claim_next_job() -> Optional[IngestJob]:
+    """
+    Забирает самое старое задание из очереди или брошенное задание с истёкшей арендой;
+    параллельные обработчики не мешают друг другу.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            IngestJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=IngestJob.STATUS_PENDING)
+                | Q(status=IngestJob.STATUS_RUNNING, updated_at__lt=now - INGEST_JOB_LEASE)
+            )
+            .order_by('created_at', 'pk')
+            .first()
+        )
+        if job is None:
+            return None
+        if job.status == IngestJob.STATUS_RUNNING:
+            logger.warning(
+                'Задание загрузки #%s без прогресса с %s, забрано повторно с строки %s',
+                job.pk, job.updated_at, job.rows_processed
+            )
+        job.status = IngestJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
+    return job
+
+
+def process_job(job: IngestJob, chunk_size: int = BULK_CHUNK_SIZE) -> IngestJob:
+    """
+    Загружает строки задания начиная с rows_processed; каждый чанк — отдельная транзакция.
+    Запись идёт, пока задание принадлежит этому обработчику (started_at не изменился).
+    """
+    rows = job.payload or []
+    owned = IngestJob.objects.filter(pk=job.pk, status=IngestJob.STATUS_RUNNING, started_at=job.started_at)
+    try:
+        for start in range(job.rows_processed, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            stats = upsert_total_data(chunk, author_id=job.author_id)
+            renewed = owned.update(
+                rows_processed=F('rows_processed') + len(chunk),
+                inserted=F('inserted') + stats['inserted'],
+                updated=F('updated') + stats['updated'],
+                unchanged=F('unchanged') + stats['unchanged'] + stats['duplicates'],
+                updated_at=timezone.now(),
+            )
+            if not renewed:
+                raise JobLeaseLost()
+    except JobLeaseLost:
+        logger.warning('Задание загрузки #%s забрано другим обработчиком, обработка прервана', job.pk)
+    except Exception as exc:
+        logger.exception('Ошибка задания загрузки #%s', job.pk)
+        owned.update(
+            status=IngestJob.STATUS_FAILED,
+            errors={'error': str(exc), 'traceback': traceback.format_exc()},
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+    else:
+        # Строки уже в TotalData — исходный payload больше не нужен
+        owned.update(
+            status=IngestJob.STATUS_DONE,
+            payload=None,
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+    job.refresh_from_db()
+    return job
+
+
+def run_pending_jobs(limit: Optional[int] = None) -> int:
+    """Обрабатывает задания из очереди, пока они есть (или до limit). Возвращает число заданий."""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        job = process_job(job)
+        logger.info(
+            'Задание загрузки #%s: %s, строк %s за %s с',
+            job.pk, job.status, job.rows_processed, job.seconds
+        )
+        processed += 1
+    return processed
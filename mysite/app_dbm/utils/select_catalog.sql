@@ -0,0 +1,102 @@
+-- Сбор метаданных напрямую из pg_catalog.
+-- Те же столбцы и значения, что у select.sql, но без представлений information_schema,
+-- без повторных приведений к regclass и без соединений по тексту.
+WITH
+db_metadata AS (
+    SELECT shobj_description(d.oid, 'pg_database') AS db_description
+    FROM pg_database AS d
+    WHERE d.datname = current_database()
+)
+,clean_comment AS (
+    SELECT
+         n.nspname                        AS table_schema
+        ,CASE WHEN n.nspname NOT LIKE 'pg_%' THEN sd.description END AS schema_description
+        ,c.oid                            AS table_oid
+        ,c.relname                        AS table_name
+        ,CASE
+            WHEN n.oid = pg_my_temp_schema() THEN 'LOCAL TEMPORARY'
+            WHEN c.relkind IN ('r', 'p') THEN 'BASE TABLE'
+            WHEN c.relkind = 'v' THEN 'VIEW'
+            WHEN c.relkind = 'f' THEN 'FOREIGN'
+        END                               AS table_type
+        ,td.description                   AS table_comment
+        ,a.attnum                         AS ordinal_position
+        ,a.attname                        AS column_name
+        ,CASE
+            WHEN ut.typname = 'varchar' THEN COALESCE(
+                ut.typname || '(' || (NULLIF(CASE WHEN t.typtype = 'd' THEN t.typtypmod ELSE a.atttypmod END, -1) - 4) || ')',
+                ut.typname
+            )
+            WHEN ut.typelem <> 0 AND ut.typlen = -1 THEN 'ARRAY'
+            ELSE ut.typname
+        END                               AS data_type
+        ,NOT (a.attnotnull OR (t.typtype = 'd' AND t.typnotnull)) AS is_nullable
+        ,CASE WHEN a.attgenerated = '' THEN pg_get_expr(ad.adbin, ad.adrelid) END AS column_default
+        ,EXISTS (
+            SELECT 1
+            FROM pg_constraint AS pk
+            WHERE pk.conrelid = c.oid
+              AND pk.contype = 'p'
+              AND a.attnum = ANY (pk.conkey)
+        )                                 AS is_primary_key
+        -- Очистка комментария от невалидных JSON символов
+        ,CASE
+            WHEN cd.description IS NULL OR cd.description = '' THEN NULL
+            WHEN cd.description ~ '^\{.*\}$' THEN cd.description
+            ELSE REGEXP_REPLACE(
+                REGEXP_REPLACE(
+                    REGEXP_REPLACE(
+                        cd.description,
+                        '[\\x00-\\x1F\\x7F]', ' ', 'g' -- Удаляем управляющие символы
+                    ),
+                    '["\\]', '\\\0', 'g' -- Экранируем кавычки и обратные слеши
+                ),
+                '[\n\r\t]+', ' ', 'g' -- Заменяем переносы и табы на пробелы
+            )
+        END                               AS cleaned_comment
+    FROM pg_class AS c
+        JOIN pg_namespace AS n ON n.oid = c.relnamespace
+        JOIN pg_attribute AS a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+        JOIN pg_type AS t ON t.oid = a.atttypid
+        -- для доменов information_schema.udt_name показывает базовый тип
+        JOIN pg_type AS ut ON ut.oid = CASE WHEN t.typtype = 'd' THEN t.typbasetype ELSE t.oid END
+        LEFT JOIN pg_attrdef AS ad ON ad.adrelid = c.oid AND ad.adnum = a.attnum
+        LEFT JOIN pg_description AS td
+            ON td.objoid = c.oid AND td.classoid = 'pg_class'::regclass AND td.objsubid = 0
+        LEFT JOIN pg_description AS cd
+            ON cd.objoid = c.oid AND cd.classoid = 'pg_class'::regclass AND cd.objsubid = a.attnum
+        LEFT JOIN pg_description AS sd
+            ON sd.objoid = n.oid AND sd.classoid = 'pg_namespace'::regclass AND sd.objsubid = 0
+    WHERE c.relkind IN ('r', 'p', 'v', 'f')
+      AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+      AND NOT pg_is_other_temp_schema(n.oid)
+      -- те же права, что проверяет information_schema.columns
+      AND (
+          pg_has_role(c.relowner, 'USAGE')
+          OR has_column_privilege(c.oid, a.attnum, 'SELECT, INSERT, UPDATE, REFERENCES')
+      )
+)
+SELECT
+    'TST'             AS stage
+    ,version()        AS db_version
+    ,current_database()::text AS db_name
+    ,(SELECT db_description FROM db_metadata) AS db_description
+    ,ci.table_schema::text AS schem_name
+    ,ci.schema_description AS schem_description
+    ,false            AS tab_is_metadata
+    ,ci.table_type    AS tab_type
+    ,ci.table_name::text AS tab_name
+    ,ci.table_comment AS tab_description
+    ,now() AS col_date_create
+    ,ci.data_type::text AS col_type,ci.column_name::text AS col_columns
+    ,ci.is_nullable   AS col_is_null
+    ,ci.is_primary_key AS col_is_key
+    ,null              AS col_unique_together
+    ,ci.column_default AS col_default
+    ,CASE
+        WHEN ci.cleaned_comment IS NULL THEN '{"name": null}'::jsonb
+        WHEN ci.cleaned_comment ~ '^\{.*\}$' THEN ci.cleaned_comment::jsonb
+        ELSE ('{"name":"' || ci.cleaned_comment || '"}')::jsonb
+    END AS col_description
+FROM clean_comment AS ci
+ORDER BY ci.table_oid, ci.ordinal_position;
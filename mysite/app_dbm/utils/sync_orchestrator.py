@@ -0,0 +1,108 @@
+# utils/sync_orchestrator.py
+"""
+Параллельная синхронизация многих пар (стенд, база):
+1) пары упорядочиваются по размеру среза TotalData — крупные запускаются первыми
+2) синхронизации выполняются в пуле потоков, каждая в своём соединении и своей транзакции
+3) одновременный запуск одной пары исключён advisory-блокировкой (см. syncing_model)
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, List, Sequence, Tuple
+
+from django.db import connections
+from django.db.models import Count
+
+from ..models import LinkDB, TotalData
+from .syncing_model import SyncLocked, SyncResult, sync_stage_catalog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OrchestratorResult:
+    """Итог запуска по всем парам."""
+
+    results: List[SyncResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def failed(self) -> List[SyncResult]:
+        return [item for item in self.results if item.error]
+
+    @property
+    def rows_touched(self) -> int:
+        return sum(item.rows_touched for item in self.results)
+
+
+def pairs_for_stages(stages: Sequence[str]) -> List[Tuple[str, str]]:
+    """Все активные LinkDB указанных стендов -> пары (стенд, алиас)."""
+    return list(
+        LinkDB.objects
+        .filter(is_active=True, stage__name__in=stages)
+        .order_by('stage__name', 'alias')
+        .values_list('stage__name', 'alias')
+        .distinct()
+    )
+
+
+def _order_by_size(pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Пары в порядке убывания размера среза: длинные синхронизации не остаются на конец окна."""
+    pairs = list(dict.fromkeys(pairs))
+    stands = {stage for stage, _ in pairs}
+    sizes = {
+        (row['stand'], row['table_catalog']): row['rows']
+        for row in (
+            TotalData.objects
+            .filter(stand__in=stands, is_active=True)
+            .values('stand', 'table_catalog')
+            .annotate(rows=Count('hash_address'))
+        )
+    }
+    return sorted(pairs, key=lambda pair: sizes.get(pair, 0), reverse=True)
+
+
+def _run(stage: str, catalog: str, dry_run: bool) -> SyncResult:
+    started = time.monotonic()
+    try:
+        return sync_stage_catalog(stage, catalog, dry_run=dry_run)
+    except SyncLocked as exc:
+        logger.warning('%s', exc)
+        return SyncResult(stage=stage, catalog=catalog, dry_run=dry_run, error=str(exc),
+                          seconds=round(time.monotonic() - started, 3))
+    except Exception as exc:
+        logger.exception('Ошибка синхронизации %s/%s', stage, catalog)
+        return SyncResult(stage=stage, catalog=catalog, dry_run=dry_run, error=str(exc).strip(),
+                          seconds=round(time.monotonic() - started, 3))
+    finally:
+        # Соединение Django в рабочем потоке открывается отдельно — закрываем его сами
+        connections.close_all()
+
+
+def sync_many(
+        pairs: Iterable[Tuple[str, str]],
+        workers: int = 4,
+        dry_run: bool = False,
+) -> OrchestratorResult:
+    """
+    Синхронизирует пары (стенд, база) параллельно.
+    Args:
+        pairs: пары (TotalData.stand, TotalData.table_catalog)
+        workers: размер пула потоков (= число одновременных соединений с БД)
+        dry_run: выполнить шаги и откатить изменения каждой пары
+    Returns:
+        OrchestratorResult: результаты по парам, общее время
+    """
+    started = time.monotonic()
+    pairs = _order_by_size(pairs)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        results = list(pool.map(lambda pair: _run(pair[0], pair[1], dry_run), pairs))
+
+    result = OrchestratorResult(results=results, seconds=round(time.monotonic() - started, 3))
+    logger.info(
+        'Синхронизация: пар %s, ошибок %s, изменено строк %s, %s с',
+        len(results), len(result.failed), result.rows_touched, result.seconds
+    )
+    return result
+
@@ -1,19 +1,532 @@
 # utils/syncing_model.py
 """
-Синхронизация моделей:
-1) деактивация
-2) активация
-3) добавление
+Синхронизация моделей схем, таблиц и столбцов со срезом TotalData одного стенда и одной базы:
+1) срез (stand, table_catalog) один раз переносится во временную таблицу из set_total_data_rows
+   по ключам словарей (utils.total_data_interning)
+2) добавление и обновление схем, таблиц и столбцов — по одному запросу на шаг;
+   столбец перезаписывается, только если изменился его дайджест (LinkColumn.content_digest)
+3) деактивация столбцов, пропавших на этом стенде; восстановление и деактивация таблиц и схем
+   каскадом вверх только по id, изменённым в этом запуске
+4) запуск записывается в SyncRun, изменённые id схем, таблиц и столбцов — в SyncChange
+5) после фиксации запуска с изменениями обновляется представление catalog_flat (utils.catalog_flat)
+Все шаги выполняются в одной транзакции; в режиме dry_run транзакция откатывается.
+Присутствие столбца на стендах хранится в LinkColumn.stage: {"<id стенда>": "<имя стенда>"}.
 """
 import logging
-from django.db import connection
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import (
+    DimTableType, LinkColumn, LinkDB, LinkSchema, LinkTable, SyncChange, SyncRun,
+    TotalDataRow, TotalDataSchema, TotalDataTable,
+)
+from .catalog_flat import refresh_catalog_flat
+from .total_data_interning import slice_ids
+from .total_data_keys import digest_sql
 
 logger = logging.getLogger(__name__)
 
+SYNC_STAGING_TABLE = 'tmp_sync_slice'
+
+# Первый ключ advisory-блокировок синхронизации: пара — (SYNC_LOCK_CLASS, hashtext('<стенд>/<база>')),
+# DimDB — (SYNC_LOCK_CLASS + 1, base_id)
+SYNC_LOCK_CLASS = 7310
+
+
+# Дайджест строки среза в тех же полях и типах, что LinkColumn.content_digest (LINK_COLUMN_DIGEST_FIELDS)
+_SLICE_DIGEST = digest_sql([
+    'sl.data_type', 'sl.is_null', 'sl.is_key', 'sl.unique_together', 'sl.column_default', 'sl.description',
+])
+
+_SEQ_SCAN_RE = re.compile(r'Seq Scan on "?(\w+)"?')
+_EXECUTION_TIME_RE = re.compile(r'Execution Time: ([0-9.]+) ms')
+
+
+class SyncError(Exception):
+    """Ошибка синхронизации."""
+
+
+class SyncLocked(SyncError):
+    """Синхронизация этой базы этого стенда уже выполняется в другом сеансе."""
+
+
+@dataclass
+class SyncResult:
+    """Итог синхронизации одной базы одного стенда."""
+
+    stage: str
+    catalog: str
+    link_db_id: Optional[int] = None
+    base_id: Optional[int] = None
+    rows: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    dry_run: bool = False
+    seconds: float = 0.0
+    error: Optional[str] = None
+    run_id: Optional[int] = None
+    changes: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rows_touched(self) -> int:
+        """Изменённые строки моделей (без служебных шагов resolve_*)."""
+        return sum(count for name, count in self.counts.items() if not name.startswith('resolve_'))
+
+
+def _table(model) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def resolve_link_db(stage: str, catalog: str) -> LinkDB:
+    """LinkDB стенда по алиасу базы (table_catalog), при отсутствии — по имени базы."""
+    link_dbs = list(
+        LinkDB.objects
+        .filter(stage__name=stage)
+        .filter(Q(alias=catalog) | Q(name=catalog))
+        .select_related('stage', 'base')
+        .order_by('-is_active', 'pk')
+    )
+    for link_db in link_dbs:
+        if link_db.alias == catalog:
+            return link_db
+    if link_dbs:
+        return link_dbs[0]
+    raise SyncError(f'Не найдена база {catalog!r} на стенде {stage!r}')
+
+
+def _steps() -> List[Tuple[str, str, Optional[int]]]:
+    """
+    Шаги синхронизации: (имя, SQL, тип объекта SyncChange).
+    SQL шагов с типом объекта возвращает (id, действие) изменённых строк — они попадают в набор изменений.
+    Старое значение is_active берётся из самосоединения old: в FROM видна версия строки до UPDATE.
+    Пропавшие объекты находятся антисоединением NOT EXISTS в пределах базы синхронизации.
+    Параметры всех шагов: base_id, stage_key, stage_name, run_id.
+    """
+    schemas = _table(LinkSchema)
+    tables = _table(LinkTable)
+    columns = _table(LinkColumn)
+    table_types = _table(DimTableType)
+    changes = _table(SyncChange)
+    slice_ = SYNC_STAGING_TABLE
+    added, updated = SyncChange.ACTION_ADDED, SyncChange.ACTION_UPDATED
+    reactivated, deactivated = SyncChange.ACTION_REACTIVATED, SyncChange.ACTION_DEACTIVATED
+    return [
+        ('table_types_insert', f'''
+            INSERT INTO {table_types} (created_at, updated_at, is_active, name)
+            SELECT DISTINCT NOW(), NOW(), TRUE, s.table_type
+            FROM {slice_} AS s
+            WHERE s.table_type IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM {table_types} AS t WHERE t.name = s.table_type)
+            ON CONFLICT (name) DO NOTHING
+        ''', None),
+        ('schemas_insert', f'''
+            INSERT INTO {schemas} (created_at, updated_at, is_active, base_id, schema, description)
+            SELECT DISTINCT ON (s.schema_name) NOW(), NOW(), TRUE, %(base_id)s, s.schema_name, s.schema_description
+            FROM {slice_} AS s
+            ORDER BY s.schema_name
+            ON CONFLICT (base_id, schema) DO NOTHING
+            RETURNING id, {added}
+        ''', SyncChange.OBJECT_SCHEMA),
+        # Схемы и таблицы здесь только обновляются; восстановление — каскадом от изменённых столбцов
+        ('schemas_update', f'''
+            UPDATE {schemas} AS t
+            SET description = s.schema_description, updated_at = NOW()
+            FROM (
+                SELECT DISTINCT ON (schema_name) schema_name, schema_description
+                FROM {slice_}
+                ORDER BY schema_name
+            ) AS s
+            WHERE t.base_id = %(base_id)s
+              AND t.schema = s.schema_name
+              AND t.description IS DISTINCT FROM s.schema_description
+            RETURNING t.id, {updated}
+        ''', SyncChange.OBJECT_SCHEMA),
+        ('resolve_schemas', f'''
+            UPDATE {slice_} AS s
+            SET schema_id = t.id, type_id = tt.id
+            FROM {schemas} AS t, {table_types} AS tt
+            WHERE t.base_id = %(base_id)s
+              AND t.schema = s.schema_name
+              AND tt.name = s.table_type
+        ''', None),
+        ('tables_insert', f'''
+            INSERT INTO {tables} (created_at, updated_at, is_active, schema_id, type_id, name, is_metadata, description)
+            SELECT DISTINCT ON (s.schema_id, s.type_id, s.table_name)
+                NOW(), NOW(), TRUE, s.schema_id, s.type_id, s.table_name, s.is_metadata, s.table_comment
+            FROM {slice_} AS s
+            WHERE s.schema_id IS NOT NULL
+            ORDER BY s.schema_id, s.type_id, s.table_name
+            ON CONFLICT (schema_id, type_id, name) DO NOTHING
+            RETURNING id, {added}
+        ''', SyncChange.OBJECT_TABLE),
+        ('tables_update', f'''
+            UPDATE {tables} AS t
+            SET is_metadata = s.is_metadata, description = s.table_comment, updated_at = NOW()
+            FROM (
+                SELECT DISTINCT ON (schema_id, type_id, table_name) schema_id, type_id, table_name, is_metadata, table_comment
+                FROM {slice_}
+                WHERE schema_id IS NOT NULL
+                ORDER BY schema_id, type_id, table_name
+            ) AS s
+            WHERE t.schema_id = s.schema_id
+              AND t.type_id = s.type_id
+              AND t.name = s.table_name
+              AND (t.is_metadata, t.description) IS DISTINCT FROM (s.is_metadata, s.table_comment)
+            RETURNING t.id, {updated}
+        ''', SyncChange.OBJECT_TABLE),
+        ('resolve_tables', f'''
+            UPDATE {slice_} AS s
+            SET table_id = t.id
+            FROM {tables} AS t
+            WHERE t.schema_id = s.schema_id
+              AND t.type_id = s.type_id
+              AND t.name = s.table_name
+        ''', None),
+        ('columns_insert', f'''
+            INSERT INTO {columns} (
+                created_at, updated_at, is_active, table_id, date_create, type, columns,
+                is_null, is_key, unique_together, "default", description, stage
+            )
+            SELECT
+                NOW(), NOW(), TRUE, s.table_id, NOW(), s.data_type, s.column_name,
+                s.is_null, s.is_key, s.unique_together, s.column_default, s.description,
+                jsonb_build_object(%(stage_key)s, %(stage_name)s)
+            FROM {slice_} AS s
+            WHERE s.table_id IS NOT NULL
+            ON CONFLICT (table_id, columns) DO NOTHING
+            RETURNING id, {added}
+        ''', SyncChange.OBJECT_COLUMN),
+        ('columns_update', f'''
+            UPDATE {columns} AS t
+            SET is_active = TRUE
+               ,type = s.data_type
+               ,is_null = s.is_null
+               ,is_key = s.is_key
+               ,unique_together = s.unique_together
+               ,"default" = s.column_default
+               ,description = s.description
+               ,stage = COALESCE(t.stage, '{{}}'::jsonb) || jsonb_build_object(%(stage_key)s, %(stage_name)s)
+               ,updated_at = NOW()
+            FROM {slice_} AS s, {columns} AS old
+            WHERE old.id = t.id
+              AND t.table_id = s.table_id
+              AND t.columns = s.column_name
+              AND (t.is_active, t.content_digest, COALESCE(t.stage, '{{}}'::jsonb) ? %(stage_key)s)
+                  IS DISTINCT FROM (TRUE, s.content_digest, TRUE)
+            RETURNING t.id, CASE WHEN old.is_active THEN {updated} ELSE {reactivated} END
+        ''', SyncChange.OBJECT_COLUMN),
+        # Столбец, пропавший на стенде, теряет отметку стенда; неактивен — когда не осталось ни одного стенда
+        ('columns_deactivate', f'''
+            UPDATE {columns} AS t
+            SET stage = COALESCE(t.stage, '{{}}'::jsonb) - %(stage_key)s
+               ,is_active = (COALESCE(t.stage, '{{}}'::jsonb) - %(stage_key)s) <> '{{}}'::jsonb
+               ,updated_at = NOW()
+            FROM {tables} AS tb
+                JOIN {schemas} AS sc ON sc.id = tb.schema_id
+                , {columns} AS old
+            WHERE old.id = t.id
+              AND tb.id = t.table_id
+              AND sc.base_id = %(base_id)s
+              AND (t.stage IS NULL OR t.stage = '{{}}'::jsonb OR t.stage ? %(stage_key)s)
+              AND (t.is_active OR t.stage ? %(stage_key)s)
+              AND NOT EXISTS (
+                  SELECT 1 FROM {slice_} AS s
+                  WHERE s.table_id = t.table_id AND s.column_name = t.columns
+              )
+            RETURNING t.id, CASE WHEN old.is_active AND NOT t.is_active THEN {deactivated} ELSE {updated} END
+        ''', SyncChange.OBJECT_COLUMN),
+        # Дальше — только по id, изменённым в этом запуске (набор изменений запуска run_id):
+        # восстановление поднимается от столбцов к таблицам и схемам, деактивация проверяет
+        # лишь родителей деактивированных объектов
+        ('tables_reactivate', f'''
+            UPDATE {tables} AS t
+            SET is_active = TRUE, updated_at = NOW()
+            WHERE t.id IN (
+                SELECT c.table_id
+                FROM {changes} AS ch
+                    JOIN {columns} AS c ON c.id = ch.object_id
+                WHERE ch.run_id = %(run_id)s
+                  AND ch.object_type = {SyncChange.OBJECT_COLUMN}
+                  AND ch.action IN ({added}, {reactivated})
+            )
+              AND NOT t.is_active
+            RETURNING t.id, {reactivated}
+        ''', SyncChange.OBJECT_TABLE),
+        ('tables_deactivate', f'''
+            UPDATE {tables} AS t
+            SET is_active = FALSE, updated_at = NOW()
+            WHERE t.id IN (
+                SELECT c.table_id
+                FROM {changes} AS ch
+                    JOIN {columns} AS c ON c.id = ch.object_id
+                WHERE ch.run_id = %(run_id)s
+                  AND ch.object_type = {SyncChange.OBJECT_COLUMN}
+                  AND ch.action = {deactivated}
+            )
+              AND t.is_active
+              AND NOT EXISTS (SELECT 1 FROM {columns} AS c WHERE c.table_id = t.id AND c.is_active)
+            RETURNING t.id, {deactivated}
+        ''', SyncChange.OBJECT_TABLE),
+        ('schemas_reactivate', f'''
+            UPDATE {schemas} AS t
+            SET is_active = TRUE, updated_at = NOW()
+            WHERE t.id IN (
+                SELECT tb.schema_id
+                FROM {changes} AS ch
+                    JOIN {tables} AS tb ON tb.id = ch.object_id
+                WHERE ch.run_id = %(run_id)s
+                  AND ch.object_type = {SyncChange.OBJECT_TABLE}
+                  AND ch.action IN ({added}, {reactivated})
+            )
+              AND NOT t.is_active
+            RETURNING t.id, {reactivated}
+        ''', SyncChange.OBJECT_SCHEMA),
+        ('schemas_deactivate', f'''
+            UPDATE {schemas} AS t
+            SET is_active = FALSE, updated_at = NOW()
+            WHERE t.id IN (
+                SELECT tb.schema_id
+                FROM {changes} AS ch
+                    JOIN {tables} AS tb ON tb.id = ch.object_id
+                WHERE ch.run_id = %(run_id)s
+                  AND ch.object_type = {SyncChange.OBJECT_TABLE}
+                  AND ch.action = {deactivated}
+            )
+              AND t.is_active
+              AND NOT EXISTS (SELECT 1 FROM {tables} AS tb WHERE tb.schema_id = t.id AND tb.is_active)
+            RETURNING t.id, {deactivated}
+        ''', SyncChange.OBJECT_SCHEMA),
+    ]
+
+
+def _tracked(sql: str, object_type: int) -> str:
+    """Оборачивает шаг: строки из RETURNING записываются в набор изменений запуска."""
+    return f'''
+        WITH changed (object_id, action) AS ({sql})
+        INSERT INTO {_table(SyncChange)} (run_id, object_type, object_id, action)
+        SELECT %(run_id)s, {object_type}, object_id, action FROM changed
+    '''
+
+
+# Поля счётчиков SyncRun по (тип объекта, действие)
+_RUN_COUNTERS = {
+    (object_type, action): f'{prefix}_{suffix}'
+    for object_type, prefix in (
+        (SyncChange.OBJECT_SCHEMA, 'schemas'),
+        (SyncChange.OBJECT_TABLE, 'tables'),
+        (SyncChange.OBJECT_COLUMN, 'columns'),
+    )
+    for action, suffix in (
+        (SyncChange.ACTION_ADDED, 'added'),
+        (SyncChange.ACTION_UPDATED, 'updated'),
+        (SyncChange.ACTION_REACTIVATED, 'reactivated'),
+        (SyncChange.ACTION_DEACTIVATED, 'deactivated'),
+    )
+}
+
+
+def _create_slice(cursor, stage: str, catalog: str) -> int:
+    """
+    Срез TotalData во временную таблицу: одна строка на столбец, последняя по updated_at.
+    Строки выбираются из set_total_data_rows по ключам словарей: stand_id отсекает секции
+    при планировании, база и схема — целочисленные соединения вместо сравнения строк.
+    """
+    stand_id, catalog_ids = slice_ids(stage, catalog)
+    cursor.execute(f'''
+        CREATE TEMP TABLE {SYNC_STAGING_TABLE} ON COMMIT DROP AS
+        SELECT sl.*, {_SLICE_DIGEST} AS content_digest
+        FROM (
+            SELECT DISTINCT ON (dsc.name, dt.table_type, dt.name, td.column_name)
+                 dsc.name                                          AS schema_name
+                ,td.column_info ->> 'schema_description'           AS schema_description
+                ,dt.table_type
+                ,dt.name                                           AS table_name
+                ,td.table_comment
+                ,COALESCE(td.column_info ->> 'is_metadata', '') IN ('true', 't', 'YES', '1') AS is_metadata
+                ,td.column_name
+                ,td.data_type
+                ,td.is_nullable = 'YES'                            AS is_null
+                ,COALESCE(td.column_info ->> 'is_key', '') IN ('true', 't', 'YES', '1') AS is_key
+                ,CASE
+                    WHEN td.column_info ->> 'unique_together' ~ '^-?[0-9]{{1,9}}$'
+                    THEN (td.column_info ->> 'unique_together')::integer
+                END                                                AS unique_together
+                ,td.column_info ->> 'default'                      AS column_default
+                ,COALESCE(td.column_info -> 'description', jsonb_build_object('name', td.column_comment)) AS description
+                ,NULL::bigint                                      AS schema_id
+                ,NULL::bigint                                      AS type_id
+                ,NULL::bigint                                      AS table_id
+            FROM {_table(TotalDataRow)} AS td
+                JOIN {_table(TotalDataTable)} AS dt ON dt.id = td.table_id
+                JOIN {_table(TotalDataSchema)} AS dsc ON dsc.id = dt.schema_id
+            WHERE td.stand_id = %s
+              AND dsc.catalog_id = ANY(%s)
+              AND td.is_active
+              AND dsc.name IS NOT NULL
+              AND dt.name IS NOT NULL
+              AND td.column_name IS NOT NULL
+            ORDER BY dsc.name, dt.table_type, dt.name, td.column_name, td.updated_at DESC
+        ) AS sl
+    ''', [stand_id, catalog_ids])
+    rows = cursor.rowcount
+    cursor.execute(f'CREATE INDEX ON {SYNC_STAGING_TABLE} (table_id, column_name)')
+    cursor.execute(f'ANALYZE {SYNC_STAGING_TABLE}')
+    return rows
+
+
+def _acquire_lock(cursor, stage: str, catalog: str, base_id: int):
+    """
+    Транзакционные advisory-блокировки; снимаются при завершении транзакции.
+    Пара (стенд, база) — без ожидания: повторный запуск сразу получает SyncLocked.
+    DimDB — с ожиданием: стенды одной базы делят схемы и таблицы и синхронизируются по очереди.
+    """
+    cursor.execute(
+        'SELECT pg_try_advisory_xact_lock(%s, hashtext(%s))',
+        [SYNC_LOCK_CLASS, f'{stage}/{catalog}'],
+    )
+    if not cursor.fetchone()[0]:
+        raise SyncLocked(f'Синхронизация {stage}/{catalog} уже выполняется')
+    cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [SYNC_LOCK_CLASS + 1, base_id])
+
+
+def sync_stage_catalog(stage: str, catalog: str, dry_run: bool = False) -> SyncResult:
+    """
+    Синхронизирует схемы, таблицы и столбцы базы catalog стенда stage со срезом TotalData.
+    Одновременно для одной пары (stage, catalog) может выполняться только одна синхронизация.
+    Каждый запуск оставляет запись SyncRun со счётчиками и набор изменений SyncChange
+    (при dry_run набор изменений откатывается вместе с транзакцией, счётчики сохраняются).
+    Args:
+        stage: имя стенда (TotalData.stand, DimStage.name)
+        catalog: алиас базы (TotalData.table_catalog, LinkDB.alias)
+        dry_run: выполнить все шаги и откатить транзакцию
+    Returns:
+        SyncResult: число строк среза, затронутые строки и время по шагам
+    Raises:
+        SyncError: база не найдена; SyncLocked — пара уже синхронизируется
+    """
+    run = SyncRun.objects.create(stage=stage, catalog=catalog, dry_run=dry_run, started_at=timezone.now())
+    result = SyncResult(stage=stage, catalog=catalog, dry_run=dry_run, run_id=run.pk)
+    started = time.monotonic()
+    try:
+        link_db = resolve_link_db(stage, catalog)
+        run.link_db = link_db
+        result.link_db_id = link_db.pk
+        result.base_id = link_db.base_id
+        params = {
+            'base_id': link_db.base_id,
+            'stage_key': str(link_db.stage_id),
+            'stage_name': link_db.stage.name,
+            'run_id': run.pk,
+        }
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            _acquire_lock(cursor, stage, catalog, link_db.base_id)
+            step_started = time.monotonic()
+            result.rows = _create_slice(cursor, stage, catalog)
+            result.timings['slice'] = round(time.monotonic() - step_started, 3)
+
+            if result.rows == 0:
+                # Пустой срез — скорее всего, сбор не выполнялся; не деактивируем всю базу
+                logger.warning('Синхронизация %s/%s: срез TotalData пуст, шаги пропущены', stage, catalog)
+            else:
+                for name, sql, object_type in _steps():
+                    step_started = time.monotonic()
+                    cursor.execute(_tracked(sql, object_type) if object_type else sql, params)
+                    result.counts[name] = cursor.rowcount
+                    result.timings[name] = round(time.monotonic() - step_started, 3)
+                # Строки среза, для которых столбец уже совпадал по дайджесту и не перезаписывался
+                result.changes['columns_unchanged'] = max(
+                    result.rows - result.counts['columns_insert'] - result.counts['columns_update'], 0
+                )
+
+            cursor.execute(f'''
+                SELECT object_type, action, COUNT(*)
+                FROM {_table(SyncChange)}
+                WHERE run_id = %s
+                GROUP BY object_type, action
+            ''', [run.pk])
+            for object_type, action, count in cursor.fetchall():
+                result.changes[_RUN_COUNTERS[(object_type, action)]] = count
+
+            if dry_run:
+                transaction.set_rollback(True)
+    except Exception as exc:
+        run.status = SyncRun.STATUS_FAILED
+        run.error = str(exc).strip()
+        raise
+    else:
+        run.status = SyncRun.STATUS_DONE
+    finally:
+        result.seconds = round(time.monotonic() - started, 3)
+        run.finished_at = timezone.now()
+        run.rows_scanned = result.rows
+        run.timings = result.timings
+        for counter, count in result.changes.items():
+            setattr(run, counter, count)
+        run.save()
+
+    logger.info(
+        'Синхронизация %s/%s%s: строк среза %s, изменения %s, %s с',
+        stage, catalog, ' (dry-run)' if dry_run else '', result.rows, result.changes, result.seconds
+    )
+    if not dry_run and result.rows_touched:
+        transaction.on_commit(_refresh_catalog_flat)
+    return result
+
+
+def _refresh_catalog_flat():
+    # Синхронизация уже зафиксирована: ошибка обновления модели чтения её не отменяет,
+    # catalog_flat догонит следующий запуск или команда refresh_catalog_flat
+    try:
+        refresh_catalog_flat()
+    except Exception:
+        logger.exception('Не удалось обновить catalog_flat после синхронизации')
+
+
+def explain_sync(stage: str, catalog: str) -> List[Dict]:
+    """
+    EXPLAIN ANALYZE каждого шага синхронизации на текущих данных — для проверки, что шаги идут по индексам.
+    Шаги выполняются по-настоящему (следующие зависят от предыдущих), транзакция всегда откатывается.
+    Returns:
+        list: {'step', 'milliseconds', 'seq_scans', 'plan'} по шагам; seq_scans — полные просмотры таблиц моделей
+    """
+    watched = {
+        model._meta.db_table.strip('"').split('"."')[-1]
+        for model in (LinkSchema, LinkTable, LinkColumn, SyncChange)
+    }
+    link_db = resolve_link_db(stage, catalog)
+    report = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        _acquire_lock(cursor, stage, catalog, link_db.base_id)
+        run = SyncRun.objects.create(stage=stage, catalog=catalog, dry_run=True, started_at=timezone.now())
+        params = {
+            'base_id': link_db.base_id,
+            'stage_key': str(link_db.stage_id),
+            'stage_name': link_db.stage.name,
+            'run_id': run.pk,
+        }
+        _create_slice(cursor, stage, catalog)
+        for name, sql, object_type in _steps():
+            cursor.execute('EXPLAIN (ANALYZE, BUFFERS) ' + (_tracked(sql, object_type) if object_type else sql), params)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+            execution = _EXECUTION_TIME_RE.search(plan)
+            report.append({
+                'step': name,
+                'milliseconds': float(execution.group(1)) if execution else None,
+                'seq_scans': sorted({table for table in _SEQ_SCAN_RE.findall(plan) if table in watched}),
+                'plan': plan,
+            })
+        transaction.set_rollback(True)
+    return report
 
-def sync_database(name_db, stage_db):
-    with connection.cursor() as cursor:
-        p_1 = stage_db.name
-        p_2 = name_db.name
 
-        cursor.execute("SELECT my_dbmatch.sync_database(%s, %s);", [p_1, p_2])
\ No newline at end of file
+def sync_database(name_db, stage_db, dry_run: bool = False) -> SyncResult:
+    """Совместимая обёртка: name_db — LinkDB (или объект с name), stage_db — DimStage."""
+    catalog = getattr(name_db, 'alias', None) or name_db.name
+    return sync_stage_catalog(stage_db.name, catalog, dry_run=dry_run)
@@ -0,0 +1,182 @@
+# utils/total_data_bulk.py
+"""
+Пакетная запись TotalData:
+1) строки складываются чанками во временную таблицу с текстовыми полями TotalData
+2) словари стендов, баз, схем и таблиц пополняются из неё (utils.total_data_interning)
+3) одним INSERT ... SELECT ... ON CONFLICT (hash_address, stand_id) DO UPDATE строки пишутся в set_total_data_rows;
+   неизменившиеся (тот же content_digest) отсекаются до INSERT и считаются отдельно
+4) ключи всех строк пачки записываются одним наблюдением TotalDataObservation
+"""
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from django.db import connection, transaction
+
+from ..models import TotalData, TotalDataObservation
+from .total_data_interning import ROW_INSERT_COLUMNS, intern, resolve_sql, rows_table
+from .total_data_keys import ROW_DIGEST_COLUMNS, ROW_FIELDS, TOTAL_DATA_FIELDS, digest_sql
+from .total_data_observations import record_rows
+
+logger = logging.getLogger(__name__)
+
+# Размер чанка: 1000 строк по 15 параметров — компромисс между размером запроса и числом обращений к БД
+BULK_CHUNK_SIZE = 1000
+
+STAGE_TABLE = 'tmp_total_data_stage'
+
+# Столбцы временных таблиц загрузки: ключ и текстовые поля TotalData
+STAGE_COLUMNS = ('hash_address',) + TOTAL_DATA_FIELDS
+
+
+def _chunks(items: List, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _to_db_value(field: str, value):
+    """Приводит значение поля к виду, который ожидает столбец БД."""
+    if value is None:
+        # stand — ключ словаря стендов, NULL в нём недопустим (hash_address для None и '' одинаков)
+        return '' if field == 'stand' else None
+    if field == 'column_info':
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def total_data_table() -> str:
+    """Имя представления TotalData (set_total_data) в кавычках для сырого SQL."""
+    return connection.ops.quote_name(TotalData._meta.db_table)
+
+
+def create_stage_table(cursor, name: str = STAGE_TABLE):
+    """Временная таблица с типами столбцов TotalData; удаляется в конце транзакции."""
+    # Повторный вызов в той же транзакции (загрузка несколькими пачками) начинает с пустой таблицы
+    cursor.execute(f'DROP TABLE IF EXISTS {name}')
+    cursor.execute(
+        f'CREATE TEMP TABLE {name} ON COMMIT DROP AS '
+        f'SELECT {", ".join(STAGE_COLUMNS)} FROM {total_data_table()} WITH NO DATA'
+    )
+
+
+def insert_stage_rows(cursor, name: str, rows: List[Dict], chunk_size: int = BULK_CHUNK_SIZE):
+    """Складывает строки (поля TotalData + hash_address) во временную таблицу чанками."""
+    placeholders = ', '.join('%s::jsonb' if column == 'column_info' else '%s' for column in STAGE_COLUMNS)
+    for chunk in _chunks(rows, chunk_size):
+        params = []
+        for row in chunk:
+            params.append(row['hash_address'])
+            params.extend(_to_db_value(field, row.get(field)) for field in TOTAL_DATA_FIELDS)
+        cursor.execute(
+            f'INSERT INTO {name} ({", ".join(STAGE_COLUMNS)}) '
+            f'VALUES {", ".join(f"({placeholders})" for _ in chunk)}',
+            params,
+        )
+
+
+def upsert_conflict_sql() -> str:
+    """
+    Хвост INSERT ... AS t для set_total_data_rows: обновляет только изменившиеся строки.
+    Изменение определяется по дайджесту содержимого (TotalDataRow.content_digest) вместо сравнения всех полей.
+    Строки, для которых ничего не изменилось, не попадают в RETURNING.
+    """
+    excluded_digest = digest_sql([f'EXCLUDED.{column}' for column in ROW_DIGEST_COLUMNS])
+    set_clause = ', '.join(f'{column} = EXCLUDED.{column}' for column in ('table_id',) + ROW_FIELDS)
+    return (
+        f'ON CONFLICT (hash_address, stand_id) DO UPDATE SET '
+        f'{set_clause}, updated_at = EXCLUDED.updated_at, is_active = TRUE '
+        f'WHERE (t.content_digest, t.is_active) IS DISTINCT FROM ({excluded_digest}, TRUE) '
+        f'RETURNING (xmax = 0) AS inserted'
+    )
+
+
+def merge_stage(cursor, source: str, author_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Сливает временную таблицу source (STAGE_COLUMNS, hash_address уникален) в set_total_data_rows.
+    Активные строки с тем же дайджестом в INSERT не попадают вовсе:
+    даже ON CONFLICT DO UPDATE ... WHERE false блокирует строку и пишет xmax.
+    Returns:
+        dict: distinct / inserted / updated / unchanged
+    """
+    intern(cursor, source)
+    table = rows_table()
+    row_values = ', '.join(f's.{column}' for column in ROW_FIELDS)
+    incoming_digest = digest_sql(['ds.id', 'dt.id'] + [f's.{column}' for column in ROW_FIELDS])
+    cursor.execute(
+        f'''
+        WITH merged AS (
+            INSERT INTO {table} AS t ({", ".join(ROW_INSERT_COLUMNS)})
+            SELECT s.hash_address, NOW(), NOW(), TRUE, %s, ds.id, dt.id, {row_values}
+            FROM {source} AS s
+                {resolve_sql('s')}
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM {table} AS c
+                WHERE c.hash_address = s.hash_address
+                  AND c.stand_id = ds.id
+                  AND c.is_active
+                  AND c.content_digest = {incoming_digest}
+            )
+            {upsert_conflict_sql()}
+        )
+        SELECT
+            (SELECT COUNT(*) FROM {source}),
+            COUNT(*) FILTER (WHERE inserted),
+            COUNT(*) FILTER (WHERE NOT inserted)
+        FROM merged
+        ''',
+        [author_id],
+    )
+    distinct, inserted, updated = cursor.fetchone()
+    return {
+        'distinct': distinct,
+        'inserted': inserted,
+        'updated': updated,
+        'unchanged': distinct - inserted - updated,
+    }
+
+
+def upsert_total_data(
+        rows: Iterable[Dict],
+        author_id: Optional[int] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        observe: Optional[str] = TotalDataObservation.SOURCE_BULK,
+) -> Dict[str, int]:
+    """
+    Записывает строки TotalData пачками.
+    Args:
+        rows: словари с полями TotalData и заранее рассчитанным hash_address
+        author_id: id автора записей
+        chunk_size: количество строк в одном INSERT во временную таблицу
+        observe: источник для записи наблюдения строк (TotalDataObservation.SOURCE_*); None — не записывать
+    Returns:
+        dict: received / inserted / updated / unchanged / duplicates
+    """
+    # Дубли внутри пачки нельзя отдать в один ON CONFLICT — побеждает последняя строка
+    unique_rows = {}
+    received = 0
+    for row in rows:
+        received += 1
+        unique_rows[row['hash_address']] = row
+    unique_rows = list(unique_rows.values())
+
+    stats = {
+        'received': received,
+        'inserted': 0,
+        'updated': 0,
+        'unchanged': 0,
+        'duplicates': received - len(unique_rows),
+    }
+    with transaction.atomic(), connection.cursor() as cursor:
+        create_stage_table(cursor)
+        insert_stage_rows(cursor, STAGE_TABLE, unique_rows, chunk_size)
+        cursor.execute(f'ANALYZE {STAGE_TABLE}')
+        merged = merge_stage(cursor, STAGE_TABLE, author_id=author_id)
+        if observe:
+            # Неизменившиеся строки не перезаписываются — факт их наблюдения хранится отдельно
+            record_rows(unique_rows, observe, cursor)
+
+    for counter in ('inserted', 'updated', 'unchanged'):
+        stats[counter] = merged[counter]
+    logger.info('TotalData bulk upsert: %s', stats)
+    return stats
@@ -0,0 +1,101 @@
+# utils/total_data_delta.py
+"""
+Протокол дельта-синхронизации сборщиков:
+1) клиент присылает манифест пар (hash_address, row_digest) по стенду и каталогу
+2) сервер отвечает, какие строки нужно загрузить (новые и изменённые) и какие исчезли
+3) клиент загружает только дельту через пакетную загрузку
+4) сам манифест записывается наблюдением среза (TotalDataObservation)
+"""
+import logging
+from typing import Dict, Iterable, Sequence
+
+from django.db import transaction
+
+from ..models import TotalData, TotalDataObservation, TotalDataRow
+from .total_data_interning import slice_ids
+from .total_data_keys import TOTAL_DATA_FIELDS, build_row_digests
+from .total_data_observations import record_complete, record_rows
+
+logger = logging.getLogger(__name__)
+
+# Размер порции при чтении среза и деактивации исчезнувших строк
+DELTA_CHUNK_SIZE = 5000
+
+
+def _slice_queryset(stand: str, table_catalog: str):
+    return TotalData.objects.filter(stand=stand, table_catalog=table_catalog, is_active=True)
+
+
+def _iter_slice_digests(stand: str, table_catalog: str) -> Iterable[tuple]:
+    """Отдаёт (hash_address, row_digest) текущего среза порциями, не загружая его целиком."""
+    rows = _slice_queryset(stand, table_catalog).values('hash_address', *TOTAL_DATA_FIELDS)
+    batch = []
+    for row in rows.iterator(chunk_size=DELTA_CHUNK_SIZE):
+        batch.append(row)
+        if len(batch) >= DELTA_CHUNK_SIZE:
+            yield from zip((item['hash_address'] for item in batch), build_row_digests(batch))
+            batch = []
+    if batch:
+        yield from zip((item['hash_address'] for item in batch), build_row_digests(batch))
+
+
+def diff_manifest(
+        stand: str,
+        table_catalog: str,
+        items: Sequence[Sequence[str]],
+        deactivate_missing: bool = False,
+) -> Dict:
+    """
+    Сравнивает манифест клиента с сохранённым срезом.
+    Args:
+        stand: стенд
+        table_catalog: имя базы данных
+        items: пары [hash_address, row_digest]
+        deactivate_missing: пометить исчезнувшие строки неактивными
+    Returns:
+        dict: upload — ключи для загрузки, missing — ключи, которых больше нет у клиента
+    """
+    pending = {hash_address: digest for hash_address, digest in items}
+    missing = []
+    unchanged = 0
+
+    for hash_address, digest in _iter_slice_digests(stand, table_catalog):
+        client_digest = pending.get(hash_address)
+        if client_digest is None:
+            missing.append(hash_address)
+        elif client_digest == digest:
+            del pending[hash_address]
+            unchanged += 1
+
+    deactivated = 0
+    with transaction.atomic():
+        if deactivate_missing and missing:
+            # Напрямую в set_total_data_rows: UPDATE через представление вызывает триггер на каждую строку
+            stand_id, _ = slice_ids(stand, table_catalog)
+            for start in range(0, len(missing), DELTA_CHUNK_SIZE):
+                deactivated += TotalDataRow.objects.filter(
+                    stand_id=stand_id,
+                    hash_address__in=missing[start:start + DELTA_CHUNK_SIZE],
+                ).update(is_active=False)
+        # Манифест — полный список строк клиента: с деактивацией исчезнувших он подтверждает весь срез,
+        # без неё — только присланные ключи
+        if deactivate_missing:
+            record_complete(stand, table_catalog, TotalDataObservation.SOURCE_MANIFEST, len(items))
+        else:
+            record_rows(
+                [{'stand': stand, 'table_catalog': table_catalog, 'hash_address': hash_address}
+                 for hash_address, _ in items],
+                TotalDataObservation.SOURCE_MANIFEST,
+            )
+
+    result = {
+        'upload': list(pending),
+        'missing': missing,
+        'unchanged': unchanged,
+        'deactivated': deactivated,
+    }
+    logger.info(
+        'TotalData manifest %s/%s: upload=%s missing=%s unchanged=%s',
+        stand, table_catalog, len(result['upload']), len(missing), unchanged
+    )
+    return result
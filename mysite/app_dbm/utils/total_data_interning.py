@@ -0,0 +1,140 @@
+# utils/total_data_interning.py
+"""
+Интернирование повторяющихся полей TotalData:
+1) stand, group_catalog + table_catalog, table_schema, table_type + table_name хранятся один раз
+   в словарях TotalDataStand / TotalDataCatalog / TotalDataSchema / TotalDataTable
+2) строка set_total_data_rows (TotalDataRow) ссылается на них smallint stand_id и bigint table_id
+3) представление set_total_data (модель TotalData) собирает прежние столбцы обратно,
+   запись через него (ORM, API) выполняет INSTEAD OF-триггер (DDL — в миграции 0010);
+   пакетные загрузчики сначала пополняют словари из временной таблицы, затем пишут в set_total_data_rows напрямую
+NULL и '' в словарях различаются. Сравнение идёт парой (COALESCE(x, ''), x IS NULL): в отличие от
+IS NOT DISTINCT FROM, это равенства, и планировщик может соединять временную таблицу со словарями hash join.
+"""
+from typing import List, Optional, Tuple
+
+from django.db import connection
+
+from ..models import TotalDataCatalog, TotalDataRow, TotalDataSchema, TotalDataStand, TotalDataTable
+from .total_data_keys import DIMENSION_FIELDS, ROW_FIELDS
+
+# Порядок столбцов во всех INSERT в set_total_data_rows
+ROW_INSERT_COLUMNS = (
+    'hash_address', 'created_at', 'updated_at', 'is_active', 'author_id', 'stand_id', 'table_id',
+) + ROW_FIELDS
+
+
+def quoted_table(model) -> str:
+    """Имя таблицы модели в кавычках для сырого SQL."""
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def rows_table() -> str:
+    """Имя таблицы set_total_data_rows в кавычках."""
+    return quoted_table(TotalDataRow)
+
+
+def same_sql(left: str, right: str) -> str:
+    """Равенство с учётом NULL, пригодное для hash join."""
+    return f"COALESCE({left}, '') = COALESCE({right}, '') AND ({left} IS NULL) = ({right} IS NULL)"
+
+
+def _dimension_joins(alias: str, levels: int = 4) -> str:
+    """JOIN словарей к строкам alias с текстовыми полями TotalData: ds — стенд, dc — база, dsc — схема, dt — таблица."""
+    joins = [
+        f"JOIN {quoted_table(TotalDataStand)} AS ds ON ds.name = COALESCE({alias}.stand, '')",
+        f'JOIN {quoted_table(TotalDataCatalog)} AS dc ON dc.stand_id = ds.id '
+        f'AND {same_sql("dc.name", f"{alias}.table_catalog")} '
+        f'AND {same_sql("dc.group_catalog", f"{alias}.group_catalog")}',
+        f'JOIN {quoted_table(TotalDataSchema)} AS dsc ON dsc.catalog_id = dc.id '
+        f'AND {same_sql("dsc.name", f"{alias}.table_schema")}',
+        f'JOIN {quoted_table(TotalDataTable)} AS dt ON dt.schema_id = dsc.id '
+        f'AND {same_sql("dt.name", f"{alias}.table_name")} '
+        f'AND {same_sql("dt.table_type", f"{alias}.table_type")}',
+    ]
+    return '\n'.join(joins[:levels])
+
+
+def resolve_sql(alias: str) -> str:
+    """JOIN-ы, дающие строкам alias ds.id (stand_id) и dt.id (table_id); словари должны быть уже пополнены."""
+    return _dimension_joins(alias)
+
+
+def intern_sql(source: str) -> List[str]:
+    """
+    INSERT-ы недостающих значений словарей из таблицы source с текстовыми полями TotalData — сверху вниз.
+    Уже известные значения отсекаются NOT EXISTS до INSERT: ON CONFLICT DO NOTHING тратит значение
+    последовательности на каждую строку, а ключ стенда — smallint.
+    """
+    distinct = f'(SELECT DISTINCT {", ".join(DIMENSION_FIELDS)} FROM {source}) AS src'
+    stands = quoted_table(TotalDataStand)
+    catalogs = quoted_table(TotalDataCatalog)
+    schemas = quoted_table(TotalDataSchema)
+    tables = quoted_table(TotalDataTable)
+    return [
+        f'''
+        INSERT INTO {stands} (name)
+        SELECT DISTINCT COALESCE(src.stand, '')
+        FROM {distinct}
+        WHERE NOT EXISTS (SELECT 1 FROM {stands} AS d WHERE d.name = COALESCE(src.stand, ''))
+        ON CONFLICT DO NOTHING
+        ''',
+        f'''
+        INSERT INTO {catalogs} (stand_id, group_catalog, name)
+        SELECT DISTINCT ds.id, src.group_catalog, src.table_catalog
+        FROM {distinct}
+            {_dimension_joins('src', 1)}
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {catalogs} AS d
+            WHERE d.stand_id = ds.id
+              AND {same_sql('d.name', 'src.table_catalog')}
+              AND {same_sql('d.group_catalog', 'src.group_catalog')}
+        )
+        ON CONFLICT DO NOTHING
+        ''',
+        f'''
+        INSERT INTO {schemas} (catalog_id, name)
+        SELECT DISTINCT dc.id, src.table_schema
+        FROM {distinct}
+            {_dimension_joins('src', 2)}
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {schemas} AS d
+            WHERE d.catalog_id = dc.id AND {same_sql('d.name', 'src.table_schema')}
+        )
+        ON CONFLICT DO NOTHING
+        ''',
+        f'''
+        INSERT INTO {tables} (schema_id, table_type, name)
+        SELECT DISTINCT dsc.id, src.table_type, src.table_name
+        FROM {distinct}
+            {_dimension_joins('src', 3)}
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {tables} AS d
+            WHERE d.schema_id = dsc.id
+              AND {same_sql('d.name', 'src.table_name')}
+              AND {same_sql('d.table_type', 'src.table_type')}
+        )
+        ON CONFLICT DO NOTHING
+        ''',
+    ]
+
+
+def intern(cursor, source: str):
+    """Пополняет словари значениями из таблицы source."""
+    for sql in intern_sql(source):
+        cursor.execute(sql)
+
+
+def slice_ids(stand: str, table_catalog: str) -> Tuple[Optional[int], List[int]]:
+    """
+    Ключи среза (стенд, база) в словарях.
+    Returns:
+        tuple: (stand_id или None, id баз с этим именем на стенде — по одной на group_catalog)
+    """
+    catalogs = list(
+        TotalDataCatalog.objects
+        .filter(stand__name=stand or '', name=table_catalog)
+        .values_list('stand_id', 'id')
+    )
+    if not catalogs:
+        return None, []
+    return catalogs[0][0], [catalog_id for _, catalog_id in catalogs]
@@ -0,0 +1,116 @@
+# utils/total_data_keys.py
+"""
+Единый построитель ключа hash_address и дайджеста строки для TotalData.
+Используется моделью, API, загрузчиками и SQL-кодом — другого способа считать ключ нет.
+Ключ: SHA-256 от значений HASH_FIELDS, соединённых через '|' (None -> ''),
+что совпадает с _common.models.hash_calculate.
+Дайджест: SHA-256 от JSON-массива значений TOTAL_DATA_FIELDS
+(скаляры -> строка или null, column_info как есть; ключи объектов отсортированы,
+разделители ',' и ':' без пробелов, UTF-8 без экранирования).
+Дайджест содержимого в БД (content_digest TotalDataRow и LinkColumn) — другой: md5 над текстом
+значений столбцов, считается только в SQL выражением digest_sql.
+"""
+import hashlib
+import json
+from typing import Dict, List, Mapping, Sequence
+
+# Поля, однозначно определяющие столбец. data_type в ключ не входит:
+# смена типа столбца — это обновление записи, а не новый столбец.
+HASH_FIELDS = (
+    'stand', 'table_catalog', 'table_schema',
+    'table_type', 'table_name', 'column_name',
+)
+
+# Поля данных TotalData (без служебных полей BaseClass и ключа), порядок важен для дайджеста
+TOTAL_DATA_FIELDS = (
+    'stand', 'table_type', 'group_catalog', 'table_catalog',
+    'table_schema', 'table_name', 'table_comment', 'column_number',
+    'column_name', 'column_comment', 'data_type', 'is_nullable',
+    'is_auto', 'column_info',
+)
+
+# Повторяющиеся поля-измерения: в set_total_data_rows хранятся ссылками на словари (utils.total_data_interning)
+DIMENSION_FIELDS = (
+    'stand', 'group_catalog', 'table_catalog',
+    'table_schema', 'table_type', 'table_name',
+)
+
+# Поля строки, которые set_total_data_rows хранит как есть
+ROW_FIELDS = tuple(field for field in TOTAL_DATA_FIELDS if field not in DIMENSION_FIELDS)
+
+# Столбцы дайджеста содержимого set_total_data_rows: ссылки на словари однозначно заменяют поля-измерения
+ROW_DIGEST_COLUMNS = ('stand_id', 'table_id') + ROW_FIELDS
+
+
+def _as_text(values: Sequence) -> List[str]:
+    return ['' if value is None else str(value) for value in values]
+
+
+def build_hashes_from_columns(columns: Mapping[str, Sequence]) -> List[str]:
+    """
+    Считает ключи для столбцовых массивов.
+    Args:
+        columns: {имя поля: массив значений}, массивы одной длины; отсутствующее поле = None
+    Returns:
+        list: hash_address в порядке строк
+    """
+    size = max((len(columns.get(field) or ()) for field in HASH_FIELDS), default=0)
+    arrays = [_as_text(columns.get(field) or [None] * size) for field in HASH_FIELDS]
+    if any(len(array) != size for array in arrays):
+        raise ValueError('Массивы полей ключа должны быть одной длины')
+    sha256 = hashlib.sha256
+    return [
+        sha256('|'.join(parts).encode('utf-8')).hexdigest()
+        for parts in zip(*arrays)
+    ]
+
+
+def build_hashes(rows: Sequence[Mapping]) -> List[str]:
+    """Считает ключи для списка строк-словарей одним проходом по столбцам."""
+    columns: Dict[str, list] = {
+        field: [row.get(field) for row in rows]
+        for field in HASH_FIELDS
+    }
+    return build_hashes_from_columns(columns)
+
+
+def build_hash(row: Mapping) -> str:
+    """Ключ одной строки."""
+    return build_hashes([row])[0]
+
+
+def hash_sql(alias: str) -> str:
+    """SQL-выражение hash_address над строкой alias, совпадающее с build_hash."""
+    parts = ', '.join(f"COALESCE({alias}.{field}::text, '')" for field in HASH_FIELDS)
+    return f"encode(sha256(convert_to(concat_ws('|', {parts}), 'UTF8')), 'hex')"
+
+
+def digest_sql(expressions: Sequence[str]) -> str:
+    """
+    SQL-выражение дайджеста содержимого: md5 от текстовых значений, NULL отличается от ''.
+    Выражение IMMUTABLE, поэтому годится и для генерируемого столбца, и для сравнения
+    с ним значений, посчитанных над любым псевдонимом (EXCLUDED, срез, теневая таблица).
+    Args:
+        expressions: SQL-выражения значений в порядке полей дайджеста
+    """
+    parts = " || E'\\x1f' || ".join(f"COALESCE(({expression})::text, E'\\x1e')" for expression in expressions)
+    return f'md5({parts})'
+
+
+def _digest_value(field: str, value):
+    if value is None or field == 'column_info':
+        return value
+    return str(value)
+
+
+def build_row_digests(rows: Sequence[Mapping]) -> List[str]:
+    """Дайджесты содержимого строк: совпадают тогда и только тогда, когда совпадают данные."""
+    dumps = json.dumps
+    sha256 = hashlib.sha256
+    return [
+        sha256(dumps(
+            [_digest_value(field, row.get(field)) for field in TOTAL_DATA_FIELDS],
+            ensure_ascii=False, sort_keys=True, separators=(',', ':'),
+        ).encode('utf-8')).hexdigest()
+        for row in rows
+    ]
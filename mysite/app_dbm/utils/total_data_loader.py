@@ -0,0 +1,333 @@
+# utils/total_data_loader.py
+"""
+Потоковая загрузка выгрузок в TotalData:
+1) CSV передаётся в COPY во временную таблицу как есть, NDJSON — пачками через CSV-буфер
+2) hash_address считается в SQL выражением utils.total_data_keys.hash_sql
+3) строки без дублей ключа переносятся во временную таблицу полей TotalData и одним
+   INSERT ... SELECT ... ON CONFLICT сливаются в set_total_data_rows (utils.total_data_bulk.merge_stage)
+   или, в режиме replace, заменяют срезы через теневую таблицу (utils.total_data_snapshot),
+   а в режиме replace_stand — целиком заменяют секцию стенда (utils.total_data_partitions.swap_from_stage)
+Поддерживаются два формата столбцов: поля TotalData и выгрузка utils/select.sql.
+Выгрузка select.sql кодируется так же, как при сборе (utils.harvester): table_catalog — алиас LinkDB
+стенда с этим именем базы (при отсутствии — имя базы), is_nullable — 'YES'/'NO'.
+"""
+import csv
+import io
+import json
+import logging
+import re
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from django.db import connection, transaction
+
+from ..models import DimDB, DimStage, LinkDB, TotalDataObservation
+from .total_data_bulk import STAGE_TABLE, create_stage_table, merge_stage
+from .total_data_keys import TOTAL_DATA_FIELDS, hash_sql
+from .total_data_observations import record_table_sql
+from .total_data_partitions import SWAP_STAGE_TABLE, swap_from_stage
+from .total_data_snapshot import SNAPSHOT_TABLE, apply_snapshot, create_snapshot_table
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = 'tmp_total_data_load'
+
+# Столбцы выгрузки utils/select.sql
+SELECT_SQL_COLUMNS = (
+    'stage', 'db_version', 'db_name', 'db_description', 'schem_name', 'schem_description',
+    'tab_is_metadata', 'tab_type', 'tab_name', 'tab_description', 'col_date_create',
+    'col_type', 'col_columns', 'col_is_null', 'col_is_key', 'col_unique_together',
+    'col_default', 'col_description',
+)
+
+# Соответствие полей TotalData выражениям над выгрузкой select.sql (l — LinkDB из _link_db_join_sql)
+SELECT_SQL_MAPPING = {
+    'stand': 's.stage',
+    'table_type': 's.tab_type',
+    'group_catalog': 'l.base_name',
+    'table_catalog': 'COALESCE(l.alias, s.db_name)',
+    'table_schema': 's.schem_name',
+    'table_name': 's.tab_name',
+    'table_comment': 's.tab_description',
+    'column_number': 'NULL',
+    'column_name': 's.col_columns',
+    'column_comment': "NULLIF(s.col_description, '')::jsonb ->> 'name'",
+    'data_type': 's.col_type',
+    # col_is_null — boolean: в CSV приходит t/f, в NDJSON — true/false
+    'is_nullable': "CASE WHEN NULLIF(s.col_is_null, '')::boolean THEN 'YES' ELSE 'NO' END",
+    'is_auto': "CASE WHEN s.col_default LIKE 'nextval(%%' THEN 'YES' ELSE 'NO' END",
+    # col_date_create (now() на момент выгрузки) не берём: иначе каждая загрузка меняет дайджесты всех строк
+    'column_info': (
+        "jsonb_strip_nulls(jsonb_build_object("
+        "'db_version', s.db_version, "
+        "'db_description', s.db_description, "
+        "'schema_description', s.schem_description, "
+        "'is_metadata', s.tab_is_metadata, "
+        "'is_key', s.col_is_key, "
+        "'unique_together', s.col_unique_together, "
+        "'default', s.col_default, "
+        "'description', NULLIF(s.col_description, '')::jsonb))"
+    ),
+}
+
+LAYOUT_TOTAL_DATA = 'total_data'
+LAYOUT_SELECT_SQL = 'select_sql'
+
+_IDENTIFIER_RE = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+
+class LoaderError(Exception):
+    """Ошибка формата загружаемого файла."""
+
+
+def detect_layout(columns: Iterable[str]) -> str:
+    """Определяет формат выгрузки по набору столбцов."""
+    columns = set(columns)
+    if {'stage', 'db_name', 'col_columns'} <= columns:
+        return LAYOUT_SELECT_SQL
+    if {'table_catalog', 'column_name'} <= columns:
+        return LAYOUT_TOTAL_DATA
+    raise LoaderError(f'Не удалось определить формат по столбцам: {", ".join(sorted(columns))}')
+
+
+def _layout_columns(layout: str) -> tuple:
+    return SELECT_SQL_COLUMNS if layout == LAYOUT_SELECT_SQL else TOTAL_DATA_FIELDS
+
+
+def _layout_mapping(layout: str) -> Dict[str, str]:
+    if layout == LAYOUT_SELECT_SQL:
+        return SELECT_SQL_MAPPING
+    mapping = {field: f's.{field}' for field in TOTAL_DATA_FIELDS}
+    mapping['column_info'] = "NULLIF(s.column_info, '')::jsonb"
+    return mapping
+
+
+class _IterStream(io.RawIOBase):
+    """Файлоподобная обёртка над генератором строк для COPY FROM STDIN."""
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._buffer = b''
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks).encode('utf-8')
+            except StopIteration:
+                break
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _csv_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value
+
+
+def _ndjson_to_csv(lines: Iterable[str], columns: List[str], batch_size: int) -> Iterator[str]:
+    """Преобразует NDJSON в CSV пачками по batch_size строк."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            raise LoaderError(f'NDJSON: ошибка в строке {line_number}: {exc}')
+        writer.writerow([_csv_value(row.get(column)) for column in columns])
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def _link_db_join_sql(stand_sql: str) -> str:
+    """LinkDB стенда по имени базы из выгрузки select.sql: алиас и имя базы из справочника."""
+    table = connection.ops.quote_name
+    return f'''
+            LEFT JOIN LATERAL (
+                SELECT l.alias, b.name AS base_name
+                FROM {table(LinkDB._meta.db_table)} AS l
+                    JOIN {table(DimStage._meta.db_table)} AS st ON st.id = l.stage_id
+                    JOIN {table(DimDB._meta.db_table)} AS b ON b.id = l.base_id
+                WHERE l.name = s.db_name AND st.name = {stand_sql}
+                ORDER BY l.id
+                LIMIT 1
+            ) AS l ON TRUE'''
+
+
+def _create_staging(cursor, columns: List[str]):
+    column_defs = ', '.join(f'{connection.ops.quote_name(column)} text' for column in columns)
+    cursor.execute(
+        f'CREATE TEMP TABLE {STAGING_TABLE} (_line bigserial, {column_defs}) ON COMMIT DROP'
+    )
+
+
+def _dedup_sql(layout: str, stand: Optional[str]):
+    """CTE src/dedup: строки временной таблицы в полях TotalData с hash_address, последняя строка ключа побеждает."""
+    mapping = dict(_layout_mapping(layout))
+    params = []
+    if stand:
+        mapping['stand'] = '%s'
+        params.append(stand)
+    # stand — ключ словаря стендов и секционирования set_total_data_rows, NULL в нём недопустим
+    mapping['stand'] = f"COALESCE({mapping['stand']}, '')"
+    source_columns = ', '.join(f'{expression} AS {field}' for field, expression in mapping.items())
+    joins = ''
+    if layout == LAYOUT_SELECT_SQL:
+        joins = _link_db_join_sql('%s' if stand else 's.stage')
+        if stand:
+            params.append(stand)
+    sql = f'''
+        WITH src AS (
+            SELECT s._line, {source_columns}
+            FROM {STAGING_TABLE} AS s{joins}
+        ), dedup AS (
+            SELECT DISTINCT ON (hash_address) *
+            FROM (SELECT {hash_sql('src')} AS hash_address, src.* FROM src) AS h
+            ORDER BY hash_address, _line DESC
+        )'''
+    return sql, params
+
+
+def _stage_dedup(cursor, target: str, layout: str, stand: Optional[str]):
+    """Временная таблица COPY -> таблица target полей TotalData, по строке на ключ."""
+    dedup_sql, params = _dedup_sql(layout, stand)
+    data_columns = ', '.join(TOTAL_DATA_FIELDS)
+    cursor.execute(
+        f'''
+        INSERT INTO {target} (hash_address, {data_columns})
+        {dedup_sql}
+        SELECT hash_address, {data_columns}
+        FROM dedup
+        ''',
+        params,
+    )
+
+
+def _merge_staging(cursor, layout: str, stand: Optional[str], author_id: Optional[int]) -> Dict[str, int]:
+    create_stage_table(cursor)
+    _stage_dedup(cursor, STAGE_TABLE, layout, stand)
+    cursor.execute(f'ANALYZE {STAGE_TABLE}')
+    stats = merge_stage(cursor, STAGE_TABLE, author_id=author_id)
+    cursor.execute(record_table_sql(STAGE_TABLE, TotalDataObservation.SOURCE_LOAD, complete=False))
+    return stats
+
+
+def _replace_from_staging(cursor, layout: str, stand: Optional[str], author_id: Optional[int]) -> Dict[str, int]:
+    """Временная таблица COPY -> теневая таблица снимка -> замена срезов (utils.total_data_snapshot)."""
+    create_snapshot_table(cursor)
+    _stage_dedup(cursor, SNAPSHOT_TABLE, layout, stand)
+    return apply_snapshot(cursor, author_id=author_id)
+
+
+def _swap_from_staging(cursor, layout: str, stand: Optional[str], author_id: Optional[int]) -> Dict[str, int]:
+    """Временная таблица COPY -> таблица строк стенда -> подмена его секции (utils.total_data_partitions)."""
+    create_stage_table(cursor, SWAP_STAGE_TABLE)
+    _stage_dedup(cursor, SWAP_STAGE_TABLE, layout, stand)
+    return swap_from_stage(cursor, stand, SWAP_STAGE_TABLE, author_id=author_id)
+
+
+def load_total_data(
+        path: str,
+        file_format: str = 'csv',
+        stand: Optional[str] = None,
+        delimiter: str = ',',
+        author_id: Optional[int] = None,
+        batch_size: int = 10000,
+        replace: bool = False,
+        replace_stand: bool = False,
+) -> Dict[str, int]:
+    """
+    Загружает CSV/NDJSON файл в TotalData через COPY.
+    Args:
+        path: путь к файлу
+        file_format: 'csv' или 'ndjson'
+        stand: принудительное значение стенда (select.sql всегда отдаёт 'TST')
+        delimiter: разделитель CSV
+        author_id: id автора записей
+        batch_size: строк NDJSON в одном блоке, передаваемом в COPY
+        replace: файл — полный снимок; срезы (стенд, база) из файла заменяются целиком,
+            строки, которых в файле нет, деактивируются
+        replace_stand: файл — полный снимок стенда stand; секция стенда заменяется целиком,
+            строки, которых в файле нет, удаляются
+    Returns:
+        dict: received / distinct / inserted / updated / unchanged / duplicates / seconds
+            (+ deactivated / slices при replace; при replace_stand — received / distinct / duplicates /
+            replaced / seconds)
+    """
+    if len(delimiter) != 1 or delimiter in '"\'\n\r':
+        raise LoaderError(f'Недопустимый разделитель CSV: {delimiter!r}')
+    if replace_stand and replace:
+        raise LoaderError('replace и replace_stand несовместимы')
+    if replace_stand and not stand:
+        raise LoaderError('Для замены стенда укажите стенд')
+
+    started = time.monotonic()
+    with open(path, encoding='utf-8-sig', newline='') as source:
+        if file_format == 'csv':
+            header = next(csv.reader([source.readline()], delimiter=delimiter), [])
+            header = [column.strip().lower() for column in header]
+            stream = source
+            copy_options = f"FORMAT csv, DELIMITER '{delimiter}'"
+        elif file_format == 'ndjson':
+            first_line = source.readline()
+            try:
+                keys = json.loads(first_line).keys()
+            except (ValueError, AttributeError) as exc:
+                raise LoaderError(f'NDJSON: первая строка не является объектом: {exc}')
+            header = list(_layout_columns(detect_layout(keys)))
+            stream = _IterStream(_ndjson_to_csv(_chain_first(first_line, source), header, batch_size))
+            copy_options = 'FORMAT csv'
+        else:
+            raise LoaderError(f'Неизвестный формат: {file_format}')
+
+        bad_columns = [column for column in header if not _IDENTIFIER_RE.match(column)]
+        if bad_columns:
+            raise LoaderError(f'Недопустимые имена столбцов: {", ".join(bad_columns)}')
+        layout = detect_layout(header)
+        staging_columns = list(dict.fromkeys(_layout_columns(layout) + tuple(header)))
+        copy_columns = ', '.join(connection.ops.quote_name(column) for column in header)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            _create_staging(cursor, staging_columns)
+            cursor.copy_expert(
+                f'COPY {STAGING_TABLE} ({copy_columns}) FROM STDIN WITH ({copy_options})',
+                stream,
+            )
+            cursor.execute(f'SELECT COUNT(*) FROM {STAGING_TABLE}')
+            received = cursor.fetchone()[0]
+            if replace_stand:
+                merge = _swap_from_staging
+            else:
+                merge = _replace_from_staging if replace else _merge_staging
+            stats = merge(cursor, layout, stand, author_id)
+
+    stats['received'] = received
+    stats['duplicates'] = received - stats['distinct']
+    stats['seconds'] = round(time.monotonic() - started, 3)
+    logger.info('TotalData COPY load %s: %s', path, stats)
+    return stats
+
+
+def _chain_first(first_line: str, rest: Iterable[str]) -> Iterator[str]:
+    yield first_line
+    yield from rest
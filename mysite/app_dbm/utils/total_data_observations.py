@@ -0,0 +1,152 @@
+# utils/total_data_observations.py
+"""
+Учёт последнего наблюдения строк TotalData без перезаписи самих строк:
+1) каждая загрузка оставляет по записи TotalDataObservation на срез (стенд, база)
+2) полный снимок (замена снимком, манифест с деактивацией исчезнувших) — одна запись без ключей,
+   частичная загрузка — массив 8-байтовых ключей (первые 16 hex-символов hash_address)
+3) время последнего наблюдения строки — максимум из её updated_at (для активной строки),
+   последнего полного снимка среза и частичных наблюдений, содержащих её ключ
+4) время последнего наблюдения и наблюдения среза отдаёт API: GET total-data/observations/
+"""
+import datetime
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from django.db import connection
+
+from ..models import TotalData, TotalDataObservation
+
+logger = logging.getLogger(__name__)
+
+# Предел ключей в одном запросе last_seen через API
+LAST_SEEN_MAX_KEYS = 1000
+
+
+def row_key(hash_address: str) -> int:
+    """Ключ строки в наблюдении: первые 8 байт hash_address как знаковый bigint."""
+    return int.from_bytes(bytes.fromhex(hash_address[:16]), 'big', signed=True)
+
+
+def row_key_sql(expression: str) -> str:
+    """SQL-выражение ключа, совпадающее с row_key, над выражением hash_address."""
+    return f"('x' || left({expression}, 16))::bit(64)::bigint"
+
+
+def _table() -> str:
+    return connection.ops.quote_name(TotalDataObservation._meta.db_table)
+
+
+def record_rows(rows: Iterable[Mapping], source: str, cursor=None) -> int:
+    """
+    Частичное наблюдение: ключи переданных строк, по записи на срез (стенд, база).
+    Args:
+        rows: строки с полями stand, table_catalog и рассчитанным hash_address
+        source: TotalDataObservation.SOURCE_*
+        cursor: курсор текущей транзакции (по умолчанию — новый)
+    Returns:
+        int: число созданных записей
+    """
+    slices: Dict[tuple, set] = defaultdict(set)
+    for row in rows:
+        slices[(row.get('stand') or '', row.get('table_catalog'))].add(row_key(row['hash_address']))
+    if not slices:
+        return 0
+    params = []
+    for (stand, table_catalog), keys in slices.items():
+        params.extend((stand, table_catalog, source, len(keys), sorted(keys)))
+    values = ', '.join('(%s, %s, NOW(), %s, FALSE, %s, %s::bigint[])' for _ in slices)
+    sql = (
+        f'INSERT INTO {_table()} (stand, table_catalog, observed_at, source, complete, rows_seen, keys) '
+        f'VALUES {values}'
+    )
+    if cursor is None:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+    else:
+        cursor.execute(sql, params)
+    return len(slices)
+
+
+def record_table_sql(source_table: str, source: str, complete: bool) -> str:
+    """
+    INSERT наблюдений по всем срезам таблицы или CTE source_table (столбцы stand, table_catalog, hash_address).
+    Полный снимок ключи не хранит.
+    """
+    key = row_key_sql('hash_address')
+    keys = 'NULL' if complete else f'array_agg(DISTINCT {key} ORDER BY {key})'
+    return f'''
+        INSERT INTO {_table()} (stand, table_catalog, observed_at, source, complete, rows_seen, keys)
+        SELECT stand, table_catalog, NOW(), '{source}', {'TRUE' if complete else 'FALSE'}, COUNT(*), {keys}
+        FROM {source_table}
+        GROUP BY stand, table_catalog
+    '''
+
+
+def record_complete(stand: str, table_catalog: Optional[str], source: str, rows_seen: int) -> TotalDataObservation:
+    """Полный снимок среза: подтверждает все его активные строки."""
+    return TotalDataObservation.objects.create(
+        stand=stand or '',
+        table_catalog=table_catalog,
+        source=source,
+        complete=True,
+        rows_seen=rows_seen,
+    )
+
+
+def last_seen(stand: str, table_catalog: str, hash_addresses: Sequence[str]) -> Dict[str, datetime.datetime]:
+    """
+    Время последнего наблюдения строк среза.
+    Args:
+        stand: стенд
+        table_catalog: имя базы данных
+        hash_addresses: ключи строк
+    Returns:
+        dict: {hash_address: время}; строк, которых нет в TotalData, в ответе нет
+    """
+    if not hash_addresses:
+        return {}
+    table = connection.ops.quote_name(TotalData._meta.db_table)
+    observations = _table()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            SELECT
+                t.hash_address,
+                GREATEST(
+                    t.created_at,
+                    CASE WHEN t.is_active THEN t.updated_at END,
+                    (
+                        SELECT MAX(o.observed_at)
+                        FROM {observations} AS o
+                        WHERE o.stand = t.stand
+                          AND o.table_catalog = t.table_catalog
+                          AND o.complete
+                          AND (t.is_active OR o.observed_at < t.updated_at)
+                    ),
+                    (
+                        SELECT MAX(o.observed_at)
+                        FROM {observations} AS o
+                        WHERE o.stand = t.stand
+                          AND o.table_catalog = t.table_catalog
+                          AND o.keys @> ARRAY[{row_key_sql('t.hash_address')}]
+                    )
+                )
+            FROM {table} AS t
+            WHERE t.stand = %s
+              AND t.table_catalog = %s
+              AND t.hash_address = ANY(%s)
+            ''',
+            [stand, table_catalog, list(hash_addresses)],
+        )
+        return dict(cursor.fetchall())
+
+
+def slice_observations(stand: str, table_catalog: str, limit: int = 20) -> List[TotalDataObservation]:
+    """Последние наблюдения среза (без массивов ключей)."""
+    return list(
+        TotalDataObservation.objects
+        .filter(stand=stand, table_catalog=table_catalog)
+        .defer('keys')
+        .order_by('-observed_at')[:limit]
+    )
@@ -0,0 +1,283 @@
+# utils/total_data_partitions.py
+"""
+Секционирование хранения TotalData (set_total_data_rows) по стенду — PARTITION BY LIST (stand_id):
+1) у каждого стенда своя секция set_total_data_rows_<стенд>_<md5>, новые стенды попадают в секцию DEFAULT
+2) новая секция создаётся отдельной таблицей, строки стенда переносятся в неё из DEFAULT, затем ATTACH
+3) удаление стенда — DETACH и DROP секции вместо построчного DELETE
+4) полная замена стенда — загрузка в отдельную таблицу, не подключённую к set_total_data_rows,
+   затем DETACH прежней секции и ATTACH новой в той же транзакции: читатели видят стенд
+   целиком до замены или целиком после, во время загрузки прежняя секция доступна
+   (manage.py load_total_data --replace-stand)
+Загрузка, синхронизация и очистка по стенду затрагивают только его секцию.
+Первичный ключ таблицы — (hash_address, stand_id): ключ секционированной таблицы обязан включать stand_id.
+"""
+import hashlib
+import logging
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection, transaction
+
+from ..apps import db_schema
+from ..models import DimStage, TotalDataObservation, TotalDataRow, TotalDataStand
+from .total_data_bulk import BULK_CHUNK_SIZE, create_stage_table, insert_stage_rows
+from .total_data_interning import ROW_INSERT_COLUMNS, intern, resolve_sql
+from .total_data_keys import ROW_FIELDS
+from .total_data_observations import record_complete
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = 'set_total_data_rows_'
+DEFAULT_PARTITION = 'set_total_data_rows_default'
+
+SWAP_STAGE_TABLE = 'tmp_total_data_swap'
+# Суффикс загружаемой секции: с ним имя секции (до 59 символов) укладывается в 63 символа PostgreSQL
+SWAP_SUFFIX = '_new'
+
+
+class PartitionError(Exception):
+    """Ошибка управления секциями TotalData."""
+
+
+def partition_name(stand: str) -> str:
+    """Имя секции стенда: читаемая часть + md5, чтобы разные стенды не совпали после очистки имени."""
+    slug = re.sub(r'[^a-z0-9]+', '_', stand.lower()).strip('_')[:30]
+    return f'{PARTITION_PREFIX}{slug}_{hashlib.md5(stand.encode("utf-8")).hexdigest()[:8]}'
+
+
+def _parent() -> str:
+    return connection.ops.quote_name(TotalDataRow._meta.db_table)
+
+
+def _qualified(name: str) -> str:
+    return f'{connection.ops.quote_name(db_schema)}.{connection.ops.quote_name(name)}'
+
+
+def is_partitioned() -> bool:
+    """True, если set_total_data_rows уже секционирована."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT relkind = %s FROM pg_class WHERE oid = %s::regclass', ['p', _parent()])
+        row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def list_partitions() -> List[Dict]:
+    """
+    Секции set_total_data_rows.
+    Returns:
+        list: {'name', 'bound', 'rows', 'size'}; rows — оценка из pg_class.reltuples
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            '''
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), GREATEST(c.reltuples, 0)::bigint,
+                   pg_total_relation_size(c.oid)
+            FROM pg_inherits AS i
+                JOIN pg_class AS c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            ORDER BY c.relname
+            ''',
+            [_parent()],
+        )
+        return [
+            {'name': name, 'bound': bound, 'rows': rows, 'size': size}
+            for name, bound, rows, size in cursor.fetchall()
+        ]
+
+
+def _existing_names() -> set:
+    return {item['name'] for item in list_partitions()}
+
+
+def create_partition(stand: str) -> Tuple[str, Optional[int]]:
+    """
+    Создаёт секцию стенда и переносит в неё строки стенда из DEFAULT.
+    Returns:
+        tuple: (имя секции, перенесено строк; None — секция уже была)
+    """
+    if not is_partitioned():
+        raise PartitionError('set_total_data_rows не секционирована: примените миграции app_dbm')
+    name = partition_name(stand)
+    if name in _existing_names():
+        return name, None
+    stand_id = TotalDataStand.objects.get_or_create(name=stand)[0].pk
+
+    table = _qualified(name)
+    check = connection.ops.quote_name(f'{name}_stand_check')
+    # Генерируемые столбцы (content_digest) пересчитываются при вставке и в списке не нужны
+    columns = ', '.join(
+        connection.ops.quote_name(field.column)
+        for field in TotalDataRow._meta.concrete_fields
+        if not field.generated
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE {table} (LIKE {_parent()} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE)')
+        # CHECK, совпадающий с границей секции, избавляет ATTACH от проверки всех строк
+        cursor.execute(
+            f'ALTER TABLE {table} ADD CONSTRAINT {check} CHECK (stand_id IS NOT NULL AND stand_id = %s)',
+            [stand_id],
+        )
+        cursor.execute(
+            f'''
+            WITH moved AS (
+                DELETE FROM {_qualified(DEFAULT_PARTITION)} WHERE stand_id = %s RETURNING {columns}
+            )
+            INSERT INTO {table} ({columns}) SELECT {columns} FROM moved
+            ''',
+            [stand_id],
+        )
+        moved = cursor.rowcount
+        cursor.execute(f'ALTER TABLE {_parent()} ATTACH PARTITION {table} FOR VALUES IN (%s)', [stand_id])
+        cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT {check}')
+    logger.info('TotalData: секция %s для стенда %s, перенесено строк %s', name, stand, moved)
+    return name, moved
+
+
+def drop_partition(stand: str) -> Optional[str]:
+    """
+    Удаляет секцию стенда вместе с данными (DETACH + DROP).
+    Returns:
+        str: имя удалённой секции или None, если секции не было
+    """
+    name = partition_name(stand)
+    if name not in _existing_names():
+        return None
+    table = _qualified(name)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {_parent()} DETACH PARTITION {table}')
+        cursor.execute(f'DROP TABLE {table}')
+    logger.info('TotalData: секция %s стенда %s удалена', name, stand)
+    return name
+
+
+def ensure_partitions(stands: Optional[Iterable[str]] = None) -> List[Tuple[str, str, int]]:
+    """
+    Создаёт недостающие секции.
+    Args:
+        stands: стенды; по умолчанию — все DimStage и все стенды, чьи строки лежат в DEFAULT
+    Returns:
+        list: (стенд, имя секции, перенесено строк) по созданным секциям
+    """
+    if stands is None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'''
+                SELECT ds.name
+                FROM {connection.ops.quote_name(TotalDataStand._meta.db_table)} AS ds
+                WHERE EXISTS (SELECT 1 FROM {_qualified(DEFAULT_PARTITION)} AS d WHERE d.stand_id = ds.id)
+                '''
+            )
+            stands = {row[0] for row in cursor.fetchall()}
+        stands |= set(DimStage.objects.values_list('name', flat=True))
+
+    created = []
+    for stand in sorted(set(stands)):
+        name, moved = create_partition(stand)
+        if moved is not None:
+            created.append((stand, name, moved))
+    return created
+
+
+def swap_from_stage(cursor, stand: str, stage_table: str, author_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Заменяет секцию стенда строками временной таблицы stage_table (create_stage_table, по строке на ключ)
+    в текущей транзакции и записывает полный снимок каждого среза (стенд, база) в наблюдения.
+    Returns:
+        dict: distinct (строк в новой секции) / replaced (строк в прежней секции)
+    """
+    if not is_partitioned():
+        raise PartitionError('set_total_data_rows не секционирована: примените миграции app_dbm')
+    cursor.execute(f'SELECT COUNT(*) FROM {stage_table} WHERE stand IS DISTINCT FROM %s', [stand])
+    foreign = cursor.fetchone()[0]
+    if foreign:
+        raise PartitionError(f'Строк другого стенда: {foreign}, заменяется только стенд {stand!r}')
+
+    name = partition_name(stand)
+    table = _qualified(name)
+    new_table = _qualified(name + SWAP_SUFFIX)
+    check = connection.ops.quote_name(f'{name}_stand_check')
+    row_values = ', '.join(f's.{column}' for column in ROW_FIELDS)
+
+    stand_id = TotalDataStand.objects.get_or_create(name=stand)[0].pk
+    intern(cursor, stage_table)
+
+    # Загрузка: таблица не подключена к set_total_data_rows, индексы строятся до подмены
+    cursor.execute(f'DROP TABLE IF EXISTS {new_table}')
+    cursor.execute(f'CREATE TABLE {new_table} (LIKE {_parent()} INCLUDING ALL)')
+    cursor.execute(
+        f'ALTER TABLE {new_table} ADD CONSTRAINT {check} CHECK (stand_id IS NOT NULL AND stand_id = %s)',
+        [stand_id],
+    )
+    cursor.execute(
+        f'''
+        INSERT INTO {new_table} ({", ".join(ROW_INSERT_COLUMNS)})
+        SELECT s.hash_address, NOW(), NOW(), TRUE, %s, ds.id, dt.id, {row_values}
+        FROM {stage_table} AS s
+            {resolve_sql('s')}
+        ''',
+        [author_id],
+    )
+    distinct = cursor.rowcount
+    cursor.execute(f'ANALYZE {new_table}')
+
+    # Подмена: блокировки set_total_data_rows берутся только здесь и держатся до конца транзакции
+    if name in _existing_names():
+        cursor.execute(f'SELECT count(*) FROM {table}')
+        replaced = cursor.fetchone()[0]
+        cursor.execute(f'ALTER TABLE {_parent()} DETACH PARTITION {table}')
+        cursor.execute(f'DROP TABLE {table}')
+    else:
+        # Секции не было: строки стенда лежат в DEFAULT и помешали бы ATTACH
+        cursor.execute(f'DELETE FROM {_qualified(DEFAULT_PARTITION)} WHERE stand_id = %s', [stand_id])
+        replaced = cursor.rowcount
+    cursor.execute(f'ALTER TABLE {new_table} RENAME TO {connection.ops.quote_name(name)}')
+    cursor.execute(f'ALTER TABLE {_parent()} ATTACH PARTITION {table} FOR VALUES IN (%s)', [stand_id])
+    cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT {check}')
+
+    # Новая секция — полный снимок стенда: подтверждает все строки каждого его среза
+    cursor.execute(f'SELECT table_catalog, COUNT(*) FROM {stage_table} GROUP BY table_catalog')
+    for table_catalog, rows_seen in cursor.fetchall():
+        record_complete(stand, table_catalog, TotalDataObservation.SOURCE_SNAPSHOT, rows_seen)
+
+    logger.info('TotalData: секция %s стенда %s заменена, строк %s (было %s)', name, stand, distinct, replaced)
+    return {'distinct': distinct, 'replaced': replaced}
+
+
+def swap_partition(
+        stand: str,
+        rows: Iterable[Dict],
+        author_id: Optional[int] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+) -> Dict[str, int]:
+    """
+    Заменяет все строки стенда подменой секции. В отличие от replace_snapshot (utils.total_data_snapshot),
+    который пишет отличия по срезам (стенд, база) и деактивирует пропавшие строки, стенд заменяется
+    целиком: строки, которых нет в rows, удаляются вместе с прежней секцией.
+    Args:
+        stand: стенд; у всех строк rows поле stand должно совпадать с ним
+        rows: полный снимок стенда — словари с полями TotalData и заранее рассчитанным hash_address
+        author_id: id автора записей
+        chunk_size: строк в одном INSERT во временную таблицу
+    Returns:
+        dict: received / distinct / duplicates / replaced (строк в прежней секции) / seconds
+    """
+    started = time.monotonic()
+    unique_rows = {}
+    received = 0
+    for row in rows:
+        received += 1
+        if (row.get('stand') or '') != stand:
+            raise PartitionError(f'Строка {row["hash_address"]} относится к стенду {row.get("stand")!r}, а не {stand!r}')
+        unique_rows[row['hash_address']] = row
+    unique_rows = list(unique_rows.values())
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        create_stage_table(cursor, SWAP_STAGE_TABLE)
+        insert_stage_rows(cursor, SWAP_STAGE_TABLE, unique_rows, chunk_size)
+        stats = swap_from_stage(cursor, stand, SWAP_STAGE_TABLE, author_id=author_id)
+
+    stats['received'] = received
+    stats['duplicates'] = received - stats['distinct']
+    stats['seconds'] = round(time.monotonic() - started, 3)
+    return stats
@@ -0,0 +1,125 @@
+# utils/total_data_snapshot.py
+"""
+Режим полной замены среза TotalData снимком сборщика (replace snapshot):
+1) снимок загружается в теневую временную таблицу (hash_address + поля TotalData)
+2) срезы (стенд, база), попавшие в снимок, сравниваются с теневой таблицей запросами над множествами
+3) в одной транзакции пишутся только отличия: новые и изменённые строки — upsert
+   (utils.total_data_bulk.merge_stage), строки среза, которых нет в снимке, — деактивация
+Читатели видят срез либо целиком до замены, либо целиком после.
+"""
+import logging
+import time
+from typing import Dict, Iterable, Optional
+
+from django.db import connection, transaction
+
+from ..models import TotalDataCatalog, TotalDataObservation, TotalDataSchema, TotalDataStand, TotalDataTable
+from .total_data_bulk import BULK_CHUNK_SIZE, create_stage_table, insert_stage_rows, merge_stage
+from .total_data_interning import quoted_table, rows_table
+from .total_data_observations import record_table_sql
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TABLE = 'tmp_total_data_snapshot'
+
+# Первый ключ advisory-блокировки замены среза: (SNAPSHOT_LOCK_CLASS, hashtext('<стенд>/<база>'))
+SNAPSHOT_LOCK_CLASS = 7320
+
+
+def create_snapshot_table(cursor):
+    """Теневая таблица с типами столбцов TotalData; удаляется в конце транзакции."""
+    create_stage_table(cursor, SNAPSHOT_TABLE)
+
+
+def apply_snapshot(cursor, author_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Заменяет срезы (стенд, база) из теневой таблицы. Вызывается внутри транзакции.
+    Args:
+        cursor: курсор транзакции, в которой заполнена теневая таблица
+        author_id: id автора записей
+    Returns:
+        dict: distinct / inserted / updated / unchanged / deactivated / slices
+    """
+    cursor.execute(f'CREATE UNIQUE INDEX ON {SNAPSHOT_TABLE} (hash_address)')
+    cursor.execute(f'ANALYZE {SNAPSHOT_TABLE}')
+    cursor.execute(f'SELECT DISTINCT stand, table_catalog FROM {SNAPSHOT_TABLE} ORDER BY 1, 2')
+    slices = cursor.fetchall()
+    # Один срез не заменяют два процесса сразу; порядок блокировок фиксирован — без взаимных блокировок
+    for stand, table_catalog in slices:
+        cursor.execute(
+            'SELECT pg_advisory_xact_lock(%s, hashtext(%s))',
+            [SNAPSHOT_LOCK_CLASS, f'{stand}/{table_catalog}'],
+        )
+
+    stats = merge_stage(cursor, SNAPSHOT_TABLE, author_id=author_id)
+
+    deactivated = 0
+    # Срез — база с именем table_catalog на стенде (при любом group_catalog); словари уже пополнены снимком
+    cursor.execute(
+        f'''
+        SELECT dc.stand_id, dc.id
+        FROM {quoted_table(TotalDataCatalog)} AS dc
+            JOIN {quoted_table(TotalDataStand)} AS ds ON ds.id = dc.stand_id
+            JOIN (SELECT DISTINCT stand, table_catalog FROM {SNAPSHOT_TABLE}) AS p
+                ON p.stand = ds.name AND p.table_catalog = dc.name
+        '''
+    )
+    catalogs = cursor.fetchall()
+    if catalogs:
+        # stand_id = ANY(...) — отсечение секций при планировании, без него UPDATE просматривает все стенды
+        cursor.execute(
+            f'''
+            UPDATE {rows_table()} AS t
+            SET is_active = FALSE, updated_at = NOW()
+            FROM {quoted_table(TotalDataTable)} AS dt
+                JOIN {quoted_table(TotalDataSchema)} AS dsc ON dsc.id = dt.schema_id
+            WHERE t.stand_id = ANY(%s)
+              AND dt.id = t.table_id
+              AND dsc.catalog_id = ANY(%s)
+              AND t.is_active
+              AND NOT EXISTS (SELECT 1 FROM {SNAPSHOT_TABLE} AS s WHERE s.hash_address = t.hash_address)
+            ''',
+            [sorted({stand_id for stand_id, _ in catalogs}), [catalog_id for _, catalog_id in catalogs]],
+        )
+        deactivated = cursor.rowcount
+
+    # Полный снимок подтверждает все строки среза — одна запись на срез, без ключей
+    cursor.execute(record_table_sql(SNAPSHOT_TABLE, TotalDataObservation.SOURCE_SNAPSHOT, complete=True))
+
+    stats['deactivated'] = deactivated
+    stats['slices'] = len(slices)
+    return stats
+
+
+def replace_snapshot(
+        rows: Iterable[Dict],
+        author_id: Optional[int] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+) -> Dict[str, int]:
+    """
+    Заменяет срезы (стенд, база), присутствующие в rows, одной транзакцией.
+    Args:
+        rows: полный снимок — словари с полями TotalData и заранее рассчитанным hash_address
+        author_id: id автора записей
+        chunk_size: строк в одном INSERT в теневую таблицу
+    Returns:
+        dict: received / distinct / inserted / updated / unchanged / deactivated / slices / duplicates / seconds
+    """
+    started = time.monotonic()
+    unique_rows = {}
+    received = 0
+    for row in rows:
+        received += 1
+        unique_rows[row['hash_address']] = row
+    unique_rows = list(unique_rows.values())
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        create_snapshot_table(cursor)
+        insert_stage_rows(cursor, SNAPSHOT_TABLE, unique_rows, chunk_size)
+        stats = apply_snapshot(cursor, author_id=author_id)
+
+    stats['received'] = received
+    stats['duplicates'] = received - len(unique_rows)
+    stats['seconds'] = round(time.monotonic() - started, 3)
+    logger.info('TotalData replace snapshot: %s', stats)
+    return stats
@@ -0,0 +1,242 @@
+# utils/total_data_validation.py
+"""
+Пакетная проверка строк TotalData для bulk-загрузки — по столбцам, без полей DRF на каждую строку:
+1) строки-не-словари отсеиваются сразу
+2) каждое поле проверяется по столбцу значений всей пачки, повторяющиеся значения — один раз;
+   построчно разбираются только JSON-строки column_info и значения с нарушениями
+3) обязательные поля ключа и data_type проверяются только у строк без ошибок в полях
+4) строки-результаты собираются только для пачки без ошибок: с ошибками она в загрузку не идёт
+Правила и тексты ошибок совпадают с TotalDataSerializer (проверяется командой
+benchmark_total_data_validation), ошибки возвращаются по номерам строк.
+"""
+import json
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.core.validators import ProhibitNullCharactersValidator
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from .total_data_keys import HASH_FIELDS, TOTAL_DATA_FIELDS
+
+# Обязательные поля (как TotalDataSerializer.validate): поля хэша и отдельно data_type
+REQUIRED_FIELDS = HASH_FIELDS
+CHAR_FIELDS = tuple(field for field in TOTAL_DATA_FIELDS if field not in ('column_number', 'column_info'))
+CHAR_MAX_LENGTH = 255
+
+_NONE_TYPE = type(None)
+_STR_OR_NONE = {str, _NONE_TYPE}
+_INT_OR_STR_OR_NONE = {int, str, _NONE_TYPE}
+_RE_DECIMAL = serializers.IntegerField.re_decimal
+_INT_MAX_STRING_LENGTH = serializers.IntegerField.MAX_STRING_LENGTH
+_JSON_DECODER = json.JSONDecoder()
+# Пробельные символы JSON: их json.loads пропускает по краям строки
+_JSON_WHITESPACE = ' \t\n\r'
+
+
+def _messages() -> Dict[str, str]:
+    """Тексты ошибок DRF в активном языке — те же, что отдаёт сериализатор."""
+    char = serializers.CharField(max_length=CHAR_MAX_LENGTH).error_messages
+    integer = serializers.IntegerField().error_messages
+    return {
+        'dict': str(serializers.Serializer.default_error_messages['invalid']),
+        'string': str(char['invalid']),
+        'max_length': str(char['max_length']).format(max_length=CHAR_MAX_LENGTH),
+        'null_characters': str(ProhibitNullCharactersValidator.message),
+        'integer': str(integer['invalid']),
+        'integer_length': str(integer['max_string_length']),
+        'negative': 'column_number не может быть отрицательным',
+        'json': 'column_info должен быть валидным JSON',
+        'json_type': 'column_info должен быть JSON-объектом, массивом или строкой с JSON',
+        'required': 'Обязательны поля для хэша: {}',
+        'data_type': 'Обязательно поле data_type',
+    }
+
+
+def _char_column(field: str, values: list, indexes: list, errors, messages) -> list:
+    # Значения столбца сильно повторяются (стенд, база, схема, таблица): проверяются только различные
+    try:
+        unique = set(values)
+    except TypeError:
+        unique = None
+    if unique is None or not set(map(type, unique)) <= _STR_OR_NONE:
+        # Редкий случай: числа приводятся к строке, прочие типы — ошибка
+        values = list(values)
+        for position, value in enumerate(values):
+            if value is None or type(value) is str:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+                errors[indexes[position]][field] = [messages['string']]
+                values[position] = None
+            else:
+                values[position] = str(value)
+        unique = set(values)
+
+    unique.discard(None)
+    stripped = {value: value.strip() for value in unique}
+    if all(value == text for value, text in stripped.items()):
+        # Обрезать нечего — столбец остаётся как есть
+        result = values
+    else:
+        # None в словаре нет — dict.get оставляет его None
+        result = list(map(stripped.get, values))
+    texts = stripped.values()
+
+    # Длина и символ NUL проверяются по всему столбцу встроенными функциями, по значениям — только при нарушении
+    if (texts and max(map(len, texts)) > CHAR_MAX_LENGTH) or '\x00' in ''.join(texts):
+        max_length, null_characters = messages['max_length'], messages['null_characters']
+        invalid = {}
+        for value in texts:
+            problems = []
+            if len(value) > CHAR_MAX_LENGTH:
+                problems.append(max_length)
+            if '\x00' in value:
+                problems.append(null_characters)
+            if problems:
+                invalid[value] = problems
+        for position, value in enumerate(result):
+            if value in invalid:
+                errors[indexes[position]][field] = list(invalid[value])
+    return result
+
+
+def _integer_value(value, messages) -> Tuple[Optional[int], Optional[str]]:
+    """Одно значение column_number как IntegerField: (число или None, текст ошибки или None)."""
+    if value is None or type(value) is int:
+        return value, (messages['negative'] if value is not None and value < 0 else None)
+    if isinstance(value, str) and len(value) > _INT_MAX_STRING_LENGTH:
+        return None, messages['integer_length']
+    try:
+        # _RE_DECIMAL отрезает только хвост с точкой: строку без точки int() разбирает так же
+        if type(value) is str and '.' not in value:
+            value = int(value)
+        else:
+            value = int(_RE_DECIMAL.sub('', str(value)))
+    except (ValueError, TypeError):
+        return None, messages['integer']
+    return value, (messages['negative'] if value < 0 else None)
+
+
+def _integer_column(field: str, values: list, indexes: list, errors, messages) -> list:
+    kinds = set(map(type, values))
+    if kinds <= {int, _NONE_TYPE}:
+        numbers = [value for value in values if value is not None] if _NONE_TYPE in kinds else values
+        if not numbers or min(numbers) >= 0:
+            return values
+
+    if kinds <= _INT_OR_STR_OR_NONE:
+        # Номера столбцов повторяются: каждое различное значение разбирается один раз.
+        # Без bool и float ключи словаря не совпадают у значений разных типов (1 и '1' различны)
+        numbers, problems = {}, {}
+        for value in set(values):
+            numbers[value], problem = _integer_value(value, messages)
+            if problem:
+                problems[value] = problem
+        result = list(map(numbers.__getitem__, values))
+        if problems:
+            for position, value in enumerate(values):
+                if value in problems:
+                    errors[indexes[position]][field] = [problems[value]]
+        return result
+
+    result = []
+    append = result.append
+    for index, value in zip(indexes, values):
+        value, problem = _integer_value(value, messages)
+        if problem:
+            errors[index][field] = [problem]
+        append(value)
+    return result
+
+
+def _json_column(field: str, values: list, indexes: list, errors, messages) -> list:
+    # Объекты, массивы и None проходят как есть; разбираются только строки.
+    # raw_decode по обрезанной строке — то же, что json.loads, но без его обёрток на каждое значение
+    result = list(values)
+    for position, value in enumerate(values):
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        if isinstance(value, str):
+            text = value.strip(_JSON_WHITESPACE)
+            try:
+                parsed, end = _JSON_DECODER.raw_decode(text)
+            except ValueError:
+                end = -1
+            if end == len(text):
+                result[position] = parsed
+            else:
+                errors[indexes[position]][field] = [messages['json']]
+                result[position] = None
+        else:
+            errors[indexes[position]][field] = [messages['json_type']]
+            result[position] = None
+    return result
+
+
+_COLUMN_VALIDATORS = {field: _char_column for field in CHAR_FIELDS}
+_COLUMN_VALIDATORS['column_number'] = _integer_column
+_COLUMN_VALIDATORS['column_info'] = _json_column
+
+
+def validate_total_data_rows(payload: Sequence) -> Tuple[List[Dict], Dict[int, Dict[str, List[str]]]]:
+    """
+    Проверяет пачку строк TotalData целиком.
+    Args:
+        payload: список строк из тела запроса
+    Returns:
+        tuple: (проверенные строки с полями TOTAL_DATA_FIELDS, {номер строки: {поле: [ошибки]}});
+            при наличии ошибок пачка в загрузку не идёт и список строк пуст
+    """
+    messages = _messages()
+    errors: Dict[int, Dict[str, List[str]]] = defaultdict(dict)
+
+    indexes, items = [], []
+    for index, item in enumerate(payload):
+        if isinstance(item, dict):
+            indexes.append(index)
+            items.append(item)
+        else:
+            errors[index][api_settings.NON_FIELD_ERRORS_KEY] = [
+                messages['dict'].format(datatype=type(item).__name__)
+            ]
+
+    columns = {}
+    for field in TOTAL_DATA_FIELDS:
+        values = [item.get(field) for item in items]
+        columns[field] = _COLUMN_VALIDATORS[field](field, values, indexes, errors, messages)
+
+    required = [columns[field] for field in REQUIRED_FIELDS]
+    for position, (data_type, *values) in enumerate(zip(columns['data_type'], *required)):
+        if (data_type and all(values)) or indexes[position] in errors:
+            continue
+        missing = [field for field, value in zip(REQUIRED_FIELDS, values) if not value]
+        if missing:
+            errors[indexes[position]]['error'] = [messages['required'].format(', '.join(missing))]
+        if not data_type:
+            errors[indexes[position]]['data_type'] = [messages['data_type']]
+
+    if errors or not items:
+        return [], dict(errors)
+    # Словарь с ключами-константами собирается заметно быстрее dict(zip(...)) на каждую строку
+    return [
+        {
+            'stand': stand,
+            'table_type': table_type,
+            'group_catalog': group_catalog,
+            'table_catalog': table_catalog,
+            'table_schema': table_schema,
+            'table_name': table_name,
+            'table_comment': table_comment,
+            'column_number': column_number,
+            'column_name': column_name,
+            'column_comment': column_comment,
+            'data_type': data_type,
+            'is_nullable': is_nullable,
+            'is_auto': is_auto,
+            'column_info': column_info,
+        }
+        for (
+            stand, table_type, group_catalog, table_catalog, table_schema, table_name, table_comment,
+            column_number, column_name, column_comment, data_type, is_nullable, is_auto, column_info,
+        ) in zip(*(columns[field] for field in TOTAL_DATA_FIELDS))
+    ], {}
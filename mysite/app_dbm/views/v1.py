@@ -2,11 +2,13 @@
 
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status, filters
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
-from django.shortcuts import get_list_or_404
+from django.shortcuts import get_list_or_404, get_object_or_404
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiParameter,
@@ -17,16 +19,24 @@ from drf_spectacular.utils import (
 from ..models import (
     DimStage, DimDB, LinkDB, LinkSchema,
     LinkTable, LinkColumn, DimColumnName,
-    DimTypeLink, LinkColumnColumn, LinkColumnName, TotalData
+    DimTypeLink, LinkColumnColumn, LinkColumnName, TotalData, IngestJob
 )
 from ..serializers import (
     DimStageSerializer, DimDBSerializer, LinkDBSerializer,
     LinkSchemaSerializer, LinkTableSerializer, LinkColumnSerializer,
     DimColumnNameSerializer, DimTypeLinkSerializer,
     LinkColumnColumnSerializer, LinkColumnNameSerializer,
-    TotalDataSerializer
+    TotalDataSerializer, TotalDataManifestSerializer, IngestJobSerializer, TotalDataObservationSerializer
 )
+from ..parsers import DecompressingJSONParser, DecompressingNDJSONParser
 from ..permissions import TotalDataPermissions, IsDBA, IsAnalyst
+from ..utils.ingest_jobs import enqueue_ingest_job
+from ..utils.total_data_bulk import upsert_total_data
+from ..utils.total_data_delta import diff_manifest
+from ..utils.total_data_keys import build_hashes
+from ..utils.total_data_observations import LAST_SEEN_MAX_KEYS, last_seen, slice_observations
+from ..utils.total_data_snapshot import replace_snapshot
+from ..utils.total_data_validation import validate_total_data_rows
 
 # === Базовый класс для справочников ===
 
@@ -152,6 +162,9 @@ class TotalDataViewSet(ModelViewSet):
     queryset = TotalData.objects.all()
     serializer_class = TotalDataSerializer
     permission_classes = [TotalDataPermissions]
+    # JSON и NDJSON, в том числе со сжатием Content-Encoding: gzip / deflate / zstd, перед парсерами
+    # по умолчанию: формы и multipart (включая формы browsable API) разбираются как раньше
+    parser_classes = [DecompressingJSONParser, DecompressingNDJSONParser, *api_settings.DEFAULT_PARSER_CLASSES]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = {
         'table_catalog': ['exact', 'icontains'],
@@ -226,3 +239,139 @@ class TotalDataViewSet(ModelViewSet):
     )
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Пакетная загрузка записей",
+        description=(
+                "Принимает JSON-массив или NDJSON (application/x-ndjson) с записями, "
+                "тело может быть сжато (Content-Encoding: gzip, deflate, zstd).\n"
+                "Пачка валидируется целиком, по столбцам (utils.total_data_validation), "
+                "ошибки возвращаются словарём {номер строки: {поле: [ошибки]}}; запись идёт чанками через "
+                "INSERT ... ON CONFLICT (hash_address, stand_id) DO UPDATE в set_total_data_rows.\n"
+                "Неизменившиеся записи не перезаписываются.\n"
+                "С параметром async=1 строки ставятся в очередь, ответ 202 содержит id задания, "
+                "состояние которого доступно по jobs/{id}/.\n"
+                "С параметром replace=1 пачка считается полным снимком: срезы (стенд, база) из пачки "
+                "заменяются одной транзакцией, записи срезов, которых нет в пачке, деактивируются."
+        ),
+        parameters=[
+            OpenApiParameter('async', bool, description='Загрузить в фоне через очередь заданий'),
+            OpenApiParameter('replace', bool, description='Пачка — полный снимок срезов (несовместимо с async)'),
+        ],
+        request=TotalDataSerializer(many=True),
+        responses={
+            200: OpenApiResponse(description="Счётчики: received, inserted, updated, unchanged, duplicates "
+                                             "(+ deactivated, slices при replace=1)"),
+            202: OpenApiResponse(response=IngestJobSerializer, description="Задание поставлено в очередь"),
+            400: OpenApiResponse(description="Ошибки валидации по номерам строк")
+        }
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        if not isinstance(request.data, list):
+            return Response(
+                {'error': 'Ожидается массив записей'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows, errors = validate_total_data_rows(request.data)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        for row, hash_address in zip(rows, build_hashes(rows)):
+            row['hash_address'] = hash_address
+
+        if request.query_params.get('replace') in ('1', 'true'):
+            if request.query_params.get('async') in ('1', 'true'):
+                return Response(
+                    {'error': 'replace=1 выполняется только синхронно'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            stats = replace_snapshot(rows, author_id=request.user.pk)
+            return Response(stats, status=status.HTTP_200_OK)
+
+        if request.query_params.get('async') in ('1', 'true'):
+            job = enqueue_ingest_job(rows, author_id=request.user.pk)
+            return Response(IngestJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+        stats = upsert_total_data(rows, author_id=request.user.pk)
+        return Response(stats, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Состояние задания пакетной загрузки",
+        responses={200: IngestJobSerializer, 404: OpenApiResponse(description="Задание не найдено")}
+    )
+    @action(detail=False, methods=['get'], url_path=r'jobs/(?P<job_id>[0-9]+)')
+    def job(self, request, job_id=None):
+        job = get_object_or_404(IngestJob, pk=job_id)
+        return Response(IngestJobSerializer(job).data)
+
+    @extend_schema(
+        summary="Манифест дельта-синхронизации",
+        description=(
+                "Первая фаза протокола: клиент присылает пары [hash_address, row_digest] "
+                "для стенда и каталога, сервер отвечает списком upload (новые и изменённые ключи) "
+                "и missing (ключи, которых больше нет у клиента). Вторая фаза — загрузка только "
+                "строк из upload через bulk.\n"
+                "row_digest — SHA-256 от JSON-массива значений полей в порядке "
+                "stand, table_type, group_catalog, table_catalog, table_schema, table_name, "
+                "table_comment, column_number, column_name, column_comment, data_type, "
+                "is_nullable, is_auto, column_info (скаляры — строки или null, column_info как есть), "
+                "сериализованного с сортировкой ключей, без пробелов и без экранирования не-ASCII.\n"
+                "При deactivate_missing=true исчезнувшие записи помечаются неактивными."
+        ),
+        request=TotalDataManifestSerializer,
+        responses={
+            200: OpenApiResponse(description="upload, missing, unchanged, deactivated"),
+            400: OpenApiResponse(description="Ошибка валидации манифеста")
+        }
+    )
+    @action(detail=False, methods=['post'])
+    def manifest(self, request):
+        serializer = TotalDataManifestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = diff_manifest(**serializer.validated_data)
+        return Response(result, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Последнее наблюдение записей среза",
+        description=(
+                "Время, когда сборщик последний раз видел записи среза (стенд, база): неизменившиеся записи "
+                "при повторной загрузке не перезаписываются, и updated_at этого не показывает.\n"
+                "Время выводится из наблюдений загрузок (utils.total_data_observations); "
+                "в ответе также последние наблюдения самого среза."
+        ),
+        parameters=[
+            OpenApiParameter('stand', str, required=True, description='Стенд'),
+            OpenApiParameter('table_catalog', str, required=True, description='Имя базы данных'),
+            OpenApiParameter(
+                'hash_address', str, many=True,
+                description=f'Ключ записи (можно несколько, не больше {LAST_SEEN_MAX_KEYS})'
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(description="last_seen: {hash_address: время}, observations: наблюдения среза"),
+            400: OpenApiResponse(description="Не указан срез или слишком много ключей")
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def observations(self, request):
+        stand = request.query_params.get('stand')
+        table_catalog = request.query_params.get('table_catalog')
+        hash_addresses = request.query_params.getlist('hash_address')
+        if not stand or not table_catalog:
+            return Response(
+                {'error': 'Укажите stand и table_catalog'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(hash_addresses) > LAST_SEEN_MAX_KEYS:
+            return Response(
+                {'error': f'Не больше {LAST_SEEN_MAX_KEYS} ключей hash_address в одном запросе'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({
+            'last_seen': last_seen(stand, table_catalog, hash_addresses),
+            'observations': TotalDataObservationSerializer(
+                slice_observations(stand, table_catalog), many=True
+            ).data,
+        })
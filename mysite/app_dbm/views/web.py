@@ -8,27 +8,60 @@ from django.views.generic import DetailView, TemplateView, ListView
 from django.views.decorators.csrf import csrf_exempt
 from django_filters.views import FilterView
 
-from _common.models import SafePaginator
+from _common.models import KeysetPage, KeysetPaginator, RowCount, count_rows
 from app_services.models import LinkServicesTable
 from app_updates.models import LinkUpdateCol
 
 from ..models import (
     LinkDB, LinkSchema, LinkTable, LinkColumn,
     LinkColumnColumn, LinkColumnName, LinkTableName, DimTypeLink,
-    DimColumnName, DimTableType, DimTableNameType, DimStage, DimDB,
+    DimColumnName, DimTableType, DimTableNameType, DimStage, DimDB, CatalogFlat,
 )
 from ..filters import (
     LinkDBFilter,
-    LinkTableFilter, LinkColumnFilter,
+    LinkTableFilter, CatalogFlatFilter,
 )
 
 
+# Параметры запроса, которые задают страницу, а не фильтр
+PAGINATION_PARAMS = ('page', 'cursor')
+
+
 # ================== МИКСИНЫ ==================
+class KeysetPaginationMixin:
+    """
+    Миксин постраничного вывода по ключу (KeysetPaginator) для ListView / FilterView.
+    Страница задаётся параметром cursor; keyset_ordering — NOT NULL поля сортировки (pk добавляется сам).
+    """
+    keyset_ordering = ()
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, ordering=self.keyset_ordering)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
 class PaginationContextMixin:
-    """Миксин для добавления контекста пагинации и фильтрации"""
+    """
+    Миксин для добавления контекста пагинации и фильтрации.
+    Число строк без SafePaginator считает count_rows: точное (count_is_exact) или оценка.
+    """
+    count_exact_limit = 10000
+    count_timeout_ms = 200
+
+    def get_row_count(self, context, filterset=None) -> RowCount:
+        """Число строк списка: на последней странице по ключу оно известно без подсчёта."""
+        page = context.get('page_obj')
+        if isinstance(page, KeysetPage) and not page.has_next():
+            return RowCount((page.number - 1) * page.paginator.per_page + len(page.object_list), True)
+        if filterset is None:
+            return RowCount(0, True)
+        return count_rows(filterset.qs, exact_limit=self.count_exact_limit, timeout_ms=self.count_timeout_ms)
 
     def get_pagination_context(self, context, filterset=None):
         """Универсальный метод для получения контекста пагинации"""
+        count_is_exact = True
         # Используем SafePaginator для подсчета
         if hasattr(context.get('paginator'), 'max_limit'):
             max_limit = context['paginator'].max_limit
@@ -41,7 +74,7 @@ class PaginationContextMixin:
                 is_limited = False
                 limited_count = total_count
         else:
-            total_count = filterset.qs.count() if filterset else 0
+            total_count, count_is_exact = self.get_row_count(context, filterset)
             limited_count = total_count
             is_limited = False
 
@@ -56,18 +89,20 @@ class PaginationContextMixin:
             'limited_count': limited_count,
             'is_limited': is_limited,
             'displayed_count': displayed_count,
+            'count_is_exact': count_is_exact,
         }
 
         # Параметры фильтрации для пагинации
         get_params = self.request.GET.copy()
-        if 'page' in get_params:
-            del get_params['page']
+        for param in PAGINATION_PARAMS:
+            if param in get_params:
+                del get_params[param]
         if get_params:
             pagination_context['query_string'] = get_params.urlencode()
 
         pagination_context['form_submitted'] = bool(self.request.GET)
         pagination_context['has_filter_params'] = any(
-            v for k, v in self.request.GET.items() if k != 'page'
+            v for k, v in self.request.GET.items() if k not in PAGINATION_PARAMS
         )
 
         return pagination_context
@@ -86,7 +121,7 @@ class AutocompleteMixin:
         if q and self.search_fields:
             query = Q()
             for field in self.search_fields:
-                query |= Q(**{f'{field}__icontains': q})
+                query |= Q(**{f'{field}__ilike': q})
             queryset = queryset.filter(query)
 
         return queryset
@@ -175,7 +210,7 @@ class GetColumnsView(View):
 
 
 # ================== ОСНОВНЫЕ ПРЕДСТАВЛЕНИЯ ==================
-class DatabasesView(LoginRequiredMixin, FilterView, PaginationContextMixin):
+class DatabasesView(LoginRequiredMixin, KeysetPaginationMixin, FilterView, PaginationContextMixin):
     """Список баз данных с фильтрацией."""
 
     model = LinkDB
@@ -183,11 +218,11 @@ class DatabasesView(LoginRequiredMixin, FilterView, PaginationContextMixin):
     template_name = 'app_dbm/databases.html'
     context_object_name = 'databases'
     paginate_by = 20
-    paginator_class = SafePaginator
+    keyset_ordering = ('alias',)
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        queryset = queryset.select_related('stage').order_by('alias')
+        queryset = queryset.select_related('stage')
         self.filterset = self.filterset_class(self.request.GET, queryset=queryset)
         return self.filterset.qs
 
@@ -197,14 +232,14 @@ class DatabasesView(LoginRequiredMixin, FilterView, PaginationContextMixin):
         return context
 
 
-class TablesView(LoginRequiredMixin, FilterView, PaginationContextMixin):
+class TablesView(LoginRequiredMixin, KeysetPaginationMixin, FilterView, PaginationContextMixin):
     """Список таблиц с фильтрацией."""
 
     model = LinkTable
     template_name = 'app_dbm/tables.html'
     context_object_name = 'tables'
-    paginator_class = SafePaginator
     paginate_by = 20
+    keyset_ordering = ('name',)
     filterset_class = LinkTableFilter
 
     def get_queryset(self):
@@ -283,20 +318,19 @@ class TableDetailView(LoginRequiredMixin, DetailView):
         return context
 
 
-class ColumnListView(LoginRequiredMixin, FilterView, PaginationContextMixin):
-    """Список столбцов с фильтрацией и пагинацией."""
+class ColumnListView(LoginRequiredMixin, KeysetPaginationMixin, FilterView, PaginationContextMixin):
+    """Список столбцов с фильтрацией и пагинацией — из плоского каталога CatalogFlat, без соединений."""
 
-    model = LinkColumn
-    filterset_class = LinkColumnFilter
+    model = CatalogFlat
+    filterset_class = CatalogFlatFilter
     template_name = 'app_dbm/columns.html'
     context_object_name = 'columns'
     paginate_by = 20
-    paginator_class = SafePaginator
+    # Порядок совпадает с индексом catalog_flat_keyset_idx (table_name, table_id, column_name, id)
+    keyset_ordering = ('table_name', 'table_id', 'column_name')
 
     def get_queryset(self):
-        queryset = LinkColumn.objects.filter(is_active=True).select_related(
-            'table', 'table__schema', 'table__schema__base', 'table__type',
-        ).order_by('table__name', 'columns')
+        queryset = CatalogFlat.objects.all()
         self.filterset = self.filterset_class(self.request.GET, queryset=queryset)
         return self.filterset.qs
 
@@ -401,21 +435,17 @@ class LinkColumnColumnCreateView(View):
 
 # ================== АВТОКОМПЛИТ ПРЕДСТАВЛЕНИЯ ==================
 class LinkColumnAutocomplete(ListView, AutocompleteMixin):
-    """Автокомплит для столбцов"""
-    model = LinkColumn
-    search_fields = ['columns', 'table__name', 'table__schema__schema', 'table__schema__base__name']
-    display_fields = ['id', 'columns']
+    """Автокомплит для активных столбцов: id — LinkColumn, поиск по полному пути в CatalogFlat"""
+    model = CatalogFlat
+    # Подстрока любой части пути база.схема.таблица.столбец — один триграммный индекс вместо четырёх соединений
+    search_fields = ['full_path']
+    display_fields = ['id', 'column_name']
 
     def get_queryset(self):
-        return super().get_queryset().select_related(
-            'table__schema__base'
-        ).order_by('columns')
+        return super().get_queryset().order_by('column_name', 'id')
 
     def get_display_text(self, obj):
-        try:
-            return f"{obj.table.schema.base.name}.{obj.table.schema.schema}.{obj.table.name}.{obj.columns}"
-        except AttributeError:
-            return obj.columns or str(obj)
+        return obj.full_path
 
 
 class LinkTableAutocomplete(ListView, AutocompleteMixin):
@@ -0,0 +1,19 @@
+# app_search/admin.py
+from django.contrib import admin
+
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    """Поисковые документы только для просмотра — их пишет utils.search_index."""
+    list_display = ('id', 'object_type', 'object_id', 'title', 'base', 'is_active', 'updated_at')
+    list_filter = ('object_type', 'is_active')
+    search_fields = ('title', 'aliases')
+    exclude = ('document',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,17 @@
+# app_search/apps.py
+from django.apps import AppConfig
+
+
+class AppSearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'app_search'
+    db_schema = 'app_search'
+    verbose_name = 'Поиск по каталогу'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
+
+
+name = AppSearchConfig.name
+db_schema = AppSearchConfig.db_schema
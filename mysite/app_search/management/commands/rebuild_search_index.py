@@ -0,0 +1,37 @@
+# app_search/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand, CommandError
+
+from app_search.models import SearchDocument
+from app_search.utils.search_index import REBUILD_BATCH_SIZE, rebuild_index
+
+TYPES = [object_type for object_type, _ in SearchDocument.TYPE_CHOICES]
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересборка поисковых документов каталога порциями по id: новые и изменённые объекты записываются, '
+        'документы удалённых объектов удаляются. Первичное заполнение выполняет migrate (app_search.signals), '
+        'команда нужна после массовых изменений в обход ORM и сигналов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', action='append', choices=TYPES, default=[],
+                            help='Пересобрать только документы этого типа (можно несколько)')
+        parser.add_argument('--batch-size', type=int, default=REBUILD_BATCH_SIZE, help='Ширина диапазона id порции')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError('Размер порции должен быть положительным')
+        verbosity = options['verbosity']
+
+        def progress(object_type, last_id, written):
+            if verbosity >= 2:
+                self.stdout.write(f'{object_type:<12} id до {last_id:>10}  записано: {written}')
+
+        stats = rebuild_index(types=options['type'] or None, batch_size=options['batch_size'], progress=progress)
+        for object_type, counts in stats.items():
+            self.stdout.write(
+                f"{object_type:<12} записано: {counts['written']:>10}  удалено: {counts['removed']:>8}  "
+                f"время: {counts['seconds']} с"
+            )
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс пересобран'))
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:26
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('object_type', models.CharField(choices=[('database', 'база данных'), ('table', 'таблица'), ('column', 'столбец'), ('dictionary', 'термин словаря'), ('service', 'сервис')], max_length=16, verbose_name='тип объекта')),
+                ('object_id', models.BigIntegerField(verbose_name='id объекта')),
+                ('title', models.CharField(max_length=255, verbose_name='название')),
+                ('aliases', models.TextField(blank=True, default='', verbose_name='синонимы')),
+                ('path', models.TextField(blank=True, default='', verbose_name='путь')),
+                ('body', models.TextField(blank=True, default='', verbose_name='описание')),
+                ('base', models.CharField(blank=True, default='', max_length=255, verbose_name='база данных')),
+                ('is_active', models.BooleanField(default=True, verbose_name='запись активна')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='дата изменения')),
+                ('document', models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='russian', weight='A'), '||', django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), django.contrib.postgres.search.SearchConfig('russian')), '||', django.contrib.postgres.search.SearchVector('aliases', config='russian', weight='B'), django.contrib.postgres.search.SearchConfig('russian')), '||', django.contrib.postgres.search.SearchVector('aliases', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('russian')), '||', django.contrib.postgres.search.SearchVector('path', config='russian', weight='C'), django.contrib.postgres.search.SearchConfig('russian')), '||', django.contrib.postgres.search.SearchVector('path', config='english', weight='C'), django.contrib.postgres.search.SearchConfig('russian')), '||', django.contrib.postgres.search.SearchVector('body', config='russian', weight='D'), django.contrib.postgres.search.SearchConfig('russian')), '||', django.contrib.postgres.search.SearchVector('body', config='english', weight='D'), django.contrib.postgres.search.SearchConfig('russian')), output_field=django.contrib.postgres.search.SearchVectorField(), verbose_name='поисковый вектор')),
+            ],
+            options={
+                'verbose_name': '01 Поисковый документ.',
+                'verbose_name_plural': '01 Поисковые документы.',
+                'db_table': 'app_search"."search_document',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['document'], name='search_document_gin'), models.Index(fields=['object_type', 'base'], name='search_document_facet_idx')],
+                'constraints': [models.UniqueConstraint(fields=('object_type', 'object_id'), name='search_document_object_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,102 @@
+# app_search/models.py
+"""
+Поисковый документ объекта каталога: база, таблица, столбец, термин словаря, сервис.
+"""
+from functools import reduce
+from operator import add
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from .apps import db_schema
+
+# Конфигурации полнотекстового поиска: документ содержит лексемы обеих, запрос ищет по обеим
+SEARCH_CONFIGS = ('russian', 'english')
+
+# Вес поля документа в ранжировании: A — название, B — синонимы, C — путь, D — описание
+SEARCH_WEIGHTS = (
+    ('title', 'A'),
+    ('aliases', 'B'),
+    ('path', 'C'),
+    ('body', 'D'),
+)
+
+
+def document_expression() -> SearchVector:
+    """tsvector документа: каждое поле со своим весом в каждой конфигурации."""
+    return reduce(add, (
+        SearchVector(field, config=config, weight=weight)
+        for field, weight in SEARCH_WEIGHTS
+        for config in SEARCH_CONFIGS
+    ))
+
+
+# 01 Поисковый документ.
+class SearchDocument(models.Model):
+    """
+    Денормализованный текст объекта каталога и его tsvector (генерируемый столбец с GIN-индексом).
+    Синонимы объекта (альтернативные имена таблиц, имена столбцов, синонимы терминов, имена сервисов)
+    входят в документ родителя. Документы поддерживаются utils.search_index, без служебных полей BaseClass.
+    """
+
+    TYPE_DATABASE = 'database'
+    TYPE_TABLE = 'table'
+    TYPE_COLUMN = 'column'
+    TYPE_DICTIONARY = 'dictionary'
+    TYPE_SERVICE = 'service'
+    TYPE_CHOICES = [
+        (TYPE_DATABASE, 'база данных'),
+        (TYPE_TABLE, 'таблица'),
+        (TYPE_COLUMN, 'столбец'),
+        (TYPE_DICTIONARY, 'термин словаря'),
+        (TYPE_SERVICE, 'сервис'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    object_type = models.CharField(max_length=16, choices=TYPE_CHOICES, verbose_name='тип объекта')
+    object_id = models.BigIntegerField(verbose_name='id объекта')
+    title = models.CharField(max_length=255, verbose_name='название')
+    aliases = models.TextField(blank=True, default='', verbose_name='синонимы')
+    path = models.TextField(blank=True, default='', verbose_name='путь')
+    body = models.TextField(blank=True, default='', verbose_name='описание')
+    base = models.CharField(max_length=255, blank=True, default='', verbose_name='база данных')
+    is_active = models.BooleanField(default=True, verbose_name='запись активна')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='дата изменения')
+    document = models.GeneratedField(
+        expression=document_expression(),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        verbose_name='поисковый вектор',
+    )
+
+    # Тип объекта -> страница объекта в веб-части каталога
+    DETAIL_URLS = {
+        TYPE_TABLE: 'app_dbm:tables-detail',
+        TYPE_COLUMN: 'app_dbm:columns-detail',
+        TYPE_DICTIONARY: 'app_dict:dict-detail',
+        TYPE_SERVICE: 'app_services:services-detail',
+    }
+
+    def __str__(self):
+        return f'{self.get_object_type_display()} {self.title}'
+
+    def get_absolute_url(self):
+        if self.object_type == self.TYPE_DATABASE:
+            # Отдельной страницы у базы нет — список экземпляров базы по стендам
+            return f"{reverse('app_dbm:databases')}?{urlencode({'db_name': self.title})}"
+        return reverse(self.DETAIL_URLS[self.object_type], args=[self.object_id])
+
+    class Meta:
+        db_table = f'{db_schema}"."search_document'
+        verbose_name = '01 Поисковый документ.'
+        verbose_name_plural = '01 Поисковые документы.'
+        constraints = [
+            models.UniqueConstraint(fields=['object_type', 'object_id'], name='search_document_object_uniq'),
+        ]
+        indexes = [
+            GinIndex(fields=['document'], name='search_document_gin'),
+            models.Index(fields=['object_type', 'base'], name='search_document_facet_idx'),
+        ]
@@ -0,0 +1,24 @@
+# app_search/serializers.py
+from rest_framework import serializers
+
+from .models import SearchDocument
+from .utils.catalog_search import SEARCH_LIMIT, SEARCH_MAX_LIMIT
+
+
+class SearchParamsSerializer(serializers.Serializer):
+    """Параметры поиска по каталогу."""
+    q = serializers.CharField(max_length=255, help_text='Строка поиска: слова, "фраза", or, -исключение')
+    type = serializers.MultipleChoiceField(choices=SearchDocument.TYPE_CHOICES, required=False,
+                                           help_text='Типы объектов (параметр можно повторять)')
+    base = serializers.CharField(max_length=255, required=False, help_text='Имя базы данных')
+    limit = serializers.IntegerField(min_value=1, max_value=SEARCH_MAX_LIMIT, default=SEARCH_LIMIT)
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+class SearchDocumentSerializer(serializers.ModelSerializer):
+    url = serializers.CharField(source='get_absolute_url', read_only=True)
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = SearchDocument
+        fields = ['object_type', 'object_id', 'title', 'aliases', 'path', 'body', 'base', 'url', 'rank']
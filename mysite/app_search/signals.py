@@ -0,0 +1,155 @@
+# app_search/signals.py
+"""
+Поддержание поисковых документов при изменениях каталога:
+1) сохранение и удаление объекта через ORM пересчитывает документы, в которые входит его текст
+   (сам объект, его родитель и потомки, у которых объект входит в путь)
+2) синхронизация со срезом TotalData пишет таблицы и столбцы SQL-запросами, без сигналов моделей —
+   документы пересчитываются по набору изменений SyncChange завершённого запуска
+3) пересчёт выполняется после фиксации транзакции одним запросом на тип документа
+4) очистка каталога удаляет объекты SQL-запросами — документы удаляются по сигналу catalog_purged
+5) migrate, применивший миграции app_search при пустом индексе, заполняет его по уже существующему каталогу
+Массовые изменения в обход ORM и сигналов покрывает команда rebuild_search_index.
+"""
+import logging
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+from app_dbm.models import (
+    DimColumnName, DimDB, LinkColumn, LinkColumnName, LinkDB, LinkSchema, LinkTable, LinkTableName,
+    SyncChange, SyncRun,
+)
+from app_dbm.signals import catalog_purged
+from app_dict.models import DimCategory, DimDictionary, LinkDictionaryName
+from app_services.models import DimServices, DimServicesName, DimServicesTypes
+
+from .models import SearchDocument
+from .utils.search_index import rebuild_index, refresh_documents, remove_documents
+
+logger = logging.getLogger(__name__)
+
+DATABASE = SearchDocument.TYPE_DATABASE
+TABLE = SearchDocument.TYPE_TABLE
+COLUMN = SearchDocument.TYPE_COLUMN
+DICTIONARY = SearchDocument.TYPE_DICTIONARY
+SERVICE = SearchDocument.TYPE_SERVICE
+
+# Модель -> функция, возвращающая [(тип документа, queryset модели-источника)] для пересчёта
+DEPENDENTS = {
+    DimDB: lambda obj: [
+        (DATABASE, DimDB.objects.filter(pk=obj.pk)),
+        (TABLE, LinkTable.objects.filter(schema__base_id=obj.pk)),
+        (COLUMN, LinkColumn.objects.filter(table__schema__base_id=obj.pk)),
+    ],
+    LinkDB: lambda obj: [(DATABASE, DimDB.objects.filter(pk=obj.base_id))],
+    LinkSchema: lambda obj: [
+        (TABLE, LinkTable.objects.filter(schema_id=obj.pk)),
+        (COLUMN, LinkColumn.objects.filter(table__schema_id=obj.pk)),
+    ],
+    LinkTable: lambda obj: [
+        (TABLE, LinkTable.objects.filter(pk=obj.pk)),
+        (COLUMN, LinkColumn.objects.filter(table_id=obj.pk)),
+    ],
+    LinkTableName: lambda obj: [(TABLE, LinkTable.objects.filter(pk=obj.table_id))],
+    LinkColumn: lambda obj: [(COLUMN, LinkColumn.objects.filter(pk=obj.pk))],
+    LinkColumnName: lambda obj: [(COLUMN, LinkColumn.objects.filter(pk=obj.column_id))],
+    DimColumnName: lambda obj: [(COLUMN, LinkColumn.objects.filter(linkcolumnname__name_id=obj.pk))],
+    DimDictionary: lambda obj: [(DICTIONARY, DimDictionary.objects.filter(pk=obj.pk))],
+    LinkDictionaryName: lambda obj: [(DICTIONARY, DimDictionary.objects.filter(pk=obj.name_id))],
+    DimCategory: lambda obj: [(DICTIONARY, DimDictionary.objects.filter(category_id=obj.pk))],
+    DimServices: lambda obj: [(SERVICE, DimServices.objects.filter(pk=obj.pk))],
+    DimServicesName: lambda obj: [(SERVICE, DimServices.objects.filter(pk=obj.alias_id))],
+    DimServicesTypes: lambda obj: [(SERVICE, DimServices.objects.filter(type_id=obj.pk))],
+}
+
+# Модель-источник документа -> тип документа (удаление объекта удаляет документ)
+DOCUMENT_MODELS = {
+    DimDB: DATABASE,
+    LinkTable: TABLE,
+    LinkColumn: COLUMN,
+    DimDictionary: DICTIONARY,
+    DimServices: SERVICE,
+}
+
+
+def _refresh_on_commit(targets):
+    def refresh():
+        # Поисковый индекс вторичен: ошибка пересчёта не должна ломать уже зафиксированное изменение каталога
+        for object_type, queryset in targets:
+            try:
+                refresh_documents(object_type, queryset=queryset)
+            except Exception:
+                logger.exception('Не удалось пересчитать поисковые документы %s', object_type)
+
+    transaction.on_commit(refresh)
+
+
+def catalog_saved(sender, instance, raw=False, **kwargs):
+    """Пересчёт документов после сохранения объекта каталога (кроме загрузки фикстур)."""
+    if raw:
+        return
+    _refresh_on_commit(DEPENDENTS[sender](instance))
+
+
+def catalog_deleted(sender, instance, **kwargs):
+    """Удаление документа объекта или пересчёт документа родителя после удаления синонима."""
+    object_type = DOCUMENT_MODELS.get(sender)
+    if object_type:
+        pk = instance.pk
+        transaction.on_commit(lambda: remove_documents(object_type, [pk]))
+        return
+    _refresh_on_commit(DEPENDENTS[sender](instance))
+
+
+def sync_run_saved(sender, instance, **kwargs):
+    """Пересчёт документов таблиц и столбцов, изменённых завершённой синхронизацией."""
+    if instance.status != SyncRun.STATUS_DONE or instance.dry_run:
+        return
+    schema_ids = instance.changed_ids(SyncChange.OBJECT_SCHEMA)
+    table_ids = instance.changed_ids(SyncChange.OBJECT_TABLE)
+    column_ids = instance.changed_ids(SyncChange.OBJECT_COLUMN)
+    _refresh_on_commit([
+        (TABLE, LinkTable.objects.filter(Q(pk__in=table_ids) | Q(schema_id__in=schema_ids))),
+        (COLUMN, LinkColumn.objects.filter(
+            Q(pk__in=column_ids) | Q(table_id__in=table_ids) | Q(table__schema_id__in=schema_ids)
+        )),
+    ])
+
+
+def catalog_purged_handler(sender, ids, **kwargs):
+    """Удаление документов объектов, удалённых очисткой каталога (сигнал отправляется после фиксации)."""
+    object_type = DOCUMENT_MODELS.get(sender)
+    if not object_type:
+        return
+    try:
+        remove_documents(object_type, ids)
+    except Exception:
+        logger.exception('Не удалось удалить поисковые документы %s', object_type)
+
+
+def index_after_migrate(sender, using=DEFAULT_DB_ALIAS, plan=None, **kwargs):
+    """
+    Первичное заполнение индекса: объекты каталога, созданные до SearchDocument, не проходят через сигналы
+    и без этого не находятся поиском до ручного rebuild_search_index.
+    """
+    if using != DEFAULT_DB_ALIAS or not plan:
+        return
+    if not any(migration.app_label == sender.label and not backwards for migration, backwards in plan):
+        return
+    if SearchDocument.objects.exists():
+        return
+    stats = rebuild_index()
+    logger.info('Поисковый индекс заполнен после migrate: %s', stats)
+
+
+def connect_signals():
+    for model in DEPENDENTS:
+        post_save.connect(catalog_saved, sender=model, dispatch_uid=f'app_search.saved.{model.__name__}')
+        post_delete.connect(catalog_deleted, sender=model, dispatch_uid=f'app_search.deleted.{model.__name__}')
+    post_save.connect(sync_run_saved, sender=SyncRun, dispatch_uid='app_search.sync_run_saved')
+    catalog_purged.connect(catalog_purged_handler, dispatch_uid='app_search.catalog_purged')
+    post_migrate.connect(
+        index_after_migrate, sender=apps.get_app_config('app_search'), dispatch_uid='app_search.index_after_migrate'
+    )
@@ -0,0 +1,15 @@
+# app_search/urls.py
+from django.urls import path
+from .views.web import SearchView
+from .views.v1 import SearchAPIView
+from .apps import name
+
+app_name = name
+
+urlpatterns = [
+    # API endpoints
+    path('api/v1/search/', SearchAPIView.as_view(), name='search-api'),
+
+    # WEB-интерфейс (HTML-страницы)
+    path('', SearchView.as_view(), name='search'),
+]
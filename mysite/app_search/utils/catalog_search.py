@@ -0,0 +1,122 @@
+# app_search/utils/catalog_search.py
+"""
+Поиск по документам SearchDocument:
+1) запрос разбирается websearch_to_tsquery в конфигурациях russian и english (условия через OR),
+   поэтому находятся и русские, и английские словоформы; совпадение проверяется GIN-индексом
+2) если все слова вместе не встречаются ни в одном документе, ищется любое из слов (режим any)
+3) результаты ранжируются ts_rank с весами полей документа (название > синонимы > путь > описание)
+4) счётчики фасетов: по типу объекта — без фильтра по типу, по базе — без фильтра по базе
+"""
+import re
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+from typing import Dict, List, Optional, Sequence
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Count, F, Q, Value
+
+from ..models import SEARCH_CONFIGS, SearchDocument
+
+MODE_ALL = 'all'
+MODE_ANY = 'any'
+
+SEARCH_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+FACET_LIMIT = 20
+
+# Нормализация ts_rank: 1 — делить на 1 + логарифм длины документа (длинные описания не вытесняют названия)
+RANK_NORMALIZATION = 1
+
+_WORD_RE = re.compile(r'\w+')
+
+
+@dataclass
+class SearchResult:
+    query: str
+    mode: str = MODE_ALL
+    count: int = 0
+    results: List[SearchDocument] = field(default_factory=list)
+    facets: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+def build_query(text: str, mode: str = MODE_ALL) -> Optional[SearchQuery]:
+    """
+    tsquery по тексту пользователя в обеих конфигурациях.
+    Args:
+        text: строка поиска (синтаксис websearch: "фраза", or, -исключение)
+        mode: MODE_ALL — все слова, MODE_ANY — любое из слов
+    Returns:
+        SearchQuery или None, если в тексте нет слов
+    """
+    if mode == MODE_ANY:
+        # В raw-запрос попадают только слова \w+ — пользовательский ввод не ломает синтаксис to_tsquery
+        words = _WORD_RE.findall(text)
+        if not words:
+            return None
+        text, search_type = ' | '.join(words), 'raw'
+    else:
+        if not _WORD_RE.search(text):
+            return None
+        search_type = 'websearch'
+    return reduce(or_, (SearchQuery(text, config=config, search_type=search_type) for config in SEARCH_CONFIGS))
+
+
+def _facet(queryset, field_name: str, limit: Optional[int] = None) -> Dict[str, int]:
+    counts = queryset.values(field_name).annotate(count=Count('id')).order_by('-count', field_name)
+    if limit:
+        counts = counts[:limit]
+    return {row[field_name]: row['count'] for row in counts}
+
+
+def search_catalog(
+        text: str,
+        types: Optional[Sequence[str]] = None,
+        base: Optional[str] = None,
+        limit: int = SEARCH_LIMIT,
+        offset: int = 0,
+) -> SearchResult:
+    """
+    Ищет объекты каталога по тексту.
+    Args:
+        text: строка поиска
+        types: типы объектов (SearchDocument.TYPE_*), по умолчанию все
+        base: имя базы данных (фасет base)
+        limit: размер страницы результатов
+        offset: смещение страницы
+    Returns:
+        SearchResult: найденные документы с атрибутом rank, общее число, режим и фасеты
+    """
+    text = (text or '').strip()
+    result = SearchResult(query=text)
+    type_filter = Q(object_type__in=types) if types else Q()
+    base_filter = Q(base=base) if base else Q()
+    documents = SearchDocument.objects.filter(is_active=True)
+
+    for mode in (MODE_ALL, MODE_ANY):
+        query = build_query(text, mode)
+        if query is None:
+            return result
+        matched = documents.filter(document=query)
+        count = matched.filter(type_filter, base_filter).count()
+        if count:
+            break
+
+    result.mode = mode
+    result.count = count
+    result.facets = {
+        'object_type': _facet(matched.filter(base_filter), 'object_type'),
+        'base': _facet(matched.filter(type_filter).exclude(base=''), 'base', FACET_LIMIT),
+    }
+    if not count:
+        return result
+
+    rank = SearchRank(F('document'), query, normalization=Value(RANK_NORMALIZATION))
+    page = (
+        matched.filter(type_filter, base_filter)
+        .annotate(rank=rank)
+        .order_by('-rank', 'object_type', 'title', 'id')
+        .defer('document')
+    )
+    result.results = list(page[offset:offset + min(limit, SEARCH_MAX_LIMIT)])
+    return result
@@ -0,0 +1,256 @@
+# app_search/utils/search_index.py
+"""
+Поддержка поисковых документов SearchDocument запросами над множествами:
+1) для каждого типа объекта один SELECT собирает название, синонимы, путь, описание и базу из моделей каталога
+2) документы пишутся одним INSERT ... ON CONFLICT DO UPDATE; неизменившиеся строки не перезаписываются
+3) область обновления — все объекты (полная пересборка порциями по id), список id или подзапрос queryset
+4) документы удалённых объектов удаляются по id или проверкой NOT EXISTS при пересборке
+tsvector считает сама PostgreSQL — SearchDocument.document генерируемый столбец.
+"""
+import logging
+import time
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+from django.db import connection, transaction
+from django.db.models import QuerySet
+
+from app_dbm.models import (
+    DimColumnName, DimDB, LinkColumn, LinkColumnName, LinkDB, LinkSchema, LinkTable, LinkTableName,
+)
+from app_dict.models import DimCategory, DimDictionary, LinkDictionaryName
+from app_services.models import DimServices, DimServicesName, DimServicesTypes
+
+from ..models import SearchDocument
+
+logger = logging.getLogger(__name__)
+
+REBUILD_BATCH_SIZE = 20000
+
+DOCUMENT_FIELDS = ('object_id', 'title', 'aliases', 'path', 'body', 'base', 'is_active')
+
+# Текстовые значения JSON-описания столбца на любой глубине, без ключей и скобок
+_JSON_STRINGS = '''(
+    SELECT string_agg(v #>> '{{}}', ' ')
+    FROM jsonb_path_query({column}, 'strict $.** ? (@.type() == "string")') AS v
+)'''
+
+
+def _table(model) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _database_sql() -> str:
+    return f'''
+        SELECT src.id, LEFT(src.name, 255),
+            COALESCE((
+                SELECT string_agg(concat_ws(' ', l.alias, l.name), ' ' ORDER BY l.id)
+                FROM {_table(LinkDB)} AS l
+                WHERE l.base_id = src.id AND l.is_active
+            ), ''),
+            '',
+            concat_ws(' ', src.version, src.description),
+            src.name,
+            src.is_active
+        FROM {_table(DimDB)} AS src
+    '''
+
+
+def _table_sql() -> str:
+    return f'''
+        SELECT src.id, LEFT(src.name, 255),
+            COALESCE((
+                SELECT string_agg(n.name, ' ' ORDER BY n.id)
+                FROM {_table(LinkTableName)} AS n
+                WHERE n.table_id = src.id AND n.is_active
+            ), ''),
+            concat_ws('.', b.name, s.schema),
+            COALESCE(src.description, ''),
+            b.name,
+            src.is_active AND s.is_active
+        FROM {_table(LinkTable)} AS src
+            JOIN {_table(LinkSchema)} AS s ON s.id = src.schema_id
+            JOIN {_table(DimDB)} AS b ON b.id = s.base_id
+    '''
+
+
+def _column_sql() -> str:
+    return f'''
+        SELECT src.id, LEFT(src.columns, 255),
+            COALESCE((
+                SELECT string_agg(dn.name, ' ' ORDER BY dn.id)
+                FROM {_table(LinkColumnName)} AS cn
+                    JOIN {_table(DimColumnName)} AS dn ON dn.id = cn.name_id
+                WHERE cn.column_id = src.id AND cn.is_active
+            ), ''),
+            concat_ws('.', b.name, s.schema, t.name),
+            concat_ws(' ', src.type, {_JSON_STRINGS.format(column='src.description')}),
+            b.name,
+            src.is_active AND t.is_active
+        FROM {_table(LinkColumn)} AS src
+            JOIN {_table(LinkTable)} AS t ON t.id = src.table_id
+            JOIN {_table(LinkSchema)} AS s ON s.id = t.schema_id
+            JOIN {_table(DimDB)} AS b ON b.id = s.base_id
+    '''
+
+
+def _dictionary_sql() -> str:
+    return f'''
+        SELECT src.id, LEFT(src.name, 255),
+            COALESCE((
+                SELECT string_agg(y.synonym, ' ' ORDER BY y.id)
+                FROM {_table(LinkDictionaryName)} AS y
+                WHERE y.name_id = src.id AND y.is_active
+            ), ''),
+            c.name,
+            COALESCE(src.description, ''),
+            '',
+            src.is_active
+        FROM {_table(DimDictionary)} AS src
+            JOIN {_table(DimCategory)} AS c ON c.id = src.category_id
+    '''
+
+
+def _service_sql() -> str:
+    return f'''
+        SELECT src.id, LEFT(src.alias, 255),
+            COALESCE((
+                SELECT string_agg(n.name, ' ' ORDER BY n.id)
+                FROM {_table(DimServicesName)} AS n
+                WHERE n.alias_id = src.id AND n.is_active
+            ), ''),
+            t.name,
+            COALESCE(src.description, ''),
+            '',
+            src.is_active
+        FROM {_table(DimServices)} AS src
+            JOIN {_table(DimServicesTypes)} AS t ON t.id = src.type_id
+    '''
+
+
+# Тип документа -> (модель-источник, SELECT полей DOCUMENT_FIELDS с псевдонимом src у модели-источника)
+SOURCES: Dict[str, tuple] = {
+    SearchDocument.TYPE_DATABASE: (DimDB, _database_sql),
+    SearchDocument.TYPE_TABLE: (LinkTable, _table_sql),
+    SearchDocument.TYPE_COLUMN: (LinkColumn, _column_sql),
+    SearchDocument.TYPE_DICTIONARY: (DimDictionary, _dictionary_sql),
+    SearchDocument.TYPE_SERVICE: (DimServices, _service_sql),
+}
+
+
+def _upsert_sql(object_type: str, scope: str) -> str:
+    fields = ', '.join(DOCUMENT_FIELDS)
+    changed = [field for field in DOCUMENT_FIELDS if field != 'object_id']
+    return f'''
+        INSERT INTO {_table(SearchDocument)} AS d (object_type, {fields}, updated_at)
+        SELECT %s, q.*, NOW()
+        FROM ({SOURCES[object_type][1]()} WHERE {scope}) AS q
+        ON CONFLICT (object_type, object_id) DO UPDATE
+        SET {', '.join(f'{field} = EXCLUDED.{field}' for field in changed)}, updated_at = EXCLUDED.updated_at
+        WHERE ({', '.join(f'd.{field}' for field in changed)})
+            IS DISTINCT FROM ({', '.join(f'EXCLUDED.{field}' for field in changed)})
+    '''
+
+
+def _check_type(object_type: str):
+    if object_type not in SOURCES:
+        raise ValueError(f'Неизвестный тип поискового документа: {object_type}')
+
+
+def refresh_documents(
+        object_type: str,
+        ids: Optional[Iterable[int]] = None,
+        queryset: Optional[QuerySet] = None,
+) -> int:
+    """
+    Пересчитывает документы объектов одного типа.
+    Args:
+        object_type: SearchDocument.TYPE_*
+        ids: id объектов модели-источника
+        queryset: queryset модели-источника — выполняется подзапросом, без выборки id в Python
+    Returns:
+        int: число вставленных и изменённых документов
+    """
+    _check_type(object_type)
+    if queryset is not None:
+        subquery, params = queryset.order_by().values('pk').query.sql_with_params()
+        scope, params = f'src.id IN ({subquery})', [object_type, *params]
+    elif ids is not None:
+        ids = sorted(set(ids))
+        if not ids:
+            return 0
+        scope, params = 'src.id = ANY(%s)', [object_type, ids]
+    else:
+        scope, params = 'TRUE', [object_type]
+
+    with connection.cursor() as cursor:
+        cursor.execute(_upsert_sql(object_type, scope), params)
+        return cursor.rowcount
+
+
+def remove_documents(object_type: str, ids: Iterable[int]) -> int:
+    """Удаляет документы удалённых объектов. Returns: число удалённых документов."""
+    _check_type(object_type)
+    ids = sorted(set(ids))
+    if not ids:
+        return 0
+    deleted, _ = SearchDocument.objects.filter(object_type=object_type, object_id__in=ids).delete()
+    return deleted
+
+
+def remove_orphans(object_type: str) -> int:
+    """Удаляет документы, объектов которых больше нет в модели-источнике."""
+    _check_type(object_type)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            DELETE FROM {_table(SearchDocument)} AS d
+            WHERE d.object_type = %s
+              AND NOT EXISTS (SELECT 1 FROM {_table(SOURCES[object_type][0])} AS s WHERE s.id = d.object_id)
+            ''',
+            [object_type],
+        )
+        return cursor.rowcount
+
+
+def rebuild_index(
+        types: Optional[Sequence[str]] = None,
+        batch_size: int = REBUILD_BATCH_SIZE,
+        progress: Optional[Callable[[str, int, int], None]] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Полная пересборка документов порциями по диапазонам id; каждая порция — отдельная транзакция,
+    поэтому пересборка не держит блокировки на всё время работы и может выполняться на живой базе.
+    Args:
+        types: типы документов (по умолчанию все)
+        batch_size: ширина диапазона id в одной порции
+        progress: вызывается после каждой порции (тип, последний id, записано документов всего)
+    Returns:
+        dict: {тип: {'written', 'removed', 'seconds'}}
+    """
+    stats = {}
+    for object_type in types or SOURCES:
+        _check_type(object_type)
+        started = time.monotonic()
+        model = SOURCES[object_type][0]
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT MIN(id), MAX(id) FROM {_table(model)}')
+            min_id, max_id = cursor.fetchone()
+
+        written = 0
+        if min_id is not None:
+            for low in range(min_id, max_id + 1, batch_size):
+                high = low + batch_size - 1
+                with transaction.atomic():
+                    written += refresh_documents(object_type, queryset=model.objects.filter(pk__range=(low, high)))
+                if progress:
+                    progress(object_type, min(high, max_id), written)
+
+        with transaction.atomic():
+            removed = remove_orphans(object_type)
+        stats[object_type] = {
+            'written': written,
+            'removed': removed,
+            'seconds': round(time.monotonic() - started, 3),
+        }
+        logger.info('Поисковый индекс %s: %s', object_type, stats[object_type])
+    return stats
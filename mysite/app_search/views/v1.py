@@ -0,0 +1,63 @@
+# app_search/views/v1.py
+
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, OpenApiExample
+
+from ..serializers import SearchDocumentSerializer, SearchParamsSerializer
+from ..utils.catalog_search import search_catalog
+
+
+@extend_schema(
+    tags=['app_search'],
+    summary="Поиск по каталогу",
+    description=(
+        "Полнотекстовый поиск по базам данных, таблицам (с альтернативными именами), столбцам "
+        "(с JSON-описаниями), терминам словаря (с синонимами) и сервисам. Запрос разбирается в русской "
+        "и английской конфигурациях; если все слова вместе не найдены, ищется любое из слов (mode=any). "
+        "Фасеты: число найденных объектов по типу и по базе данных."
+    ),
+    parameters=[SearchParamsSerializer],
+    responses={200: SearchDocumentSerializer(many=True)},
+    examples=[
+        OpenApiExample(
+            'Ответ',
+            value={
+                "query": "ИНН клиента",
+                "mode": "all",
+                "count": 1,
+                "results": [{
+                    "object_type": "column", "object_id": 42, "title": "inn",
+                    "aliases": "ИНН", "path": "crm.public.customer",
+                    "body": "varchar ИНН клиента", "base": "crm",
+                    "url": "/columns/42/", "rank": 0.61,
+                }],
+                "facets": {"object_type": {"column": 1}, "base": {"crm": 1}},
+            },
+            response_only=True,
+        ),
+    ],
+)
+class SearchAPIView(APIView):
+    """Единый поиск по объектам каталога."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = SearchParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        result = search_catalog(
+            data['q'],
+            types=sorted(data.get('type') or []),
+            base=data.get('base'),
+            limit=data['limit'],
+            offset=data['offset'],
+        )
+        return Response({
+            'query': result.query,
+            'mode': result.mode,
+            'count': result.count,
+            'results': SearchDocumentSerializer(result.results, many=True).data,
+            'facets': result.facets,
+        })
@@ -0,0 +1,52 @@
+# app_search/views/web.py
+"""
+Страница единого поиска по каталогу.
+"""
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.views.generic import TemplateView
+
+from ..models import SearchDocument
+from ..utils.catalog_search import search_catalog
+
+
+class SearchView(LoginRequiredMixin, TemplateView):
+    """Поиск по базам, таблицам, столбцам, словарю и сервисам с фасетами по типу и базе."""
+
+    template_name = 'app_search/search.html'
+    title = 'Поиск по каталогу'
+    paginate_by = 20
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        type_names = dict(SearchDocument.TYPE_CHOICES)
+        query = self.request.GET.get('q', '').strip()[:255]
+        types = [value for value in self.request.GET.getlist('type') if value in type_names]
+        base = self.request.GET.get('base', '').strip()
+        try:
+            page = max(int(self.request.GET.get('page', 1)), 1)
+        except ValueError:
+            page = 1
+
+        result = search_catalog(
+            query, types=types, base=base or None,
+            limit=self.paginate_by, offset=(page - 1) * self.paginate_by,
+        )
+        params = self.request.GET.copy()
+        params.pop('page', None)
+        context.update({
+            'title': self.title,
+            'query': query,
+            'selected_types': types,
+            'selected_base': base,
+            'result': result,
+            'type_facets': [
+                (object_type, type_names[object_type], result.facets.get('object_type', {}).get(object_type, 0))
+                for object_type, _ in SearchDocument.TYPE_CHOICES
+            ],
+            'base_facets': list(result.facets.get('base', {}).items()),
+            'querystring': params.urlencode(),
+            'page': page,
+            'has_previous': page > 1,
+            'has_next': page * self.paginate_by < result.count,
+        })
+        return context
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'app_doc',
     'app_query_path',
     'app_request',
+    'app_search',
     'app_services',
     'app_updates',
     'app_url',
@@ -139,6 +140,9 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Предельный объём распакованного тела запроса (Content-Encoding: gzip/deflate/zstd)
+DBM_MAX_DECOMPRESSED_BODY_SIZE = env.int('DBM_MAX_DECOMPRESSED_BODY_SIZE', default=256 * 1024 * 1024)
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Описание баз данных',
     'DESCRIPTION': 'Данное API предоставляет возможность получать информацию о состоянии баз данных',
@@ -25,6 +25,7 @@ urlpatterns = [
     path('updates/', include('app_updates.urls')),
     path('query/', include('app_query_path.urls')),
     path('link/', include('app_url.urls')),
+    path('search/', include('app_search.urls')),
 ]
 
 # Обработчик 404